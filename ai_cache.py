@@ -0,0 +1,174 @@
+"""
+citeflex/ai_cache.py
+
+Persistent cache of AI router answers.
+
+The Claude and Gemini routers send ambiguous queries to a model; the same
+note is often classified again and again (re-uploaded documents, repeated
+searches). Answers are stored in a small SQLite file keyed by normalized
+query, so a repeat costs one indexed lookup instead of a model round trip.
+
+Each entry is tagged with a version derived from the model name and the
+prompt, so editing a prompt or switching models never serves stale answers;
+entries also expire after AI_CACHE_TTL seconds. Only real model responses
+are stored - rate limits, timeouts and auth failures are never cached.
+
+Batch prompts answer a JSON array with one "id" per numbered input;
+split_batch_response maps it back to the inputs, so each answer is cached
+under its own query.
+
+Usage:
+    from ai_cache import ai_cache, prompt_version
+
+    version = prompt_version(MODEL, PROMPT)
+    text = ai_cache.get(version, query)
+    if text is None:
+        text = call_model(query)
+        ai_cache.put(version, query, text)
+
+Version History:
+    2026-10-18: split_batch_response shared by the Claude and Gemini batch paths
+    2026-10-18: Initial version (SQLite store, TTL, model/prompt versioning)
+"""
+
+import os
+import re
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+from typing import Optional, List, Dict
+
+from config import AI_CACHE_DB, AI_CACHE_TTL
+
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def normalize_query(query: str) -> str:
+    """
+    Whitespace-insensitive cache key.
+
+    Case is kept: the model copies title/author casing out of the query
+    into its answer.
+    """
+    return _WHITESPACE_RE.sub(' ', query).strip()
+
+
+def prompt_version(model: str, prompt: str) -> str:
+    """Short fingerprint of the model + prompt that produced an answer."""
+    return hashlib.sha1(f"{model}\0{prompt}".encode('utf-8')).hexdigest()[:16]
+
+
+def split_batch_response(response_text: str, texts: List[str]) -> Dict[str, str]:
+    """Map a batch answer's JSON array back to its queries by "id" (1-based)."""
+    json_match = re.search(r'\[[\s\S]*\]', response_text)
+    if not json_match:
+        return {}
+    try:
+        items = json.loads(json_match.group())
+    except json.JSONDecodeError:
+        return {}
+
+    answers = {}
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        try:
+            index = int(item.pop('id')) - 1
+        except (KeyError, TypeError, ValueError):
+            continue
+        if 0 <= index < len(texts):
+            answers[texts[index]] = json.dumps(item)
+    return answers
+
+
+class AICache:
+    """
+    SQLite-backed answer cache shared by the AI routers.
+
+    Safe to use from executor threads (one connection per thread). A SQLite
+    error only turns a lookup into a miss; the caller then asks the model.
+    """
+
+    def __init__(self, db_path: str = AI_CACHE_DB, ttl: int = AI_CACHE_TTL):
+        self.db_path = db_path
+        self.ttl = ttl
+        self._local = threading.local()
+        self._pruned = False
+        self._lock = threading.Lock()
+
+    @property
+    def available(self) -> bool:
+        return bool(self.db_path)
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        if not self.available:
+            return None
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            try:
+                directory = os.path.dirname(self.db_path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                conn = sqlite3.connect(self.db_path, timeout=5)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS answers ("
+                    "version TEXT NOT NULL, query TEXT NOT NULL, "
+                    "response TEXT NOT NULL, created REAL NOT NULL, "
+                    "PRIMARY KEY (version, query))"
+                )
+                conn.commit()
+                self._local.conn = conn
+            except (sqlite3.Error, OSError) as e:
+                print(f"[AICache] Cannot open {self.db_path}: {e}")
+                return None
+            self._prune_once(conn)
+        return conn
+
+    def _prune_once(self, conn: sqlite3.Connection) -> None:
+        """Drop expired rows the first time the cache is opened."""
+        with self._lock:
+            if self._pruned:
+                return
+            self._pruned = True
+        try:
+            conn.execute("DELETE FROM answers WHERE created < ?", (time.time() - self.ttl,))
+            conn.commit()
+        except sqlite3.Error:
+            pass
+
+    def get(self, version: str, query: str) -> Optional[str]:
+        """Cached model response for query, or None."""
+        conn = self._connect()
+        if conn is None:
+            return None
+        try:
+            row = conn.execute(
+                "SELECT response FROM answers WHERE version = ? AND query = ? AND created >= ?",
+                (version, normalize_query(query), time.time() - self.ttl)
+            ).fetchone()
+        except sqlite3.Error as e:
+            print(f"[AICache] Lookup error: {e}")
+            return None
+        return row[0] if row else None
+
+    def put(self, version: str, query: str, response: str) -> None:
+        """Store a model response (replacing any older answer)."""
+        conn = self._connect()
+        if conn is None:
+            return
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO answers (version, query, response, created) VALUES (?, ?, ?, ?)",
+                (version, normalize_query(query), response, time.time())
+            )
+            conn.commit()
+        except sqlite3.Error as e:
+            print(f"[AICache] Write error: {e}")
+
+
+# Shared instance used by claude_router and gemini_router
+ai_cache = AICache()
@@ -0,0 +1,268 @@
+"""
+citeflex/analysis.py
+
+Shared per-query feature extraction.
+
+A single route_citation call used to scan the same string many times:
+parse_existing_citation, superlegal.is_legal_citation and detect_type each
+re-ran their own URL / DOI / "v." / reporter / quote regexes, and
+get_multiple_citations repeated all of it. analyze_query() extracts those
+features once and caches the result per query string, so the parser,
+detectors and router all read the same QueryAnalysis.
+
+Only features consumed by more than one layer live here. Patterns used by a
+single detector stay in that detector (precompiled).
+
+Version History:
+    2026-10-18: identifiers (DOI, ISBN, PMID, PMCID, arXiv, Westlaw) come from one
+                identifiers.find_identifiers scan; isbns holds only checksum-valid
+                ISBNs (normalized ISBN-13), so phone and docket numbers no longer count
+    2026-10-18: Keyword vocabularies (now including the interview and book
+                detector lists) are counted by one KEYWORD_MATCHER scan at word
+                boundaries instead of a substring test per term
+    2026-10-18: paren_years also covers season/month issue dates; dropped doi_url
+                (citation_grammar reads DOIs from its tokens); _PUB_PAREN_RE no
+                longer scans past a nested "(" (quadratic on unclosed parens)
+    2026-10-18: Initial version (QueryAnalysis, analyze_query)
+"""
+
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+from config import MEDICAL_TERMS, DOMAIN_TRIE
+from matching import PhraseMatcher, iter_hosts
+from identifiers import Identifier, find_identifiers
+
+
+# =============================================================================
+# PATTERNS
+# =============================================================================
+
+_URL_RE = re.compile(r'https?://[^\s,]+')
+
+# (1995), also journal issue dates: (Spring 1995), (Sept. 1995)
+_PAREN_YEAR_RE = re.compile(r'\((?:[A-Za-z]+\.?\s+)?(\d{4})\)')
+_BRACKET_YEAR_RE = re.compile(r'\[\d{4}\]')
+
+# " v ", " v. ", " vs ", " versus " between words
+_VERSUS_RE = re.compile(r'\s(v|vs|versus)\.?(?=\s)', re.IGNORECASE)
+
+# Capitalized "Name v. Name" (the classic case name shape)
+_CASE_NAME_RE = re.compile(r'\b[A-Z][a-z]+\s+(?:v|vs|versus)\.?\s+[A-Z]')
+
+_CASE_PREFIX_RE = re.compile(r'^(?:In\s+re|Ex\s+parte|Matter\s+of)\s+', re.IGNORECASE)
+
+# Software versions (v1, v2.3, "version 4") are not case names
+_VERSION_RE = re.compile(r'\bv(?:ersion\s*)?\d', re.IGNORECASE)
+
+# Every reporter shape below starts "<digits> <Capital>"
+_REPORTER_GATE_RE = re.compile(r'\d\s+[A-Z]')
+
+# Any Volume Reporter Page shape (detectors.is_legal): U.S. Reports,
+# state reporters, F.2d/F.3d, F. Supp., A.2d/P.2d, generic (incl. Westlaw)
+_REPORTER_RE = re.compile(
+    r'(?<!\d)\d+\s+(?:'
+    r'U\.S\.\s+\d+'
+    r'|[A-Z][a-z]*\.?\s*\d*[a-z]*\.?\s+\d+'
+    r'|F\.\d+[a-z]*\s+\d+'
+    r'|F\.\s*Supp\.\s*\d*[a-z]*\s+\d+'
+    r'|[A-Z]\.\d+[a-z]*\s+\d+'
+    r'|[A-Z][A-Za-z\.]+\s+\d+)'
+)
+
+# Reporters recognized by superlegal.is_legal_citation (a subset of the above):
+# Westlaw, Federal Reporter, U.S. Reports, Atlantic/Pacific
+_STRICT_REPORTER_RE = re.compile(
+    r'\d{4}\s+WL\s+\d+'
+    r'|(?<!\d)\d+\s+(?:F\.\d+[a-z]*|U\.S\.|[A-Z]\.\d+[a-z]*)\s+\d+'
+)
+
+# Federal Register mention (excludes legal) and citation (implies government)
+_FR_MENTION_RE = re.compile(r'\b\d+\s*FR\s+\d+\b|\bfederal\s+register\b', re.IGNORECASE)
+_FR_CITE_RE = re.compile(r'\b\d+\s+(?:FR|federal\s+register)\s+\d+\b', re.IGNORECASE)
+
+_GOV_TLD_RE = re.compile(r'\.gov(/|$)')
+
+# Cheap presence checks that let most queries skip the costlier patterns
+_HOST_GATE_RE = re.compile(r'[a-z0-9]\.[a-z]{2}', re.IGNORECASE)
+
+# Quoted titles as the journal parser finds them
+_DOUBLE_QUOTED_RE = re.compile(r'[,\s]"([^"]+)"[,\.]?\s*')
+_SINGLE_QUOTED_RE = re.compile(r"[,\s]'([^']+)'[,\.]?\s*")
+
+# Book publication parenthetical: (Place: Publisher, Year) or (Publisher, Year).
+# No nested "(": an unclosed paren must not scan to the end of the note.
+_PUB_PAREN_RE = re.compile(r'\(([^()]+:\s*[^,()]+,\s*\d{4})\)|\(([^():,]+,\s*\d{4})\)')
+
+
+# =============================================================================
+# KEYWORD VOCABULARIES
+# =============================================================================
+
+# Matched at word boundaries by one PhraseMatcher scan; a trailing '*' also
+# matches longer words ('patient*' -> 'patients'). Counts are distinct
+# entries per category, so a phrase may sit in several categories.
+KEYWORD_VOCABULARIES: Dict[str, Tuple[str, ...]] = {
+    # Phrases the interview parser requires
+    'interview': ('interview by', 'interview with', 'oral history', 'interviewed by'),
+    # Any one of these makes detectors.is_interview fire
+    'interview_strong': (
+        'oral history', 'personal communication', 'conversation with',
+        'interview by', 'interviewed by', 'interview with',
+    ),
+    # "interview" as a topic, not a source
+    'interview_negative': (
+        'history of interview', 'history of interviews', 'interview process',
+        'interview technique', 'job interview', 'interview question',
+        'interview skill', 'interview method',
+        'interview in', 'interview about', 'interview on', 'interview of',
+        'interviews in', 'interviews about', 'interviews on', 'interviews of',
+    ),
+    'newspaper': (
+        'new york times', 'wall street journal', 'washington post',
+        'los angeles times', 'chicago tribune', 'boston globe', 'the guardian',
+        'the economist', 'financial times', 'usa today', 'atlantic',
+        'new yorker', 'politico', 'huffington post', 'huffpost', 'buzzfeed',
+        'daily beast', 'slate', 'vox', 'reuters', 'associated press', 'ap news',
+    ),
+    # A single hit is enough to call a query medical
+    'medical_strong': (
+        'randomized controlled trial*', 'double-blind', 'placebo-controlled',
+        'meta-analys*', 'systematic review*', 'clinical trial*',
+        'clinical efficacy', 'treatment-resistant',
+    ),
+    'medical': tuple(f'{term}*' for term in MEDICAL_TERMS),
+    'publisher': ('press', 'publishers', 'publishing', 'books'),
+    'book': ('book', 'edition', 'isbn*'),
+}
+
+
+def _keyword_matcher() -> PhraseMatcher:
+    categories: Dict[str, list] = {}
+    for category, terms in KEYWORD_VOCABULARIES.items():
+        for term in terms:
+            categories.setdefault(term.lower(), []).append(category)
+    return PhraseMatcher({term: tuple(cats) for term, cats in categories.items()})
+
+
+KEYWORD_MATCHER = _keyword_matcher()
+
+
+# =============================================================================
+# ANALYSIS
+# =============================================================================
+
+@dataclass(frozen=True)
+class QueryAnalysis:
+    """
+    Features of one query, computed once by analyze_query().
+
+    Shared (and cached), so treat as read-only.
+    """
+    text: str
+    lower: str
+    is_url: bool = False
+    urls: Tuple[str, ...] = ()
+    identifiers: Tuple[Identifier, ...] = ()
+    has_doi: bool = False
+    isbns: Tuple[str, ...] = ()   # normalized ISBN-13s
+    paren_years: Tuple[str, ...] = ()
+    bracket_year: bool = False
+    versus: bool = False           # " v ", " vs ", " versus " anywhere
+    v_marker: bool = False         # " v " / " v. " specifically
+    case_name: bool = False        # "Name v. Name"
+    case_prefix: bool = False      # In re / Ex parte / Matter of
+    version_marker: bool = False
+    reporter: bool = False
+    strict_reporter: bool = False
+    federal_register: bool = False
+    federal_register_cite: bool = False
+    gov_tld: bool = False
+    double_quoted: bool = False
+    single_quoted: bool = False
+    italics: bool = False
+    pub_parenthetical: bool = False
+    domains: Dict[str, Tuple[str, object]] = field(default_factory=dict)
+    keywords: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def url(self) -> str:
+        """First URL in the query ('' if none)."""
+        return self.urls[0] if self.urls else ''
+
+    def domain(self, category: str) -> Optional[Tuple[str, object]]:
+        """(domain, value) of the first host registered under category."""
+        return self.domains.get(category)
+
+    def hits(self, category: str) -> int:
+        """Number of distinct vocabulary entries of category present."""
+        return self.keywords.get(category, 0)
+
+
+def _count_keywords(lower: str) -> Dict[str, int]:
+    counts: Dict[str, int] = {}
+    seen = set()
+    for _, _, entry, categories in KEYWORD_MATCHER.iter_matches(lower):
+        if entry in seen:
+            continue
+        seen.add(entry)
+        for category in categories:
+            counts[category] = counts.get(category, 0) + 1
+    return counts
+
+
+def _domain_hits(text: str) -> Dict[str, Tuple[str, object]]:
+    found: Dict[str, Tuple[str, object]] = {}
+    if not _HOST_GATE_RE.search(text):
+        return found
+    for host in iter_hosts(text):
+        for category, match in DOMAIN_TRIE.categories(host).items():
+            found.setdefault(category, match)
+    return found
+
+
+@lru_cache(maxsize=2048)
+def analyze_query(text: str) -> QueryAnalysis:
+    """
+    Extract the shared features of a query (cached per query string).
+
+    The router, parser and detectors call this with the same string, so
+    the work is done once per query no matter how many layers ask.
+    """
+    clean = (text or '').strip()
+    lower = clean.lower()
+
+    versus = [m.group(1).lower() for m in _VERSUS_RE.finditer(clean)]
+    reporter = bool(_REPORTER_GATE_RE.search(clean) and _REPORTER_RE.search(clean))
+    federal_register = ('fr' in lower or 'federal' in lower) and bool(_FR_MENTION_RE.search(clean))
+    identifiers = find_identifiers(clean)
+
+    return QueryAnalysis(
+        text=clean,
+        lower=lower,
+        is_url=clean.startswith(('http://', 'https://')),
+        urls=tuple(u.rstrip('.,;') for u in _URL_RE.findall(clean)) if 'http' in lower else (),
+        identifiers=identifiers,
+        has_doi=any(i.kind == 'doi' for i in identifiers),
+        isbns=tuple(i.value for i in identifiers if i.kind == 'isbn'),
+        paren_years=tuple(_PAREN_YEAR_RE.findall(clean)) if '(' in clean else (),
+        bracket_year='[' in clean and bool(_BRACKET_YEAR_RE.search(clean)),
+        versus=bool(versus),
+        v_marker='v' in versus,
+        case_name=bool(versus) and bool(_CASE_NAME_RE.search(clean)),
+        case_prefix=bool(_CASE_PREFIX_RE.match(clean)),
+        version_marker=bool(_VERSION_RE.search(clean)),
+        reporter=reporter,
+        strict_reporter=reporter and bool(_STRICT_REPORTER_RE.search(clean)),
+        federal_register=federal_register,
+        federal_register_cite=federal_register and bool(_FR_CITE_RE.search(clean)),
+        gov_tld='.gov' in lower and bool(_GOV_TLD_RE.search(clean.rstrip('.,;:)').lower())),
+        double_quoted='"' in clean and bool(_DOUBLE_QUOTED_RE.search(clean)),
+        single_quoted="'" in clean and bool(_SINGLE_QUOTED_RE.search(clean)),
+        italics='<i>' in lower,
+        pub_parenthetical='(' in clean and bool(_PUB_PAREN_RE.search(clean)),
+        domains=_domain_hits(clean),
+        keywords=_count_keywords(lower),
+    )
@@ -4,6 +4,9 @@ citeflex/app.py
 Flask application for CiteFlex Unified.
 
 Version History:
+    2026-10-18: /api/cite and /api/cite/multiple run under a REQUEST_DEADLINE budget
+    2026-10-18: /api/cite and /api/cite/multiple accept "styles" (a list or "all")
+                and return every rendering of one lookup in "citations"
     2025-12-06 13:30: Added debug logging to diagnose session loss issue
     2025-12-06 13:00: CRITICAL FIX - Fixed /api/update and /api/download to properly
                       access session data. Override feature now works correctly.
@@ -37,6 +40,9 @@ from flask import Flask, request, jsonify, render_template, send_file
 from werkzeug.utils import secure_filename
 
 from unified_router import get_citation, get_multiple_citations
+from deadline import Deadline, LOOKUP_STATS
+from config import REQUEST_DEADLINE
+from formatters.base import expand_styles, format_styles
 from document_processor import process_document
 
 # =============================================================================
@@ -262,6 +268,24 @@ def allowed_file(filename: str) -> bool:
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
 
+def requested_styles(data: dict) -> list:
+    """
+    Styles a citation request asks for, primary first.
+    
+    "style" is the primary style; "styles" (a list, or "all") asks for more
+    renderings of the same lookup. Without "style" the first of "styles"
+    is primary; with neither, Chicago.
+    """
+    styles = data.get('styles') or []
+    if not isinstance(styles, (str, list)):
+        raise ValueError("styles must be a list of style names or \"all\"")
+    if isinstance(styles, str):
+        styles = [styles]
+    if data.get('style') or not styles:
+        styles = [data.get('style') or 'Chicago Manual of Style'] + styles
+    return expand_styles(styles) or ['Chicago Manual of Style']
+
+
 # =============================================================================
 # ROUTES
 # =============================================================================
@@ -280,15 +304,21 @@ def cite():
     Request JSON:
     {
         "query": "citation text or URL",
-        "style": "Chicago Manual of Style"  // optional
+        "style": "Chicago Manual of Style",  // optional
+        "styles": ["APA", "MLA"]             // optional, or "all"
     }
     
     Response JSON:
     {
         "success": true,
         "citation": "formatted citation",
+        "citations": {"Chicago Manual of Style": "...", "APA": "...", ...},
         "metadata": {...}
     }
+    
+    The query is resolved once; "citations" has one rendering per requested
+    style (just the primary one when "styles" is absent), so the UI can
+    switch styles without another lookup.
     """
     try:
         data = request.get_json()
@@ -300,9 +330,16 @@ def cite():
             }), 400
         
         query = data['query'].strip()
-        style = data.get('style', 'Chicago Manual of Style')
+        try:
+            styles = requested_styles(data)
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
         
-        metadata, formatted = get_citation(query, style)
+        metadata, citations = get_citation(query, styles, deadline=Deadline(REQUEST_DEADLINE))
+        formatted = citations.get(styles[0], '')
         
         if not formatted:
             return jsonify({
@@ -334,6 +371,7 @@ def cite():
         return jsonify({
             'success': True,
             'citation': formatted,
+            'citations': citations,
             'type': citation_type,
             'source': source,
             'confidence': confidence,
@@ -357,6 +395,7 @@ def cite_multiple():
     {
         "query": "search text",
         "style": "Chicago Manual of Style",
+        "styles": "all",                     // optional, as for /api/cite
         "limit": 5
     }
     
@@ -364,7 +403,7 @@ def cite_multiple():
     {
         "success": true,
         "results": [
-            {"citation": "...", "metadata": {...}},
+            {"citation": "...", "citations": {...}, "metadata": {...}},
             ...
         ]
     }
@@ -379,16 +418,23 @@ def cite_multiple():
             }), 400
         
         query = data['query'].strip()
-        style = data.get('style', 'Chicago Manual of Style')
+        try:
+            styles = requested_styles(data)
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
         limit = min(data.get('limit', 5), 10)  # Cap at 10
         
-        results = get_multiple_citations(query, style, limit)
+        results = get_multiple_citations(query, styles[0], limit, deadline=Deadline(REQUEST_DEADLINE))
         
         return jsonify({
             'success': True,
             'results': [
                 {
                     'citation': formatted,
+                    'citations': {styles[0]: formatted, **format_styles(meta, styles[1:])} if meta else {},
                     'source': source,
                     'type': meta.citation_type.name.lower() if meta and meta.citation_type else 'unknown',
                     'confidence': 'high' if (meta and (meta.doi or meta.citation)) else 'medium',
@@ -702,7 +748,8 @@ def health():
         'status': 'healthy',
         'version': '2.0.1',
         'sessions_count': len(sessions._sessions),
-        'persistence': sessions._persistence_available
+        'persistence': sessions._persistence_available,
+        'lookups': dict(LOOKUP_STATS)
     })
 
 
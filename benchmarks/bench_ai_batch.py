@@ -0,0 +1,105 @@
+"""
+citeflex/benchmarks/bench_ai_batch.py
+
+Model calls and wall time to AI-classify a document's ambiguous notes:
+one classify_with_claude call per note versus classify_batch_with_claude.
+
+A local stub of the Anthropic Messages API stands in for the model (fixed
+latency per call, canned answers), so no key or network is needed:
+
+    python benchmarks/bench_ai_batch.py [--notes N] [--latency SECONDS]
+
+Each mode starts with an empty AI cache in a temporary directory.
+"""
+
+import os
+import sys
+import json
+import time
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+LATENCY = 0.5
+CALLS = []
+
+
+class StubModel(BaseHTTPRequestHandler):
+    """POST /v1/messages: answers every note as a book."""
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        CALLS.append(body)
+        time.sleep(LATENCY)
+
+        system = ''.join(block['text'] for block in body['system'])
+        content = body['messages'][0]['content']
+        if 'numbered inputs' in system:
+            notes = [line for line in content.split('\n\n')[1:] if line]
+            text = json.dumps([
+                {'id': i, 'type': 'book', 'confidence': 0.8, 'title': note.split('. ', 1)[1]}
+                for i, note in enumerate(notes, 1)
+            ])
+        else:
+            text = json.dumps({'type': 'book', 'confidence': 0.8, 'title': content.split('\n\n', 1)[1]})
+
+        reply = json.dumps({
+            'id': f'msg_{len(CALLS)}', 'type': 'message', 'role': 'assistant',
+            'model': body['model'], 'content': [{'type': 'text', 'text': text}],
+            'stop_reason': 'end_turn', 'stop_sequence': None,
+            'usage': {'input_tokens': 0, 'output_tokens': 0},
+        }).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(reply)))
+        self.end_headers()
+        self.wfile.write(reply)
+
+    def log_message(self, *args):
+        pass
+
+
+def main(argv: list) -> None:
+    global LATENCY
+    count = 200
+    if '--notes' in argv:
+        count = int(argv[argv.index('--notes') + 1])
+    if '--latency' in argv:
+        LATENCY = float(argv[argv.index('--latency') + 1])
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubModel)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    tmp = tempfile.mkdtemp()
+    os.environ['ANTHROPIC_BASE_URL'] = f'http://127.0.0.1:{server.server_port}'
+    os.environ['ANTHROPIC_API_KEY'] = 'stub'
+
+    import claude_router
+    from ai_cache import AICache
+
+    notes = [f'obscure monograph fragment {i} cited by the author' for i in range(count)]
+
+    def run(label, db, classify):
+        claude_router.ai_cache = AICache(os.path.join(tmp, db))
+        CALLS.clear()
+        start = time.perf_counter()
+        classified = classify()
+        elapsed = time.perf_counter() - start
+        print(f"  {label:<8} {len(CALLS):>5} model calls  {elapsed:>8.2f} s  ({classified} classified)")
+
+    print(f"{count} ambiguous notes, {LATENCY * 1000:.0f} ms per model call")
+    run('serial', 'serial.db', lambda: sum(
+        claude_router.classify_with_claude(n)[1] is not None for n in notes))
+    run('batched', 'batched.db', lambda: sum(
+        m is not None for _, m in claude_router.classify_batch_with_claude(notes).values()))
+    run('repeat', 'batched.db', lambda: sum(
+        claude_router.classify_with_claude(n)[1] is not None for n in notes))
+
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
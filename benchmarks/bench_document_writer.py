@@ -0,0 +1,85 @@
+"""
+citeflex/benchmarks/bench_document_writer.py
+
+Cost of writing formatted citations into a Word document: write_endnote
+for every note of a synthetic .docx, then save and LinkActivator, the
+way process_document finishes a document.
+
+    python benchmarks/bench_document_writer.py [--notes N]
+
+Formatters with format_runs are written as runs, older trees as <i>-tagged
+strings. Run on two commits to compare.
+"""
+
+import os
+import sys
+import time
+import zipfile
+from io import BytesIO
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from models import CitationMetadata, CitationType
+from formatters import get_formatter
+from document_processor import WordDocumentProcessor, LinkActivator
+
+W = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+
+TYPES = (CitationType.JOURNAL, CitationType.BOOK, CitationType.NEWSPAPER, CitationType.URL, CitationType.LEGAL)
+
+
+def build_docx(count: int) -> bytes:
+    notes = ''.join(
+        f'<w:endnote w:id="{i}"><w:p><w:pPr><w:pStyle w:val="EndnoteText"/></w:pPr>'
+        f'<w:r><w:rPr><w:rStyle w:val="EndnoteReference"/></w:rPr><w:endnoteRef/></w:r>'
+        f'<w:r><w:t xml:space="preserve"> note {i}</w:t></w:r></w:p></w:endnote>'
+        for i in range(1, count + 1)
+    )
+    buffer = BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as z:
+        z.writestr('[Content_Types].xml', '<Types/>')
+        z.writestr('word/document.xml', f'<?xml version="1.0"?><w:document xmlns:w="{W}"><w:body/></w:document>')
+        z.writestr('word/endnotes.xml', f'<?xml version="1.0"?><w:endnotes xmlns:w="{W}">{notes}</w:endnotes>')
+    return buffer.getvalue()
+
+
+def sample(i: int) -> CitationMetadata:
+    return CitationMetadata(
+        citation_type=TYPES[i % len(TYPES)],
+        authors=['John Smith', 'Ann Lee'][:1 + i % 2],
+        title=f'Title of Work {i}', journal='Journal of Things', volume='12', issue='3',
+        pages='1-10', year='2001', publisher='Oxford University Press', place='Oxford',
+        doi=f'10.1000/abc{i}' if i % 3 == 0 else '', url=f'https://example.org/item/{i}' if i % 2 else '',
+        newspaper='The Times', date='May 1, 2020', case_name='Brown v. Board of Education',
+        citation='347 U.S. 483', court='Supreme Court', access_date='June 2, 2021',
+    )
+
+
+def main(argv: list) -> None:
+    count = 200
+    if '--notes' in argv:
+        count = int(argv[argv.index('--notes') + 1])
+
+    formatter = get_formatter('Chicago Manual of Style')
+    use_runs = hasattr(formatter, 'format_runs')
+    metas = [sample(i) for i in range(count)]
+    docx = build_docx(count)
+
+    processor = WordDocumentProcessor(BytesIO(docx))
+    start = time.process_time()
+    for i, m in enumerate(metas, 1):
+        processor.write_endnote(str(i), formatter.format_runs(m) if use_runs else formatter.format(m))
+    written = time.process_time()
+    LinkActivator.process(processor.save_to_buffer())
+    done = time.process_time()
+    processor.cleanup()
+
+    print(f"{count} endnotes ({'runs' if use_runs else 'strings'})")
+    print(f"  write: {(written - start) / count * 1e6:,.0f} us per note")
+    print(f"  save + links: {(done - written) * 1e3:,.1f} ms")
+    print(f"  total: {(done - start) / count * 1e6:,.0f} us per note")
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,95 @@
+"""
+citeflex/benchmarks/bench_formatters.py
+
+Formats/sec through get_formatter(style).format(metadata), the way the
+routers and document processor call it, for every style over a fixed mix
+of citation types (full and short forms).
+
+    python benchmarks/bench_formatters.py [--rounds N]
+
+Run on two commits to compare.
+"""
+
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from models import CitationMetadata, CitationType
+from formatters import get_formatter
+
+STYLES = ('Chicago Manual of Style', 'APA 7', 'MLA 9', 'Bluebook', 'OSCOLA')
+
+SAMPLES = [
+    CitationMetadata(
+        citation_type=CitationType.JOURNAL,
+        authors=['Eric R. Kandel', 'Larry R. Squire'],
+        title='Neuroscience: Breaking Down Scientific Barriers',
+        journal='Science', volume='290', issue='5494', pages='1113-1120',
+        year='2000', doi='10.1126/science.290.5494.1113',
+    ),
+    CitationMetadata(
+        citation_type=CitationType.BOOK,
+        authors=['Thomas S. Kuhn'],
+        title='The Structure of Scientific Revolutions',
+        place='Chicago', publisher='University of Chicago Press', year='1962',
+    ),
+    CitationMetadata(
+        citation_type=CitationType.LEGAL,
+        case_name='Brown v. Board of Education', citation='347 U.S. 483',
+        court='Supreme Court of the United States', year='1954',
+    ),
+    CitationMetadata(
+        citation_type=CitationType.NEWSPAPER,
+        authors=['Jane Doe'], title='Markets Rally', newspaper='New York Times',
+        date='March 3, 2020', url='https://www.nytimes.com/2020/03/03/markets.html',
+    ),
+    CitationMetadata(
+        citation_type=CitationType.INTERVIEW,
+        interviewee='Margaret Mead', interviewer='Studs Terkel',
+        date='June 1, 1970', location='Chicago',
+    ),
+    CitationMetadata(
+        citation_type=CitationType.LETTER,
+        sender='Thomas Jefferson', recipient='John Adams', date='July 5, 1814',
+        location='Library of Congress',
+    ),
+    CitationMetadata(
+        citation_type=CitationType.GOVERNMENT,
+        agency='Food and Drug Administration', title='Guidance for Industry',
+        document_number='FDA-2019-D-0001', url='https://www.fda.gov/guidance',
+        year='2019',
+    ),
+    CitationMetadata(
+        citation_type=CitationType.URL,
+        title='About Us', url='https://example.org/about', access_date='May 1, 2024',
+    ),
+]
+
+
+def main(argv: list) -> None:
+    rounds = 2000
+    if '--rounds' in argv:
+        rounds = int(argv[argv.index('--rounds') + 1])
+
+    total = 0.0
+    for style in STYLES:
+        start = time.process_time()
+        for _ in range(rounds):
+            for m in SAMPLES:
+                get_formatter(style).format(m)
+                get_formatter(style).format_short(m)
+        elapsed = time.process_time() - start
+        total += elapsed
+        calls = rounds * len(SAMPLES) * 2
+        print(f"  {style:<24} {calls / elapsed:>12,.0f} formats/sec")
+
+    calls = rounds * len(SAMPLES) * 2 * len(STYLES)
+    print(f"{len(STYLES)} styles x {len(SAMPLES)} types x {rounds} rounds (full + short)")
+    print(f"  {calls / total:,.0f} formats/sec ({total / calls * 1e6:.2f} us each)")
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,86 @@
+"""
+citeflex/benchmarks/bench_metadata_memory.py
+
+Memory and serialization cost of CitationMetadata: bytes per instance
+(tracemalloc, for results shaped like engine output), session pickle size
+and time, and to_dict / from_dict / JSON throughput.
+
+    python benchmarks/bench_metadata_memory.py [--count N]
+
+Run on two commits to compare.
+"""
+
+import os
+import sys
+import json
+import time
+import pickle
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from models import CitationMetadata, CitationType
+
+JOURNALS = ('Journal of Things', 'Nature', 'Science', 'The Lancet', 'Cell')
+PUBLISHERS = ('Oxford University Press', 'Cambridge University Press', 'Elsevier BV', 'Springer')
+ENGINES = ('Crossref', 'OpenAlex', 'Semantic Scholar', 'PubMed', 'Google Books')
+
+
+def sample(i: int) -> CitationMetadata:
+    """One result as an engine builds it: strings fresh from a JSON parse."""
+    # ''.join makes distinct string objects, like json.loads does per response
+    fresh = lambda s: ''.join(list(s))
+    if i % 3 == 2:
+        return CitationMetadata(
+            citation_type=CitationType.BOOK, raw_source=f'smith history of things {i}',
+            source_engine=fresh(ENGINES[4]), title=f'A History of Things, Volume {i}',
+            authors=[f'John Smith {i}'], year='2001', publisher=fresh(PUBLISHERS[i % 4]),
+            place=fresh('Oxford'), isbn=f'978019{i:07d}',
+        )
+    return CitationMetadata(
+        citation_type=CitationType.JOURNAL, raw_source=f'smith lee things {i}',
+        source_engine=fresh(ENGINES[i % 4]), title=f'On the Nature of Things {i}',
+        authors=[f'John Smith {i}', f'Ann Lee {i}'], year=str(1990 + i % 30),
+        journal=fresh(JOURNALS[i % 5]), volume=str(i % 90), issue=str(i % 12),
+        pages=f'{i % 500}-{i % 500 + 20}', doi=f'10.1000/things.{i}',
+        url=f'https://doi.org/10.1000/things.{i}', publisher=fresh(PUBLISHERS[i % 4]),
+    )
+
+
+def timed(fn, repeat: int = 3) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv: list) -> None:
+    count = 20000
+    if '--count' in argv:
+        count = int(argv[argv.index('--count') + 1])
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    metas = [sample(i) for i in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    dicts = [m.to_dict() for m in metas]
+    blob = pickle.dumps(metas)
+    body = json.dumps(dicts)
+
+    print(f"{count:,} CitationMetadata ({'slots' if hasattr(CitationMetadata, '__slots__') else 'dict'})")
+    print(f"  memory:     {(after - before) / count:,.0f} bytes per instance")
+    print(f"  pickle:     {len(blob) / count:,.0f} bytes per instance, "
+          f"dump {timed(lambda: pickle.dumps(metas)) / count * 1e6:.2f} us, "
+          f"load {timed(lambda: pickle.loads(blob)) / count * 1e6:.2f} us")
+    print(f"  to_dict:    {count / timed(lambda: [m.to_dict() for m in metas]):,.0f} per s "
+          f"(JSON {len(body) / count:,.0f} bytes per instance)")
+    print(f"  from_dict:  {count / timed(lambda: [CitationMetadata.from_dict(d) for d in dicts]):,.0f} per s")
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
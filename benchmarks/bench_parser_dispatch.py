@@ -0,0 +1,121 @@
+"""
+citeflex/benchmarks/bench_parser_dispatch.py
+
+Throughput of parse_existing_citation over a corpus of notes, and the
+fraction of _parse_* invocations the feature gates avoid.
+
+    python benchmarks/bench_parser_dispatch.py [notes.txt] [--rounds N]
+    python benchmarks/bench_parser_dispatch.py --scale
+
+--scale times single malformed notes of growing length (many quotes,
+parentheses, commas and "v." markers, the input regex cascades backtrack
+on) to show how parse time grows with note length.
+
+Run on two commits to compare; trees without PARSER_STATS report
+throughput only. Where analysis.py exists, the shared query analysis is
+built before timing (route_citation builds it once for the parser and
+the detectors alike) and its cost is reported on its own line.
+"""
+
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import unified_router
+from unified_router import parse_existing_citation
+
+try:
+    from analysis import analyze_query
+except ImportError:
+    analyze_query = None
+
+try:
+    from citation_grammar import tokenize
+except ImportError:
+    tokenize = None
+
+# Unit of the --scale notes: every parser finds a foothold but no shape completes
+SCALE_UNIT = 'Smith v. Jones, "Title, 12 (Press: Place, interview by A to B, 1999 '
+
+
+def load_notes(path: str) -> list:
+    with open(path, encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip() and not line.startswith('#')]
+
+
+def clear_caches() -> None:
+    if analyze_query:
+        analyze_query.cache_clear()
+    if tokenize:
+        tokenize.cache_clear()
+
+
+def scale() -> None:
+    print("note length -> us per parse (analysis included)")
+    for repeat in (1, 4, 16, 64, 256):
+        note = SCALE_UNIT * repeat
+        rounds = max(1, 512 // repeat)
+        start = time.process_time()
+        for _ in range(rounds):
+            clear_caches()
+            parse_existing_citation(note)
+        elapsed = (time.process_time() - start) / rounds
+        print(f"  {len(note):>7,} chars: {elapsed * 1e6:>12,.0f} us ({elapsed / len(note) * 1e9:,.0f} ns/char)")
+
+
+def main(argv: list) -> None:
+    if '--scale' in argv:
+        return scale()
+
+    rounds = 50
+    if '--rounds' in argv:
+        i = argv.index('--rounds')
+        rounds = int(argv[i + 1])
+        del argv[i:i + 2]
+    path = argv[0] if argv else os.path.join(os.path.dirname(__file__), 'notes.txt')
+    notes = load_notes(path)
+
+    stats = getattr(unified_router, 'PARSER_STATS', None)
+    if stats:
+        stats.update(calls=0, skipped=0)
+
+    devnull = open(os.devnull, 'w')
+    stdout, sys.stdout = sys.stdout, devnull
+
+    elapsed = 0.0
+    analysis_time = 0.0
+    parsed = 0
+    try:
+        for _ in range(rounds):
+            analyses = [None] * len(notes)
+            clear_caches()
+            if analyze_query:
+                start = time.process_time()
+                analyses = [analyze_query(note) for note in notes]
+                analysis_time += time.process_time() - start
+            start = time.process_time()
+            for note, analysis in zip(notes, analyses):
+                meta = parse_existing_citation(note, analysis) if analysis else parse_existing_citation(note)
+                if meta:
+                    parsed += 1
+            elapsed += time.process_time() - start
+    finally:
+        sys.stdout = stdout
+        devnull.close()
+
+    total = rounds * len(notes)
+    print(f"{len(notes)} notes x {rounds} rounds, {parsed // rounds} parsed per round")
+    print(f"  {total / elapsed:,.0f} parses/sec ({elapsed / total * 1e6:.1f} us each)")
+    if analysis_time:
+        print(f"  shared query analysis: {analysis_time / total * 1e6:.1f} us each (not included above)")
+    if stats:
+        considered = stats['calls'] + stats['skipped']
+        print(f"  parser invocations: {stats['calls']} run, {stats['skipped']} skipped "
+              f"({stats['skipped'] / max(considered, 1):.0%} avoided)")
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,97 @@
+"""
+citeflex/benchmarks/bench_query_analysis.py
+
+Per-query CPU of the routing front end: the work route_citation does
+before any network call (parse_existing_citation, superlegal's legal
+check, detect_type).
+
+Works against trees with and without analysis.py, so running it on two
+commits gives the before/after numbers:
+
+    python benchmarks/bench_query_analysis.py [notes.txt] [--rounds N]
+
+Caches are cleared before every pass, so each query is measured cold.
+"""
+
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from unified_router import parse_existing_citation, detect_type, superlegal
+
+try:
+    from analysis import analyze_query
+except ImportError:
+    analyze_query = None
+
+try:
+    from citation_grammar import tokenize
+except ImportError:
+    tokenize = None
+
+
+def load_notes(path: str) -> list:
+    with open(path, encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip() and not line.startswith('#')]
+
+
+def clear_caches() -> None:
+    if analyze_query:
+        analyze_query.cache_clear()
+    if tokenize:
+        tokenize.cache_clear()
+    cached = getattr(superlegal._find_best_cache_match, 'cache_clear', None)
+    if cached:
+        cached()
+
+
+def front_end(query: str) -> None:
+    """Classification steps of route_citation, in order."""
+    if analyze_query:
+        analysis = analyze_query(query)
+        parse_existing_citation(query, analysis)
+        superlegal.is_legal_citation(query, analysis)
+        detect_type(query, analysis)
+    else:
+        parse_existing_citation(query)
+        superlegal.is_legal_citation(query)
+        detect_type(query)
+
+
+def main(argv: list) -> None:
+    rounds = 50
+    if '--rounds' in argv:
+        i = argv.index('--rounds')
+        rounds = int(argv[i + 1])
+        del argv[i:i + 2]
+    path = argv[0] if argv else os.path.join(os.path.dirname(__file__), 'notes.txt')
+    notes = load_notes(path)
+
+    # Parser debug output would dominate the timing
+    devnull = open(os.devnull, 'w')
+    stdout, sys.stdout = sys.stdout, devnull
+
+    elapsed = 0.0
+    try:
+        for _ in range(rounds):
+            clear_caches()
+            start = time.process_time()
+            for note in notes:
+                front_end(note)
+            elapsed += time.process_time() - start
+    finally:
+        sys.stdout = stdout
+        devnull.close()
+
+    calls = rounds * len(notes)
+    mode = 'shared analysis' if analyze_query else 'per-layer scans'
+    print(f"{len(notes)} notes x {rounds} rounds ({mode})")
+    print(f"  {elapsed / calls * 1e6:.1f} us CPU per query")
+    print(f"  {calls / elapsed:,.0f} queries/sec")
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -5,6 +5,16 @@ Claude AI-powered citation type detection and classification.
 Used as the primary AI router for ambiguous citation queries.
 
 Version History:
+    2026-10-18: classify_cached_with_claude - the answer when no model call is needed, else None
+    2026-10-18: get_citation_options reads the DOI with identifiers.first_identifier
+    2026-10-18: Model and search calls take their timeouts from the current request
+                deadline (deadline.py); get_citation_options fans out with it
+    2026-10-18: classify_batch_with_claude - one model call per AI_BATCH_SIZE notes,
+                answers stored per note in ai_cache for classify_with_claude
+    2026-10-18: Answers cached in ai_cache (keyed by query, versioned by model/prompt);
+                one shared Anthropic client; system prompts sent with cache_control
+    2026-10-18: _get_publisher_place uses the shared config.resolve_publisher_place
+                instead of rebuilding a local publisher dict on every call
     2025-12-06: Initial production version with multi-option support
     
 Usage:
@@ -20,14 +30,18 @@ Usage:
 import os
 import re
 import json
+import threading
 import requests
-from typing import Optional, Tuple, List
+from typing import Optional, Tuple, List, Dict
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 import anthropic
 
 from models import CitationType, CitationMetadata
-from config import DEFAULT_TIMEOUT
+from config import DEFAULT_TIMEOUT, AI_BATCH_SIZE, AI_BATCH_WORKERS, resolve_publisher_place
+from ai_cache import ai_cache, prompt_version, split_batch_response
+from deadline import request_timeout, remaining, deadline_expired, submit
+from identifiers import first_identifier
 
 # =============================================================================
 # CONFIGURATION
@@ -40,11 +54,25 @@ CLAUDE_MODEL = "claude-sonnet-4-20250514"
 # CLAUDE CLIENT
 # =============================================================================
 
+_client = None
+_client_lock = threading.Lock()
+
+
 def _get_client():
-    """Get Anthropic client (lazy initialization)."""
+    """Shared Anthropic client (lazy; reuses its HTTP connection pool)."""
+    global _client
     if not ANTHROPIC_API_KEY:
         return None
-    return anthropic.Anthropic(api_key=ANTHROPIC_API_KEY)
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = anthropic.Anthropic(api_key=ANTHROPIC_API_KEY)
+    return _client
+
+
+def _system(prompt: str) -> list:
+    """Static system prompt marked for Anthropic prompt caching."""
+    return [{"type": "text", "text": prompt, "cache_control": {"type": "ephemeral"}}]
 
 # =============================================================================
 # SINGLE CLASSIFICATION (for unified_router.py compatibility)
@@ -66,6 +94,21 @@ Classify as one of:
 Respond in JSON only:
 {"type": "...", "confidence": 0.0-1.0, "title": "", "authors": [], "year": "", "reasoning": "brief explanation"}"""
 
+BATCH_CLASSIFY_PROMPT = CLASSIFY_PROMPT.rsplit("Respond in JSON only:", 1)[0] + """You will receive several numbered inputs. Classify each one independently.
+
+Respond in JSON only: an array with one object per input, in input order:
+[{"id": 1, "type": "...", "confidence": 0.0-1.0, "title": "", "authors": [], "year": "", "reasoning": "brief explanation"}, ...]"""
+
+# Batch answers are cached per note under the single-note version, so
+# either prompt changing invalidates both
+CLASSIFY_VERSION = prompt_version(CLAUDE_MODEL, CLASSIFY_PROMPT + BATCH_CLASSIFY_PROMPT)
+
+# Output budget per note in a batch (one JSON object)
+BATCH_TOKENS_PER_ITEM = 160
+
+# A full batch generates thousands of tokens; allow it more than one call
+BATCH_TIMEOUT = 60  # seconds
+
 
 class ClaudeRouter:
     """Uses Claude to classify ambiguous citation queries."""
@@ -74,23 +117,43 @@ class ClaudeRouter:
         self.api_key = api_key or ANTHROPIC_API_KEY
         self.timeout = timeout or DEFAULT_TIMEOUT
         self.client = None
-        if self.api_key:
+        if self.api_key == ANTHROPIC_API_KEY:
+            self.client = _get_client()
+        elif self.api_key:
             self.client = anthropic.Anthropic(api_key=self.api_key)
     
+    def classify_cached(self, text: str) -> Optional[Tuple[CitationType, Optional[CitationMetadata]]]:
+        """
+        The answer classify gives without a model call (cached, or UNKNOWN
+        with no API key), or None when classify would call the model.
+        """
+        cached = ai_cache.get(CLASSIFY_VERSION, text)
+        if cached is not None:
+            return self._parse_response(cached, text)
+        if not self.client:
+            return CitationType.UNKNOWN, None
+        return None
+    
     def classify(self, text: str) -> Tuple[CitationType, Optional[CitationMetadata]]:
         """Classify a citation query and return type + metadata."""
-        if not self.client:
+        cached = self.classify_cached(text)
+        if cached is not None:
+            return cached
+        
+        if not self.client or deadline_expired():
             return CitationType.UNKNOWN, None
         
         try:
             response = self.client.messages.create(
                 model=CLAUDE_MODEL,
                 max_tokens=500,
-                system=CLASSIFY_PROMPT,
-                messages=[{"role": "user", "content": f"Classify this citation:\n\n{text}"}]
+                system=_system(CLASSIFY_PROMPT),
+                messages=[{"role": "user", "content": f"Classify this citation:\n\n{text}"}],
+                timeout=request_timeout(self.timeout)
             )
             
             response_text = response.content[0].text
+            ai_cache.put(CLASSIFY_VERSION, text, response_text)
             return self._parse_response(response_text, text)
             
         except anthropic.RateLimitError:
@@ -136,7 +199,7 @@ class ClaudeRouter:
                 authors=data.get('authors', []),
                 year=data.get('year'),
                 confidence=data.get('confidence', 0.5),
-                notes=data.get('reasoning', ''),
+                raw_data={'reasoning': data.get('reasoning', '')},
             )
             
             return citation_type, metadata
@@ -145,11 +208,76 @@ class ClaudeRouter:
             return CitationType.UNKNOWN, None
         except Exception:
             return CitationType.UNKNOWN, None
+    
+    def classify_batch(self, texts: List[str]) -> Dict[str, Tuple[CitationType, Optional[CitationMetadata]]]:
+        """
+        Classify many queries with one model call per AI_BATCH_SIZE of them.
+
+        Queries already in the cache are not sent. Each answer is cached on
+        its own, so a later classify() of the same query is a cache hit.
+        Queries the model skipped or failed on are absent from the result.
+        """
+        results = {}
+        pending = []
+        for text in dict.fromkeys(texts):
+            cached = ai_cache.get(CLASSIFY_VERSION, text)
+            if cached is not None:
+                results[text] = self._parse_response(cached, text)
+            else:
+                pending.append(text)
+        
+        if not pending or not self.client:
+            return results
+        
+        chunks = [pending[i:i + AI_BATCH_SIZE] for i in range(0, len(pending), AI_BATCH_SIZE)]
+        print(f"[ClaudeRouter] Batch classifying {len(pending)} queries in {len(chunks)} calls")
+        with ThreadPoolExecutor(max_workers=min(len(chunks), AI_BATCH_WORKERS)) as executor:
+            for answers in executor.map(self._classify_chunk, chunks):
+                for text, response_text in answers.items():
+                    ai_cache.put(CLASSIFY_VERSION, text, response_text)
+                    results[text] = self._parse_response(response_text, text)
+        return results
+    
+    def _classify_chunk(self, texts: List[str]) -> Dict[str, str]:
+        """One batch call; maps each query to its answer as single-note JSON."""
+        numbered = "\n\n".join(f"{i}. {text}" for i, text in enumerate(texts, 1))
+        try:
+            response = self.client.messages.create(
+                model=CLAUDE_MODEL,
+                max_tokens=BATCH_TOKENS_PER_ITEM * len(texts),
+                system=_system(BATCH_CLASSIFY_PROMPT),
+                messages=[{"role": "user", "content": f"Classify these citations:\n\n{numbered}"}],
+                timeout=request_timeout(BATCH_TIMEOUT)
+            )
+            return split_batch_response(response.content[0].text, texts)
+        except Exception as e:
+            print(f"[ClaudeRouter] Batch error: {e}")
+            return {}
+
+
+_router = None
+
+
+def _shared_router() -> ClaudeRouter:
+    global _router
+    if _router is None:
+        _router = ClaudeRouter()
+    return _router
 
 
 def classify_with_claude(text: str) -> Tuple[CitationType, Optional[CitationMetadata]]:
     """Convenience function for unified_router.py compatibility."""
-    return ClaudeRouter().classify(text)
+    return _shared_router().classify(text)
+
+
+def classify_cached_with_claude(text: str) -> Optional[Tuple[CitationType, Optional[CitationMetadata]]]:
+    """classify_with_claude's answer when it needs no model call, else None."""
+    return _shared_router().classify_cached(text)
+
+
+def classify_batch_with_claude(texts: List[str]) -> Dict[str, Tuple[CitationType, Optional[CitationMetadata]]]:
+    """Batch classification for process_document (see ClaudeRouter.classify_batch)."""
+    return _shared_router().classify_batch(texts)
 
 
 # =============================================================================
@@ -171,21 +299,27 @@ Respond in JSON only:
 Generate 2-3 search queries optimized for different APIs (books, journals, legal).
 Do NOT invent specific details - just extract what's in the input."""
 
+IDENTIFY_VERSION = prompt_version(CLAUDE_MODEL, IDENTIFY_PROMPT)
+
 
 def _identify_with_claude(messy_note: str) -> dict:
     """Have Claude identify what the citation might be."""
+    text = ai_cache.get(IDENTIFY_VERSION, messy_note)
     client = _get_client()
-    if not client:
+    if text is None and not client:
         return {"possible_types": ["unknown"], "search_queries": [messy_note]}
     
     try:
-        response = client.messages.create(
-            model=CLAUDE_MODEL,
-            max_tokens=400,
-            system=IDENTIFY_PROMPT,
-            messages=[{"role": "user", "content": f"Identify this citation:\n\n{messy_note}"}]
-        )
-        text = response.content[0].text.strip()
+        if text is None:
+            response = client.messages.create(
+                model=CLAUDE_MODEL,
+                max_tokens=400,
+                system=_system(IDENTIFY_PROMPT),
+                messages=[{"role": "user", "content": f"Identify this citation:\n\n{messy_note}"}],
+                timeout=request_timeout(DEFAULT_TIMEOUT)
+            )
+            text = response.content[0].text.strip()
+            ai_cache.put(IDENTIFY_VERSION, messy_note, text)
         json_match = re.search(r'\{[\s\S]*\}', text)
         if json_match:
             return json.loads(json_match.group())
@@ -214,390 +348,7 @@ def _format_authors(authors: list) -> str:
 
 def _get_publisher_place(publisher: str) -> str:
     """Get publication place from publisher name."""
-    if not publisher:
-        return ""
-    
-    publisher_places = {
-        # === MAJOR TRADE PUBLISHERS (Big 5 and imprints) ===
-        "simon & schuster": "New York",
-        "simon and schuster": "New York",
-        "scribner": "New York",
-        "atria": "New York",
-        "gallery books": "New York",
-        "pocket books": "New York",
-        "threshold": "New York",
-        
-        "penguin": "New York",
-        "penguin random house": "New York",
-        "penguin books": "New York",
-        "penguin press": "New York",
-        "viking": "New York",
-        "dutton": "New York",
-        "putnam": "New York",
-        "berkley": "New York",
-        "ace books": "New York",
-        "plume": "New York",
-        "riverhead": "New York",
-        
-        "random house": "New York",
-        "knopf": "New York",
-        "alfred a. knopf": "New York",
-        "doubleday": "New York",
-        "crown": "New York",
-        "ballantine": "New York",
-        "bantam": "New York",
-        "dell": "New York",
-        "anchor books": "New York",
-        "anchor": "New York",
-        "vintage": "New York",
-        "vintage books": "New York",
-        "pantheon": "New York",
-        "modern library": "New York",
-        
-        "harpercollins": "New York",
-        "harper": "New York",
-        "harper & row": "New York",
-        "harper perennial": "New York",
-        "william morrow": "New York",
-        "morrow": "New York",
-        "avon": "New York",
-        "ecco": "New York",
-        "harperone": "New York",
-        
-        "hachette": "New York",
-        "little, brown": "Boston",
-        "little brown": "Boston",
-        "grand central": "New York",
-        "twelve": "New York",
-        "basic books": "New York",
-        "publicaffairs": "New York",
-        "public affairs": "New York",
-        
-        "macmillan": "New York",
-        "st. martin's": "New York",
-        "st martin's": "New York",
-        "st. martin's press": "New York",
-        "st martin's press": "New York",
-        "st. martins": "New York",
-        "henry holt": "New York",
-        "holt": "New York",
-        "farrar, straus": "New York",
-        "farrar straus": "New York",
-        "fsg": "New York",
-        "hill and wang": "New York",
-        "picador": "New York",
-        "flatiron": "New York",
-        "tor books": "New York",
-        "tor": "New York",
-        
-        # === OTHER MAJOR TRADE ===
-        "norton": "New York",
-        "w. w. norton": "New York",
-        "w.w. norton": "New York",
-        "liveright": "New York",
-        "bloomsbury": "New York",
-        "grove": "New York",
-        "grove atlantic": "New York",
-        "grove press": "New York",
-        "atlantic monthly": "New York",
-        "algonquin": "Chapel Hill",
-        "workman": "New York",
-        "artisan": "New York",
-        "abrams": "New York",
-        "chronicle books": "San Francisco",
-        "ten speed": "Berkeley",
-        "clarkson potter": "New York",
-        "potter": "New York",
-        "rizzoli": "New York",
-        "phaidon": "London",
-        "taschen": "Cologne",
-        "dk": "New York",
-        "dorling kindersley": "New York",
-        "national geographic": "Washington, DC",
-        "smithsonian": "Washington, DC",
-        "time life": "New York",
-        "reader's digest": "New York",
-        "rodale": "New York",
-        "hay house": "Carlsbad, CA",
-        "sounds true": "Boulder",
-        "shambhala": "Boulder",
-        "new world library": "Novato, CA",
-        "berrett-koehler": "San Francisco",
-        "jossey-bass": "San Francisco",
-        "wiley": "Hoboken",
-        "john wiley": "Hoboken",
-        "for dummies": "Hoboken",
-        "mcgraw-hill": "New York",
-        "mcgraw hill": "New York",
-        "pearson": "New York",
-        "cengage": "Boston",
-        "wadsworth": "Belmont, CA",
-        "sage": "Thousand Oaks, CA",
-        "sage publications": "Thousand Oaks, CA",
-        
-        # === UNIVERSITY PRESSES (full names) ===
-        "oxford university press": "Oxford",
-        "oxford univ press": "Oxford",
-        "oup": "Oxford",
-        "cambridge university press": "Cambridge",
-        "cambridge univ press": "Cambridge",
-        "cup": "Cambridge",
-        "harvard university press": "Cambridge, MA",
-        "harvard univ press": "Cambridge, MA",
-        "yale university press": "New Haven",
-        "yale univ press": "New Haven",
-        "princeton university press": "Princeton",
-        "princeton univ press": "Princeton",
-        "columbia university press": "New York",
-        "columbia univ press": "New York",
-        "mit press": "Cambridge, MA",
-        "stanford university press": "Stanford",
-        "stanford univ press": "Stanford",
-        "university of chicago press": "Chicago",
-        "univ of chicago press": "Chicago",
-        "u of chicago press": "Chicago",
-        "chicago university press": "Chicago",
-        "university of california press": "Berkeley",
-        "univ of california press": "Berkeley",
-        "u of california press": "Berkeley",
-        "uc press": "Berkeley",
-        "california university press": "Berkeley",
-        "johns hopkins university press": "Baltimore",
-        "johns hopkins univ press": "Baltimore",
-        "jhu press": "Baltimore",
-        "johns hopkins": "Baltimore",
-        "duke university press": "Durham",
-        "duke univ press": "Durham",
-        "cornell university press": "Ithaca",
-        "cornell univ press": "Ithaca",
-        "university of pennsylvania press": "Philadelphia",
-        "univ of pennsylvania press": "Philadelphia",
-        "penn press": "Philadelphia",
-        "upenn press": "Philadelphia",
-        "university of north carolina press": "Chapel Hill",
-        "univ of north carolina press": "Chapel Hill",
-        "unc press": "Chapel Hill",
-        "university of virginia press": "Charlottesville",
-        "univ of virginia press": "Charlottesville",
-        "uva press": "Charlottesville",
-        "university of texas press": "Austin",
-        "univ of texas press": "Austin",
-        "ut press": "Austin",
-        "university of michigan press": "Ann Arbor",
-        "univ of michigan press": "Ann Arbor",
-        "michigan university press": "Ann Arbor",
-        "university of illinois press": "Urbana",
-        "univ of illinois press": "Urbana",
-        "illinois university press": "Urbana",
-        "university of wisconsin press": "Madison",
-        "univ of wisconsin press": "Madison",
-        "wisconsin university press": "Madison",
-        "university of minnesota press": "Minneapolis",
-        "univ of minnesota press": "Minneapolis",
-        "minnesota university press": "Minneapolis",
-        "indiana university press": "Bloomington",
-        "indiana univ press": "Bloomington",
-        "iu press": "Bloomington",
-        "ohio state university press": "Columbus",
-        "ohio state univ press": "Columbus",
-        "osu press": "Columbus",
-        "penn state university press": "University Park",
-        "penn state univ press": "University Park",
-        "psu press": "University Park",
-        "university of georgia press": "Athens",
-        "univ of georgia press": "Athens",
-        "uga press": "Athens",
-        "louisiana state university press": "Baton Rouge",
-        "lsu press": "Baton Rouge",
-        "university of washington press": "Seattle",
-        "univ of washington press": "Seattle",
-        "uw press": "Seattle",
-        "university of arizona press": "Tucson",
-        "univ of arizona press": "Tucson",
-        "university of new mexico press": "Albuquerque",
-        "univ of new mexico press": "Albuquerque",
-        "unm press": "Albuquerque",
-        "university of oklahoma press": "Norman",
-        "univ of oklahoma press": "Norman",
-        "ou press": "Norman",
-        "university of nebraska press": "Lincoln",
-        "univ of nebraska press": "Lincoln",
-        "nebraska university press": "Lincoln",
-        "university of iowa press": "Iowa City",
-        "univ of iowa press": "Iowa City",
-        "iowa university press": "Iowa City",
-        "university of missouri press": "Columbia, MO",
-        "univ of missouri press": "Columbia, MO",
-        "university of kansas press": "Lawrence",
-        "univ of kansas press": "Lawrence",
-        "university of colorado press": "Boulder",
-        "univ of colorado press": "Boulder",
-        "university of utah press": "Salt Lake City",
-        "univ of utah press": "Salt Lake City",
-        "university of hawaii press": "Honolulu",
-        "univ of hawaii press": "Honolulu",
-        "university of toronto press": "Toronto",
-        "univ of toronto press": "Toronto",
-        "utp": "Toronto",
-        "mcgill-queen's university press": "Montreal",
-        "mcgill-queens university press": "Montreal",
-        "mcgill queen's": "Montreal",
-        "university of british columbia press": "Vancouver",
-        "ubc press": "Vancouver",
-        "edinburgh university press": "Edinburgh",
-        "manchester university press": "Manchester",
-        "university of wales press": "Cardiff",
-        "liverpool university press": "Liverpool",
-        "bristol university press": "Bristol",
-        "amsterdam university press": "Amsterdam",
-        "leiden university press": "Leiden",
-        
-        # === ACADEMIC/SCHOLARLY PUBLISHERS ===
-        "routledge": "London",
-        "taylor & francis": "London",
-        "taylor and francis": "London",
-        "crc press": "Boca Raton",
-        "brill": "Leiden",
-        "elsevier": "Amsterdam",
-        "springer": "New York",
-        "springer nature": "New York",
-        "springer verlag": "Berlin",
-        "springer-verlag": "Berlin",
-        "palgrave": "London",
-        "palgrave macmillan": "London",
-        "de gruyter": "Berlin",
-        "walter de gruyter": "Berlin",
-        "mouton de gruyter": "Berlin",
-        "academic press": "San Diego",
-        "blackwell": "Oxford",
-        "wiley-blackwell": "Oxford",
-        "polity": "Cambridge",
-        "polity press": "Cambridge",
-        "verso": "London",
-        "zed books": "London",
-        "pluto press": "London",
-        "berg": "Oxford",
-        "ashgate": "Farnham",
-        "edward elgar": "Cheltenham",
-        "peter lang": "New York",
-        "lexington books": "Lanham",
-        "rowman & littlefield": "Lanham",
-        "rowman and littlefield": "Lanham",
-        "scarecrow": "Lanham",
-        "university press of america": "Lanham",
-        "upa": "Lanham",
-        "continuum": "London",
-        "t&t clark": "London",
-        "t & t clark": "London",
-        "fortress press": "Minneapolis",
-        "westminster john knox": "Louisville",
-        "wjk": "Louisville",
-        "eerdmans": "Grand Rapids",
-        "baker academic": "Grand Rapids",
-        "intervarsity press": "Downers Grove",
-        "ivp": "Downers Grove",
-        "zondervan": "Grand Rapids",
-        "abingdon": "Nashville",
-        "broadman & holman": "Nashville",
-        "b&h": "Nashville",
-        "moody": "Chicago",
-        "crossway": "Wheaton",
-        
-        # === LAW PUBLISHERS ===
-        "west": "St. Paul",
-        "west publishing": "St. Paul",
-        "thomson west": "St. Paul",
-        "lexisnexis": "New York",
-        "lexis nexis": "New York",
-        "matthew bender": "New York",
-        "wolters kluwer": "New York",
-        "aspen": "New York",
-        "aspen publishers": "New York",
-        "foundation press": "St. Paul",
-        "carolina academic press": "Durham",
-        "cap": "Durham",
-        
-        # === MEDICAL/SCIENCE ===
-        "lippincott": "Philadelphia",
-        "lippincott williams": "Philadelphia",
-        "lww": "Philadelphia",
-        "saunders": "Philadelphia",
-        "mosby": "St. Louis",
-        "elsevier health": "Philadelphia",
-        "thieme": "New York",
-        "karger": "Basel",
-        "nature publishing": "London",
-        "cold spring harbor": "Cold Spring Harbor",
-        "cshl press": "Cold Spring Harbor",
-        "asm press": "Washington, DC",
-        "american chemical society": "Washington, DC",
-        "acs": "Washington, DC",
-        "american psychological association": "Washington, DC",
-        "apa": "Washington, DC",
-        "american psychiatric": "Washington, DC",
-        "guilford": "New York",
-        "guilford press": "New York",
-        
-        # === ARTS/HUMANITIES ===
-        "yale art": "New Haven",
-        "metropolitan museum": "New York",
-        "met publications": "New York",
-        "getty": "Los Angeles",
-        "getty publications": "Los Angeles",
-        "prestel": "Munich",
-        "thames & hudson": "London",
-        "thames and hudson": "London",
-        "laurence king": "London",
-        
-        # === TECH ===
-        "o'reilly": "Sebastopol",
-        "oreilly": "Sebastopol",
-        "addison-wesley": "Boston",
-        "addison wesley": "Boston",
-        "prentice hall": "Upper Saddle River",
-        "apress": "New York",
-        "manning": "Shelter Island",
-        "no starch": "San Francisco",
-        "no starch press": "San Francisco",
-        "pragmatic": "Raleigh",
-        "pragmatic bookshelf": "Raleigh",
-        "packt": "Birmingham",
-        "sams": "Indianapolis",
-        "que": "Indianapolis",
-        "new riders": "Berkeley",
-        "peachpit": "San Francisco",
-        
-        # === INTERNATIONAL ===
-        "gallimard": "Paris",
-        "flammarion": "Paris",
-        "seuil": "Paris",
-        "albin michel": "Paris",
-        "fayard": "Paris",
-        "hachette livre": "Paris",
-        "puf": "Paris",
-        "suhrkamp": "Frankfurt",
-        "fischer": "Frankfurt",
-        "rowohlt": "Hamburg",
-        "hanser": "Munich",
-        "beck": "Munich",
-        "c.h. beck": "Munich",
-        "dtv": "Munich",
-        "einaudi": "Turin",
-        "mondadori": "Milan",
-        "feltrinelli": "Milan",
-        "laterza": "Rome",
-        "alianza": "Madrid",
-        "anagrama": "Barcelona",
-        "tusquets": "Barcelona",
-        "fondo de cultura": "Mexico City",
-        "siglo xxi": "Mexico City",
-    }
-    
-    pub_lower = publisher.lower()
-    for pub_key, place in publisher_places.items():
-        if pub_key in pub_lower:
-            return place
-    return ""
+    return resolve_publisher_place(publisher)
 
 
 def _search_google_books(query: str, limit: int = 3) -> list:
@@ -606,7 +357,7 @@ def _search_google_books(query: str, limit: int = 3) -> list:
     try:
         url = "https://www.googleapis.com/books/v1/volumes"
         params = {"q": query, "maxResults": limit * 2, "orderBy": "relevance"}
-        resp = requests.get(url, params=params, timeout=10)
+        resp = requests.get(url, params=params, timeout=request_timeout(10))
         
         if resp.status_code == 200:
             items = resp.json().get("items", [])
@@ -666,7 +417,7 @@ def _search_crossref(query: str, limit: int = 3) -> list:
         url = "https://api.crossref.org/works"
         params = {"query": query, "rows": limit * 2}
         headers = {"User-Agent": "CiteFlex/1.0 (mailto:contact@citeflex.com)"}
-        resp = requests.get(url, params=params, headers=headers, timeout=10)
+        resp = requests.get(url, params=params, headers=headers, timeout=request_timeout(10))
         
         if resp.status_code == 200:
             items = resp.json().get("message", {}).get("items", [])
@@ -756,7 +507,7 @@ def _search_pubmed(query: str, limit: int = 3) -> list:
         # Step 1: Search for PMIDs
         search_url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esearch.fcgi"
         search_params = {"db": "pubmed", "term": query, "retmax": limit, "retmode": "json"}
-        search_resp = requests.get(search_url, params=search_params, timeout=10)
+        search_resp = requests.get(search_url, params=search_params, timeout=request_timeout(10))
         
         if search_resp.status_code != 200:
             return results
@@ -768,7 +519,7 @@ def _search_pubmed(query: str, limit: int = 3) -> list:
         # Step 2: Fetch details
         fetch_url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esummary.fcgi"
         fetch_params = {"db": "pubmed", "id": ",".join(pmids), "retmode": "json"}
-        fetch_resp = requests.get(fetch_url, params=fetch_params, timeout=10)
+        fetch_resp = requests.get(fetch_url, params=fetch_params, timeout=request_timeout(10))
         
         if fetch_resp.status_code != 200:
             return results
@@ -875,14 +626,13 @@ def get_citation_options(messy_note: str, max_options: int = 5) -> list:
     all_results = []
     
     # Check for DOI in input
-    doi_match = re.search(r'(10\.\d{4,}/[^\s\'"<>]+)', messy_note)
-    if doi_match:
-        doi = doi_match.group(1).rstrip('.,;')
+    doi = first_identifier(messy_note, 'doi')
+    if doi:
         # Direct DOI lookup via Crossref
         try:
             url = f"https://api.crossref.org/works/{doi}"
             headers = {"User-Agent": "CiteFlex/1.0"}
-            resp = requests.get(url, headers=headers, timeout=10)
+            resp = requests.get(url, headers=headers, timeout=request_timeout(10))
             if resp.status_code == 200:
                 item = resp.json().get("message", {})
                 title = item.get("title", [""])[0] if item.get("title") else ""
@@ -946,16 +696,16 @@ def get_citation_options(messy_note: str, max_options: int = 5) -> list:
         futures = []
         
         for query in queries[:2]:
-            futures.append(executor.submit(_search_google_books, query, 2))
-            futures.append(executor.submit(_search_crossref, query, 2))
-            futures.append(executor.submit(_search_pubmed, query, 2))
+            futures.append(submit(executor, _search_google_books, query, 2))
+            futures.append(submit(executor, _search_crossref, query, 2))
+            futures.append(submit(executor, _search_pubmed, query, 2))
         
         if messy_note not in queries:
-            futures.append(executor.submit(_search_google_books, messy_note, 2))
-            futures.append(executor.submit(_search_crossref, messy_note, 2))
-            futures.append(executor.submit(_search_pubmed, messy_note, 2))
+            futures.append(submit(executor, _search_google_books, messy_note, 2))
+            futures.append(submit(executor, _search_crossref, messy_note, 2))
+            futures.append(submit(executor, _search_pubmed, messy_note, 2))
         
-        for future in as_completed(futures, timeout=20):
+        for future in as_completed(futures, timeout=remaining(20)):
             try:
                 results = future.result(timeout=5)
                 all_results.extend(results)
@@ -4,11 +4,27 @@ citeflex/config.py
 Configuration, constants, and shared settings.
 
 Version History:
+    2026-10-18: Added PUBMED_URL_DOMAINS ('pubmed' in DOMAIN_TRIE) for the router's URL routing
+    2026-10-18: Added REQUEST_DEADLINE / NOTE_DEADLINE (end-to-end budgets, see deadline.py)
+    2026-10-18: Added LOCAL_CLASSIFIER_FILE / LOCAL_CLASSIFIER_THRESHOLD
+    2026-10-18: Added AI_BATCH_SIZE / AI_BATCH_WORKERS for batched document classification
+    2026-10-18: Added AI_CACHE_DB / AI_CACHE_TTL for the persistent AI classification cache
+    2026-10-18: Added DOMAIN_TRIE (newspaper/gov/medical/legal/academic), MEDICAL_DOMAINS
+                and find_domain; get_gov_agency no longer re-sorts keys per call
+    2026-10-18: Merged books.py/claude_router.py publisher maps into PUBLISHER_PLACE_MAP;
+                resolve_publisher_place now uses a longest-match PhraseMatcher
+    2026-10-18: Added ISBN_RANGES_FILE / ISBN_REGISTRANTS_FILE for offline ISBN → publisher
+    2026-10-18: Added OPENLIBRARY_LOCAL_DB for the local ISBN/edition index
+    2026-10-18: Added CROSSREF_LOCAL_DB for the offline Crossref snapshot index
     2025-12-05: Added version tracking, fixed get_gov_agency to check specific domains first
 """
 
 import os
-from typing import Dict
+import tempfile
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+from matching import PhraseMatcher, DomainTrie, iter_hosts
 
 # =============================================================================
 # API KEYS (from environment)
@@ -21,11 +37,62 @@ SEMANTIC_SCHOLAR_API_KEY = os.environ.get('SEMANTIC_SCHOLAR_API_KEY', '')
 GOOGLE_CSE_API_KEY = os.environ.get('GOOGLE_CSE_API_KEY', '')
 GOOGLE_CSE_ID = os.environ.get('GOOGLE_CSE_ID', '')
 
+# =============================================================================
+# LOCAL INDEXES (optional - engines fall back to network when unset/missing)
+# =============================================================================
+
+# SQLite FTS5 index built from Crossref public data-file JSONL
+# (see engines/crossref_local.py for the build command)
+CROSSREF_LOCAL_DB = os.environ.get('CROSSREF_LOCAL_DB', '')
+
+# SQLite ISBN/edition index built from Open Library editions dumps
+# (see engines/openlibrary_local.py for the build command)
+OPENLIBRARY_LOCAL_DB = os.environ.get('OPENLIBRARY_LOCAL_DB', '')
+
+# ISBN registrant data (see engines/isbn_registrants.py):
+# RangeMessage.xml from isbn-international.org and an extra "prefix,publisher" CSV
+ISBN_RANGES_FILE = os.environ.get('ISBN_RANGES_FILE', '')
+ISBN_REGISTRANTS_FILE = os.environ.get('ISBN_REGISTRANTS_FILE', '')
+
+# Naive Bayes citation-type model trained from logged AI classifications
+# (see local_classifier.py for the training command). UNKNOWN queries it is
+# at least LOCAL_CLASSIFIER_THRESHOLD sure about never reach Claude/Gemini.
+LOCAL_CLASSIFIER_FILE = os.environ.get(
+    'LOCAL_CLASSIFIER_FILE',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'citation_classifier.json.gz')
+)
+LOCAL_CLASSIFIER_THRESHOLD = float(os.environ.get('LOCAL_CLASSIFIER_THRESHOLD', 0.9))
+
+# SQLite cache of AI router answers (see ai_cache.py); set AI_CACHE_DB=""
+# to disable. Entries expire after AI_CACHE_TTL seconds and whenever the
+# model or prompt changes.
+AI_CACHE_DB = os.environ.get(
+    'AI_CACHE_DB', os.path.join(tempfile.gettempdir(), 'citeflex_ai_cache.db')
+)
+AI_CACHE_TTL = int(os.environ.get('AI_CACHE_TTL', 30 * 24 * 3600))  # 30 days
+
+# Keep each engine's full upstream record in CitationMetadata.raw_data.
+# Off by default: nothing reads it, and it is carried into session pickles
+# and /api/cite responses (Crossref items with reference lists run to
+# hundreds of KB). Turn on to debug engine normalization.
+KEEP_RAW_DATA = os.environ.get('KEEP_RAW_DATA', '').lower() in ('1', 'true', 'yes')
+
+# Batched AI classification of a document's ambiguous notes: notes per
+# model call, and chunks in flight at once
+AI_BATCH_SIZE = int(os.environ.get('AI_BATCH_SIZE', 25))
+AI_BATCH_WORKERS = int(os.environ.get('AI_BATCH_WORKERS', 4))
+
 # =============================================================================
 # HTTP SETTINGS
 # =============================================================================
 
 DEFAULT_TIMEOUT = 10  # seconds
+
+# End-to-end budgets (deadline.py): every HTTP call made for a request or
+# document note takes its timeout from what is left of these
+REQUEST_DEADLINE = float(os.environ.get('REQUEST_DEADLINE', 20))  # /api/cite, /api/cite/multiple
+NOTE_DEADLINE = float(os.environ.get('NOTE_DEADLINE', 8))  # one note of an uploaded document
+
 DEFAULT_HEADERS = {
     'User-Agent': 'CiteFlex/2.0 (mailto:user@example.com)',
     'Accept': 'application/json'
@@ -117,46 +184,443 @@ GOV_AGENCY_MAP: Dict[str, str] = {
 # PUBLISHER PLACE MAPPING (for books)
 # =============================================================================
 
+# Single source for publisher → place (previously duplicated in books.py and
+# claude_router.py). Resolved through a PhraseMatcher: longest match wins.
+
 PUBLISHER_PLACE_MAP: Dict[str, str] = {
-    'Harvard University Press': 'Cambridge, MA',
-    'MIT Press': 'Cambridge, MA',
-    'Yale University Press': 'New Haven',
-    'Princeton University Press': 'Princeton',
-    'Stanford University Press': 'Stanford',
-    'University of California Press': 'Berkeley',
-    'University of Chicago Press': 'Chicago',
-    'Columbia University Press': 'New York',
-    'Oxford University Press': 'Oxford',
-    'Cambridge University Press': 'Cambridge',
+    # === MAJOR TRADE PUBLISHERS (Big 5 and imprints) ===
+    'Simon & Schuster': 'New York',
+    'Simon and Schuster': 'New York',
+    'Scribner': 'New York',
+    'Atria': 'New York',
+    'Gallery Books': 'New York',
+    'Pocket Books': 'New York',
+    'Threshold': 'New York',
+    
     'Penguin': 'New York',
+    'Penguin Random House': 'New York',
+    'Penguin Books': 'New York',
+    'Penguin Press': 'New York',
+    'Viking': 'New York',
+    'Dutton': 'New York',
+    'Putnam': 'New York',
+    'Putnam Juvenile': 'New York',
+    'Berkley': 'New York',
+    'Ace Books': 'New York',
+    'Plume': 'New York',
+    'Riverhead': 'New York',
+    
     'Random House': 'New York',
+    'Knopf': 'New York',
+    'Alfred A. Knopf': 'New York',
+    'Doubleday': 'New York',
+    'Crown': 'New York',
+    'Ballantine': 'New York',
+    'Bantam': 'New York',
+    'Dell': 'New York',
+    'Anchor Books': 'New York',
+    'Anchor': 'New York',
+    'Vintage': 'New York',
+    'Vintage Books': 'New York',
+    'Pantheon': 'New York',
+    'Modern Library': 'New York',
+    
     'HarperCollins': 'New York',
-    'Simon & Schuster': 'New York',
+    'Harper': 'New York',
+    'Harper & Row': 'New York',
+    'Harper Perennial': 'New York',
+    'William Morrow': 'New York',
+    'Morrow': 'New York',
+    'Avon': 'New York',
+    'Ecco': 'New York',
+    'HarperOne': 'New York',
+    
+    'Hachette': 'New York',
+    'Little, Brown': 'Boston',
+    'Little Brown': 'Boston',
+    'Grand Central': 'New York',
+    'Twelve': 'New York',
+    'Basic Books': 'New York',
+    'PublicAffairs': 'New York',
+    'Public Affairs': 'New York',
+    
+    'Macmillan': 'New York',
+    "St. Martin's": 'New York',
+    "St Martin's": 'New York',
+    "St. Martin's Press": 'New York',
+    "St Martin's Press": 'New York',
+    'St. Martins': 'New York',
+    'Henry Holt': 'New York',
+    'Holt': 'New York',
+    'Farrar, Straus': 'New York',
+    'Farrar Straus': 'New York',
     'Farrar, Straus and Giroux': 'New York',
+    'FSG': 'New York',
+    'Hill and Wang': 'New York',
+    'Picador': 'New York',
+    'Flatiron': 'New York',
+    'Tor Books': 'New York',
+    'Tor': 'New York',
+    
+    # === OTHER MAJOR TRADE ===
+    'Norton': 'New York',
     'W. W. Norton': 'New York',
-    'Knopf': 'New York',
-    'Routledge': 'London',
-    'Bloomsbury': 'London',
-    'Sage Publications': 'Thousand Oaks',
+    'W.W. Norton': 'New York',
+    'Liveright': 'New York',
+    'Bloomsbury': 'New York',
+    'Grove': 'New York',
+    'Grove Atlantic': 'New York',
+    'Grove Press': 'New York',
+    'Atlantic Monthly': 'New York',
+    'Algonquin': 'Chapel Hill',
+    'Workman': 'New York',
+    'Artisan': 'New York',
+    'Abrams': 'New York',
+    'Chronicle Books': 'San Francisco',
+    'Ten Speed': 'Berkeley',
+    'Clarkson Potter': 'New York',
+    'Potter': 'New York',
+    'Rizzoli': 'New York',
+    'Phaidon': 'London',
+    'Taschen': 'Cologne',
+    'DK': 'New York',
+    'Dorling Kindersley': 'New York',
+    'National Geographic': 'Washington, DC',
+    'Smithsonian': 'Washington, DC',
+    'Time Life': 'New York',
+    "Reader's Digest": 'New York',
+    'Rodale': 'New York',
+    'Hay House': 'Carlsbad, CA',
+    'Sounds True': 'Boulder',
+    'Shambhala': 'Boulder',
+    'New World Library': 'Novato, CA',
+    'Berrett-Koehler': 'San Francisco',
+    'Jossey-Bass': 'San Francisco',
     'Wiley': 'Hoboken',
-    'Springer': 'New York',
-    'Elsevier': 'Amsterdam',
-    'Taylor & Francis': 'London',
-    'Palgrave Macmillan': 'London',
-    'Duke University Press': 'Durham',
+    'John Wiley': 'Hoboken',
+    'For Dummies': 'Hoboken',
+    'McGraw-Hill': 'New York',
+    'McGraw Hill': 'New York',
+    'Pearson': 'New York',
+    'Cengage': 'Boston',
+    'Wadsworth': 'Belmont, CA',
+    'SAGE': 'Thousand Oaks, CA',
+    'Sage Publications': 'Thousand Oaks, CA',
+    'Free Press': 'New York',
+    'Beacon Press': 'Boston',
+    'Houghton Mifflin': 'Boston',
+    'Houghton Mifflin Harcourt': 'Boston',
+    
+    # === UNIVERSITY PRESSES (full names and abbreviations) ===
+    'Oxford University Press': 'Oxford',
+    'Oxford Univ Press': 'Oxford',
+    'OUP': 'Oxford',
+    'Cambridge University Press': 'Cambridge',
+    'Cambridge Univ Press': 'Cambridge',
+    'CUP': 'Cambridge',
+    'Cambridge Scholars': 'Newcastle upon Tyne',
+    'Cambridge Scholars Publishing': 'Newcastle upon Tyne',
+    'Harvard University Press': 'Cambridge, MA',
+    'Harvard Univ Press': 'Cambridge, MA',
+    'Yale University Press': 'New Haven',
+    'Yale Univ Press': 'New Haven',
+    'Princeton University Press': 'Princeton',
+    'Princeton Univ Press': 'Princeton',
+    'Columbia University Press': 'New York',
+    'Columbia Univ Press': 'New York',
+    'MIT Press': 'Cambridge, MA',
+    'Stanford University Press': 'Stanford',
+    'Stanford Univ Press': 'Stanford',
+    'University of Chicago Press': 'Chicago',
+    'Univ of Chicago Press': 'Chicago',
+    'U of Chicago Press': 'Chicago',
+    'Chicago University Press': 'Chicago',
+    'University of California Press': 'Berkeley',
+    'Univ of California Press': 'Berkeley',
+    'U of California Press': 'Berkeley',
+    'UC Press': 'Berkeley',
+    'California University Press': 'Berkeley',
     'Johns Hopkins University Press': 'Baltimore',
-    'University of Pennsylvania Press': 'Philadelphia',
+    'Johns Hopkins Univ Press': 'Baltimore',
+    'JHU Press': 'Baltimore',
+    'Johns Hopkins': 'Baltimore',
+    'Duke University Press': 'Durham',
+    'Duke Univ Press': 'Durham',
     'Cornell University Press': 'Ithaca',
-    'University of Michigan Press': 'Ann Arbor',
+    'Cornell Univ Press': 'Ithaca',
+    'University of Pennsylvania Press': 'Philadelphia',
+    'Univ of Pennsylvania Press': 'Philadelphia',
+    'Penn Press': 'Philadelphia',
+    'UPenn Press': 'Philadelphia',
     'University of North Carolina Press': 'Chapel Hill',
+    'Univ of North Carolina Press': 'Chapel Hill',
+    'UNC Press': 'Chapel Hill',
+    'University of Virginia Press': 'Charlottesville',
+    'Univ of Virginia Press': 'Charlottesville',
+    'UVA Press': 'Charlottesville',
     'University of Texas Press': 'Austin',
+    'Univ of Texas Press': 'Austin',
+    'UT Press': 'Austin',
+    'University of Michigan Press': 'Ann Arbor',
+    'Univ of Michigan Press': 'Ann Arbor',
+    'Michigan University Press': 'Ann Arbor',
+    'University of Illinois Press': 'Urbana',
+    'Univ of Illinois Press': 'Urbana',
+    'Illinois University Press': 'Urbana',
     'University of Wisconsin Press': 'Madison',
+    'Univ of Wisconsin Press': 'Madison',
+    'Wisconsin University Press': 'Madison',
+    'University of Minnesota Press': 'Minneapolis',
+    'Univ of Minnesota Press': 'Minneapolis',
+    'Minnesota University Press': 'Minneapolis',
     'Indiana University Press': 'Bloomington',
+    'Indiana Univ Press': 'Bloomington',
     'Northwestern University Press': 'Evanston',
-    'Basic Books': 'New York',
-    'Free Press': 'New York',
-    'Vintage': 'New York',
-    'Anchor Books': 'New York',
+    'IU Press': 'Bloomington',
+    'Ohio State University Press': 'Columbus',
+    'Ohio State Univ Press': 'Columbus',
+    'OSU Press': 'Columbus',
+    'Penn State University Press': 'University Park',
+    'Penn State Univ Press': 'University Park',
+    'PSU Press': 'University Park',
+    'University of Georgia Press': 'Athens',
+    'Univ of Georgia Press': 'Athens',
+    'UGA Press': 'Athens',
+    'Louisiana State University Press': 'Baton Rouge',
+    'LSU Press': 'Baton Rouge',
+    'University of Washington Press': 'Seattle',
+    'Univ of Washington Press': 'Seattle',
+    'UW Press': 'Seattle',
+    'University of Arizona Press': 'Tucson',
+    'Univ of Arizona Press': 'Tucson',
+    'University of New Mexico Press': 'Albuquerque',
+    'Univ of New Mexico Press': 'Albuquerque',
+    'UNM Press': 'Albuquerque',
+    'University of Oklahoma Press': 'Norman',
+    'Univ of Oklahoma Press': 'Norman',
+    'OU Press': 'Norman',
+    'University of Nebraska Press': 'Lincoln',
+    'Univ of Nebraska Press': 'Lincoln',
+    'Nebraska University Press': 'Lincoln',
+    'University of Iowa Press': 'Iowa City',
+    'Univ of Iowa Press': 'Iowa City',
+    'Iowa University Press': 'Iowa City',
+    'University of Missouri Press': 'Columbia, MO',
+    'Univ of Missouri Press': 'Columbia, MO',
+    'University of Kansas Press': 'Lawrence',
+    'Univ of Kansas Press': 'Lawrence',
+    'University of Colorado Press': 'Boulder',
+    'Univ of Colorado Press': 'Boulder',
+    'University of Utah Press': 'Salt Lake City',
+    'Univ of Utah Press': 'Salt Lake City',
+    'University of Hawaii Press': 'Honolulu',
+    'Univ of Hawaii Press': 'Honolulu',
+    'University of Toronto Press': 'Toronto',
+    'Univ of Toronto Press': 'Toronto',
+    'UTP': 'Toronto',
+    "McGill-Queen's University Press": 'Montreal',
+    "McGill-Queens University Press": 'Montreal',
+    "McGill Queen's": 'Montreal',
+    'University of British Columbia Press': 'Vancouver',
+    'UBC Press': 'Vancouver',
+    'Edinburgh University Press': 'Edinburgh',
+    'Manchester University Press': 'Manchester',
+    'University of Wales Press': 'Cardiff',
+    'Liverpool University Press': 'Liverpool',
+    'Bristol University Press': 'Bristol',
+    'Amsterdam University Press': 'Amsterdam',
+    'Leiden University Press': 'Leiden',
+    'Rutgers University Press': 'New Brunswick',
+    'Rutgers Univ Press': 'New Brunswick',
+    'NYU Press': 'New York',
+    'New York University Press': 'New York',
+    'SUNY Press': 'Albany',
+    'State University of New York Press': 'Albany',
+    'Temple University Press': 'Philadelphia',
+    'Fordham University Press': 'New York',
+    'Georgetown University Press': 'Washington, DC',
+    'Catholic University of America Press': 'Washington, DC',
+    'University of Notre Dame Press': 'Notre Dame',
+    'Baylor University Press': 'Waco',
+    'University of South Carolina Press': 'Columbia, SC',
+    'University of Tennessee Press': 'Knoxville',
+    'University of Kentucky Press': 'Lexington',
+    'University of Alabama Press': 'Tuscaloosa',
+    'University of Arkansas Press': 'Fayetteville',
+    'Texas A&M University Press': 'College Station',
+    'University of Nevada Press': 'Reno',
+    'Oregon State University Press': 'Corvallis',
+    'University of Massachusetts Press': 'Amherst',
+    'Wesleyan University Press': 'Middletown',
+    'University Press of Florida': 'Gainesville',
+    'University Press of Kansas': 'Lawrence',
+    'University Press of Kentucky': 'Lexington',
+    'University Press of Mississippi': 'Jackson',
+    'University Press of New England': 'Hanover',
+    'University Press of Colorado': 'Louisville, CO',
+    
+    # === ACADEMIC/SCHOLARLY PUBLISHERS ===
+    'Routledge': 'London',
+    'Taylor & Francis': 'London',
+    'Taylor and Francis': 'London',
+    'CRC Press': 'Boca Raton',
+    'Brill': 'Leiden',
+    'Elsevier': 'Amsterdam',
+    'Springer': 'New York',
+    'Springer Nature': 'New York',
+    'Springer Verlag': 'Berlin',
+    'Springer-Verlag': 'Berlin',
+    'Springer Science': 'New York',
+    'Palgrave': 'London',
+    'Palgrave Macmillan': 'London',
+    'De Gruyter': 'Berlin',
+    'Walter de Gruyter': 'Berlin',
+    'Mouton de Gruyter': 'Berlin',
+    'Academic Press': 'San Diego',
+    'Blackwell': 'Oxford',
+    'Wiley-Blackwell': 'Oxford',
+    'Polity': 'Cambridge',
+    'Polity Press': 'Cambridge',
+    'Verso': 'London',
+    'Zed Books': 'London',
+    'Pluto Press': 'London',
+    'Berg': 'Oxford',
+    'Ashgate': 'Farnham',
+    'Edward Elgar': 'Cheltenham',
+    'Peter Lang': 'New York',
+    'Lexington Books': 'Lanham',
+    'Rowman & Littlefield': 'Lanham',
+    'Rowman and Littlefield': 'Lanham',
+    'Scarecrow': 'Lanham',
+    'University Press of America': 'Lanham',
+    'UPA': 'Lanham',
+    'Continuum': 'London',
+    'T&T Clark': 'London',
+    'T & T Clark': 'London',
+    'Fortress Press': 'Minneapolis',
+    'Westminster John Knox': 'Louisville',
+    'WJK': 'Louisville',
+    'Eerdmans': 'Grand Rapids',
+    'Baker Academic': 'Grand Rapids',
+    'InterVarsity Press': 'Downers Grove',
+    'IVP': 'Downers Grove',
+    'Zondervan': 'Grand Rapids',
+    'Abingdon': 'Nashville',
+    'Broadman & Holman': 'Nashville',
+    'B&H': 'Nashville',
+    'Moody': 'Chicago',
+    'Crossway': 'Wheaton',
+    'Psychology Press': 'Hove',
+    'Psychology Press/Routledge': 'London',
+    'Infobase': 'New York',
+    'Infobase Publishing': 'New York',
+    'Facts on File': 'New York',
+    'Greenwood': 'Westport',
+    'Praeger': 'Westport',
+    'ABC-CLIO': 'Santa Barbara',
+    'McFarland': 'Jefferson, NC',
+    "BoD": 'Norderstedt',
+    "Books on Demand": 'Norderstedt',
+    
+    # === LAW PUBLISHERS ===
+    'West': 'St. Paul',
+    'West Publishing': 'St. Paul',
+    'Thomson West': 'St. Paul',
+    'LexisNexis': 'New York',
+    'Lexis Nexis': 'New York',
+    'Matthew Bender': 'New York',
+    'Wolters Kluwer': 'New York',
+    'Aspen': 'New York',
+    'Aspen Publishers': 'New York',
+    'Foundation Press': 'St. Paul',
+    'Carolina Academic Press': 'Durham',
+    'CAP': 'Durham',
+    
+    # === MEDICAL/SCIENCE ===
+    'Lippincott': 'Philadelphia',
+    'Lippincott Williams': 'Philadelphia',
+    'LWW': 'Philadelphia',
+    'Saunders': 'Philadelphia',
+    'Mosby': 'St. Louis',
+    'Elsevier Health': 'Philadelphia',
+    'Thieme': 'New York',
+    'Karger': 'Basel',
+    'Nature Publishing': 'London',
+    'Cold Spring Harbor': 'Cold Spring Harbor',
+    'CSHL Press': 'Cold Spring Harbor',
+    'ASM Press': 'Washington, DC',
+    'American Chemical Society': 'Washington, DC',
+    'ACS': 'Washington, DC',
+    'American Psychological Association': 'Washington, DC',
+    'APA': 'Washington, DC',
+    'American Psychiatric': 'Washington, DC',
+    'Guilford': 'New York',
+    'Guilford Press': 'New York',
+    
+    # === ARTS/HUMANITIES ===
+    'Yale Art': 'New Haven',
+    'Metropolitan Museum': 'New York',
+    'Met Publications': 'New York',
+    'Getty': 'Los Angeles',
+    'Getty Publications': 'Los Angeles',
+    'Prestel': 'Munich',
+    'Thames & Hudson': 'London',
+    'Thames and Hudson': 'London',
+    'Laurence King': 'London',
+    
+    # === TECH ===
+    "O'Reilly": 'Sebastopol',
+    'OReilly': 'Sebastopol',
+    'Addison-Wesley': 'Boston',
+    'Addison Wesley': 'Boston',
+    'Prentice Hall': 'Upper Saddle River',
+    'Apress': 'New York',
+    'Manning': 'Shelter Island',
+    'No Starch': 'San Francisco',
+    'No Starch Press': 'San Francisco',
+    'Pragmatic': 'Raleigh',
+    'Pragmatic Bookshelf': 'Raleigh',
+    'Packt': 'Birmingham',
+    'Sams': 'Indianapolis',
+    'Que': 'Indianapolis',
+    'New Riders': 'Berkeley',
+    'Peachpit': 'San Francisco',
+    
+    # === INTERNATIONAL ===
+    'Gallimard': 'Paris',
+    'Flammarion': 'Paris',
+    'Seuil': 'Paris',
+    'Albin Michel': 'Paris',
+    'Fayard': 'Paris',
+    'Hachette Livre': 'Paris',
+    'PUF': 'Paris',
+    'Suhrkamp': 'Frankfurt',
+    'Fischer': 'Frankfurt',
+    'Rowohlt': 'Hamburg',
+    'Hanser': 'Munich',
+    'Beck': 'Munich',
+    'C.H. Beck': 'Munich',
+    'DTV': 'Munich',
+    'Einaudi': 'Turin',
+    'Mondadori': 'Milan',
+    'Feltrinelli': 'Milan',
+    'Laterza': 'Rome',
+    'Alianza': 'Madrid',
+    'Anagrama': 'Barcelona',
+    'Tusquets': 'Barcelona',
+    'Fondo de Cultura': 'Mexico City',
+    'Siglo XXI': 'Mexico City',
+    # === ISBN REGISTRANTS (engines/isbn_registrants.py) ===
+    'Faber': 'London',
+    'Pergamon': 'Oxford',
+    'Harcourt': 'New York',
+    'Allen & Unwin': 'London',
+    'Stationery Office': 'London',
+    'Government Printing Office': 'Washington, DC',
+    'University of Pittsburgh Press': 'Pittsburgh',
+    'Presses Universitaires de France': 'Paris',
+    'Mohr Siebeck': 'Tübingen',
+    'John Benjamins': 'Amsterdam',
 }
 
 # =============================================================================
@@ -198,8 +662,44 @@ ACADEMIC_DOMAINS = {
     'hathitrust.org': 'HathiTrust',
     'archive.org': 'Internet Archive',
     'worldcat.org': 'WorldCat',
+    # Publisher domains with DOI URL patterns (engines/doi.py)
+    'sciencedirect.com': 'ScienceDirect',
+    'nature.com': 'Nature',
+    'science.org': 'Science',
+    'pnas.org': 'PNAS',
+    'cell.com': 'Cell Press',
+    'biorxiv.org': 'bioRxiv',
+    'medrxiv.org': 'medRxiv',
+    'arxiv.org': 'arXiv',
+    'doi.org': 'DOI',
 }
 
+# =============================================================================
+# MEDICAL DOMAINS (route to MEDICAL/PubMed, never to GOVERNMENT)
+# =============================================================================
+
+MEDICAL_DOMAINS = [
+    'pubmed.ncbi.nlm.nih.gov',
+    'ncbi.nlm.nih.gov',
+    'nlm.nih.gov',
+    'nih.gov',
+    'nimh.nih.gov',
+    'nci.nih.gov',
+    'clinicaltrials.gov',
+    'medlineplus.gov',
+    'pubmed.gov',
+]
+
+# The URLs unified_router sends to PubMed search: PubMed/NCBI and MedlinePlus
+# pages. Other NIH pages (news releases, grants) are medical for detection,
+# but their words make a poor PubMed query.
+PUBMED_URL_DOMAINS = [
+    'pubmed.ncbi.nlm.nih.gov',
+    'ncbi.nlm.nih.gov',
+    'pubmed.gov',
+    'medlineplus.gov',
+]
+
 # =============================================================================
 # MEDICAL TERMS (for detection)
 # =============================================================================
@@ -213,29 +713,56 @@ MEDICAL_TERMS = [
     'acute', 'disorder', 'condition', 'intervention', 'outcome',
 ]
 
+# =============================================================================
+# DOMAIN TRIE (one lookup for every domain category)
+# =============================================================================
+
+# Categories: newspaper → name, gov → agency, medical, pubmed, legal,
+# academic → publisher/platform name
+DOMAIN_TRIE = DomainTrie()
+for _domain, _name in NEWSPAPER_DOMAINS.items():
+    DOMAIN_TRIE.add(_domain, 'newspaper', _name)
+for _domain, _agency in GOV_AGENCY_MAP.items():
+    DOMAIN_TRIE.add(_domain, 'gov', _agency)
+for _domain in MEDICAL_DOMAINS:
+    DOMAIN_TRIE.add(_domain, 'medical')
+for _domain in PUBMED_URL_DOMAINS:
+    DOMAIN_TRIE.add(_domain, 'pubmed')
+for _domain in LEGAL_DOMAINS:
+    DOMAIN_TRIE.add(_domain, 'legal')
+for _domain, _name in ACADEMIC_DOMAINS.items():
+    DOMAIN_TRIE.add(_domain, 'academic', _name)
+
 # =============================================================================
 # HELPER FUNCTIONS
 # =============================================================================
 
+_PUBLISHER_MATCHER = PhraseMatcher(PUBLISHER_PLACE_MAP)
+
+
+@lru_cache(maxsize=4096)
+def _lookup_publisher_place(publisher: str) -> str:
+    return _PUBLISHER_MATCHER.longest(publisher, '')
+
+
 def resolve_publisher_place(publisher: str, current_place: str = "") -> str:
-    """Look up publication place for known publishers."""
+    """
+    Look up publication place for known publishers.
+    
+    Single pass over the publisher string; the longest registered
+    publisher/imprint wins (e.g. 'Houghton Mifflin Harcourt' over 'Harcourt').
+    """
     if current_place:
         return current_place
     if not publisher:
         return ''
-    for pub_name, pub_place in PUBLISHER_PLACE_MAP.items():
-        if pub_name.lower() in publisher.lower():
-            return pub_place
-    return ''
+    return _lookup_publisher_place(publisher)
 
 
 def get_newspaper_name(domain: str) -> str:
     """Get newspaper name from domain."""
-    domain = domain.lower().replace('www.', '')
-    for key, name in NEWSPAPER_DOMAINS.items():
-        if key in domain:
-            return name
-    return "Unknown Publication"
+    match = DOMAIN_TRIE.match(domain, 'newspaper')
+    return match[1] if match else "Unknown Publication"
 
 
 def get_gov_agency(domain: str) -> str:
@@ -243,14 +770,21 @@ def get_gov_agency(domain: str) -> str:
     Get government agency name from domain.
     
     Updated: 2025-12-05 - Check longer/more specific domains first
+    Updated: 2026-10-18 - Most specific domain comes from DOMAIN_TRIE
     """
-    domain = domain.lower().replace('www.', '')
-    
-    # Sort keys by length descending so more specific domains match first
-    # e.g., 'nimh.nih.gov' should match before 'nih.gov'
-    sorted_keys = sorted(GOV_AGENCY_MAP.keys(), key=len, reverse=True)
+    match = DOMAIN_TRIE.match(domain, 'gov')
+    return match[1] if match else "U.S. Government"
+
+
+def find_domain(text: str, category: str) -> Optional[Tuple[str, str]]:
+    """
+    Find the first host in text registered under category.
     
-    for key in sorted_keys:
-        if key in domain:
-            return GOV_AGENCY_MAP[key]
-    return "U.S. Government"
+    Works on URLs and on bare domains inside free text
+    ("see nimh.nih.gov/health"). Returns (domain, value) or None.
+    """
+    for host in iter_hosts(text):
+        match = DOMAIN_TRIE.match(host, category)
+        if match:
+            return match
+    return None
@@ -0,0 +1,217 @@
+"""
+citeflex/deadline.py
+
+Request-scoped deadlines for the routing stack.
+
+A Deadline is created where a budget is known - /api/cite, one note of
+process_document - and handed to route_citation / get_citation. It becomes
+the current deadline for that call (a context variable, carried into
+executor threads by submit()), and everything underneath derives its
+limits from what is left of it:
+
+- HTTP calls use request_timeout(default): the usual per-call timeout,
+  capped by the remaining budget. Once the deadline has passed it raises
+  DeadlineExceeded (a requests.Timeout) instead of sending the request,
+  so engines that already handle timeouts stop without changes.
+- Fan-outs use remaining(default) for as_completed / result timeouts.
+- Loops over engines or search attempts check deadline_expired() and stop.
+
+A Deadline is also a cancellation token: cancel() makes it expired at once,
+so a lookup the caller has given up on (timed out, or superseded by another
+result) stops at its next check instead of running the whole chain.
+submit_child() runs work under a child token; submit_cancellable() does
+the same for a whole note lookup and records in LOOKUP_STATS whether it
+completed, was abandoned (stopped early by the cancellation) or was
+discarded (finished, but its result was not wanted). Subtasks - engine
+fan-outs, query variants, speculative searches - use submit_child, so the
+counts stay per note.
+
+With no current deadline every helper returns its default unchanged.
+
+Usage:
+    from deadline import Deadline
+
+    metadata, formatted = route_citation(query, style, deadline=Deadline(8))
+
+Version History:
+    2026-10-18: Stops count on the parent chain too, so a lookup whose subtasks
+                stopped early is counted as abandoned
+    2026-10-18: submit_child: cancellable subtasks that LOOKUP_STATS does not count
+    2026-10-18: Deadlines double as cancellation tokens (cancel, child tokens,
+                submit_cancellable) with completed/abandoned/discarded counts
+    2026-10-18: Initial version (Deadline, request_timeout, remaining, submit)
+"""
+
+import time
+import threading
+import contextvars
+from contextlib import contextmanager
+from concurrent.futures import Executor, Future
+from typing import Optional, Iterator, Tuple
+
+import requests
+
+
+class DeadlineExceeded(requests.Timeout):
+    """The request's deadline passed (or it was cancelled) before this call could be made."""
+
+
+class Deadline:
+    """
+    A point in time (monotonic clock) by which a request must finish, and a
+    cancellation token for the work done on its behalf.
+
+    A child token expires with its parent but can be cancelled on its own.
+    """
+
+    def __init__(self, seconds: float, parent: Optional['Deadline'] = None):
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+        if parent is not None:
+            self.expires_at = min(self.expires_at, parent.expires_at)
+        self.parent = parent
+        self.cancelled = False
+        self.stops = 0  # checks that found this token (or a child) expired and skipped work
+        self._outcome = None  # LOOKUP_STATS entry, once submit_cancellable work ends
+
+    def record_stop(self) -> None:
+        """Count skipped work here and on every parent, so a lookup sees its subtasks' stops."""
+        token = self
+        while token is not None:
+            token.stops += 1
+            token = token.parent
+
+    def child(self) -> 'Deadline':
+        return Deadline(self.seconds, parent=self)
+
+    def cancel(self) -> None:
+        """
+        Expire now: work running under this token stops at its next check.
+        Work that had already completed is recounted as discarded.
+        """
+        with _stats_lock:
+            self.cancelled = True
+            if self._outcome == 'completed':
+                LOOKUP_STATS['completed'] -= 1
+                LOOKUP_STATS['discarded'] += 1
+                self._outcome = 'discarded'
+
+    def remaining(self) -> float:
+        """Seconds left (0.0 once expired or cancelled)."""
+        if self.expired:
+            return 0.0
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        if self.cancelled or time.monotonic() >= self.expires_at:
+            return True
+        return self.parent is not None and self.parent.expired
+
+    def __repr__(self) -> str:
+        state = "cancelled" if self.cancelled else f"{self.remaining():.2f}s left"
+        return f"Deadline({self.seconds}s, {state})"
+
+
+# Outcome of lookups run with submit_cancellable (see also /health)
+LOOKUP_STATS = {'completed': 0, 'abandoned': 0, 'discarded': 0}
+_stats_lock = threading.Lock()
+
+
+_current: contextvars.ContextVar = contextvars.ContextVar('citeflex_deadline', default=None)
+
+
+def current_deadline() -> Optional[Deadline]:
+    return _current.get()
+
+
+@contextmanager
+def activate(deadline: Optional[Deadline]) -> Iterator[Optional[Deadline]]:
+    """
+    Make deadline current for the block. None keeps whatever deadline is
+    already current, so nested entry points inherit their caller's budget.
+    """
+    if deadline is None:
+        yield current_deadline()
+        return
+    token = _current.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current.reset(token)
+
+
+def deadline_expired() -> bool:
+    """True once the current deadline (if any) has passed or been cancelled."""
+    deadline = _current.get()
+    if deadline is None or not deadline.expired:
+        return False
+    deadline.record_stop()
+    return True
+
+
+def remaining(default: float) -> float:
+    """default, capped by the time left on the current deadline."""
+    deadline = _current.get()
+    if deadline is None:
+        return default
+    return min(default, deadline.remaining())
+
+
+def request_timeout(default: float) -> float:
+    """
+    Timeout for one HTTP call: default, capped by the current deadline.
+
+    Raises DeadlineExceeded when the deadline has already passed.
+    """
+    deadline = _current.get()
+    if deadline is None:
+        return default
+    left = deadline.remaining()
+    if left <= 0:
+        deadline.record_stop()
+        raise DeadlineExceeded("lookup cancelled" if deadline.cancelled else f"deadline of {deadline.seconds}s passed")
+    return min(default, left)
+
+
+def submit(executor: Executor, fn, *args, **kwargs) -> Future:
+    """executor.submit(fn, ...) running under the caller's context (and deadline)."""
+    return executor.submit(contextvars.copy_context().run, fn, *args, **kwargs)
+
+
+def submit_child(executor: Executor, fn, *args, **kwargs) -> Tuple[Future, Deadline]:
+    """
+    Like submit(), but under a child of the current deadline (an unbounded
+    token without one). Cancel the returned token when the result is no
+    longer wanted. For subtasks of a lookup (engines, query variants); the
+    outcome is not counted.
+    """
+    parent = current_deadline()
+    token = parent.child() if parent is not None else Deadline(float('inf'))
+
+    def run():
+        with activate(token):
+            return fn(*args, **kwargs)
+
+    return submit(executor, run), token
+
+
+def submit_cancellable(executor: Executor, fn, *args, **kwargs) -> Tuple[Future, Deadline]:
+    """
+    submit_child() for one whole lookup (a note of process_document); its
+    outcome is counted in LOOKUP_STATS when fn returns.
+    """
+    future, token = submit_child(executor, fn, *args, **kwargs)
+    future.add_done_callback(lambda _: _record_outcome(token))
+    return future, token
+
+
+def _record_outcome(token: Deadline) -> None:
+    with _stats_lock:
+        if not token.cancelled:
+            token._outcome = 'completed'
+        elif token.stops:
+            token._outcome = 'abandoned'
+        else:
+            token._outcome = 'discarded'
+        LOOKUP_STATS[token._outcome] += 1
@@ -7,6 +7,14 @@ This is Layer 1 of the hybrid architecture - fast, free, regex-based.
 Each detector returns True/False. The router uses these to classify input.
 
 Version History:
+    2026-10-18: Interview, medical, newspaper, publisher and book keyword checks
+                read per-category hit counts from one keyword automaton scan
+                (analysis.KEYWORD_MATCHER); only structural patterns remain regexes.
+    2026-10-18: Detectors read the shared analysis.QueryAnalysis (computed once
+                per query) instead of re-scanning the text; per-detector
+                patterns are precompiled. detect_type accepts the analysis.
+    2026-10-18: Domain checks (legal, newspaper, medical .gov) go through
+                config.DOMAIN_TRIE via find_domain instead of substring scans
     2025-12-05 12:53: Fixed medical .gov URL routing (PubMed, NIH, NIMH now route to MEDICAL)
                       Excluded medical domains from is_government detection
     2025-12-05 13:15: Added Westlaw citation pattern (2024 WL 123456)
@@ -14,24 +22,55 @@ Version History:
 """
 
 import re
-from urllib.parse import urlparse
 from typing import Optional
 
 from models import CitationType, DetectionResult
-from config import NEWSPAPER_DOMAINS, LEGAL_DOMAINS, MEDICAL_TERMS
+from analysis import QueryAnalysis, analyze_query
+
+
+# =============================================================================
+# DETECTOR-SPECIFIC PATTERNS
+# =============================================================================
+
+# Strong interview shapes beyond the 'interview_strong' phrases
+# (analysis.KEYWORD_VOCABULARIES)
+_INTERVIEW_STRONG_RE = re.compile(
+    r'\binterview[,\s]+[A-Z]'       # "interview, City" or "interview Alexandria"
+    r'|^[A-Za-z\s]+interview\b',     # "Name interview" at start
+    re.IGNORECASE
+)
+
+_INTERVIEW_YEAR_RE = re.compile(r'interview.*\d{4}')                    # interview ... year
+_INTERVIEW_PLACE_RE = re.compile(r'interview.*[A-Z][a-z]+,\s*[A-Z]{2}')  # interview ... City, ST
+
+_PMID_RE = re.compile(r'pmid:?\s*\d+|pubmed\s*id:?\s*\d+|pubmed:\s*\d+')
+
+# Volume/issue: "23(4)" or "vol. 23"; page ranges: "pp. 45-67", "pages 123-145"
+_VOLUME_RE = re.compile(r'\b\d+\s*\(\d+\)|\bvol\.?\s*\d+')
+_PAGE_RANGE_RE = re.compile(r'\bpp\.?\s*\d+\s*[-–]\s*\d+|\bpages?\s*\d+\s*[-–]\s*\d+')
+
+# "2nd ed" ("edition", "book" and "isbn" are in the 'book' vocabulary)
+_EDITION_RE = re.compile(r'\b\d+(?:st|nd|rd|th)\s+ed')
+
+# Citation numbers stripped from legal queries before searching
+_CITATION_NUMBERS_RE = re.compile(r'\d+\s+[A-Z][a-z]*\.?\s*\d*[a-z]*\.?\s+\d+')
 
 
 # =============================================================================
 # INDIVIDUAL DETECTORS
 # =============================================================================
+#
+# Every detector takes the raw text plus an optional QueryAnalysis. When the
+# caller already has one (detect_type, the router) it is reused; otherwise
+# analyze_query() returns the cached analysis for the text.
 
-def is_url(text: str) -> bool:
+def is_url(text: str, analysis: Optional[QueryAnalysis] = None) -> bool:
     """Check if text is a URL."""
-    clean = text.strip()
-    return clean.startswith(('http://', 'https://'))
+    a = analysis or analyze_query(text)
+    return a.is_url
 
 
-def is_interview(text: str) -> bool:
+def is_interview(text: str, analysis: Optional[QueryAnalysis] = None) -> bool:
     """
     Detect interview/oral history citations.
     
@@ -45,52 +84,27 @@ def is_interview(text: str) -> bool:
     - "The history of interviews" (interview as subject noun)
     - "interview process" or "interview techniques" (interview as modifier)
     """
-    lower = text.lower()
-    
-    # Strong patterns that definitely indicate an interview citation
-    strong_patterns = [
-        r'\boral history\b',
-        r'\bpersonal communication\b',
-        r'\bconversation with\b',
-        r'\binterviewed?\s+by\b',  # "interviewed by" or "interview by"
-        r'\binterview\s+with\b',    # "interview with"
-        r'\binterview[,\s]+[A-Z]',  # "interview, City" or "interview Alexandria"
-        r'^[A-Za-z\s]+interview\b', # "Name interview" at start
-    ]
-    
-    for pattern in strong_patterns:
-        if re.search(pattern, text, re.IGNORECASE):
-            return True
+    a = analysis or analyze_query(text)
+    
+    if a.hits('interview_strong') or _INTERVIEW_STRONG_RE.search(a.text):
+        return True
     
     # Weak pattern: "interview" somewhere in text
     # Check it's not just discussing interviews
-    if 'interview' in lower:
-        # Negative patterns that indicate we're NOT citing an interview
-        negative_patterns = [
-            r'\bhistory of interviews?\b',
-            r'\binterview process\b',
-            r'\binterview technique\b',
-            r'\bjob interview\b',
-            r'\binterview question\b',
-            r'\binterview skill\b',
-            r'\binterview method\b',
-            r'\binterviews?\s+(in|about|on|of)\b',  # "interviews in journalism"
-        ]
-        
-        for pattern in negative_patterns:
-            if re.search(pattern, lower):
-                return False
+    if 'interview' in a.lower:
+        if a.hits('interview_negative'):
+            return False
         
         # If we have a date/location pattern near "interview", it's likely a citation
-        if re.search(r'interview.*\d{4}', lower):  # interview ... year
+        if _INTERVIEW_YEAR_RE.search(a.lower):
             return True
-        if re.search(r'interview.*[A-Z][a-z]+,\s*[A-Z]{2}', text):  # interview ... City, ST
+        if _INTERVIEW_PLACE_RE.search(a.text):
             return True
     
     return False
 
 
-def is_legal(text: str) -> bool:
+def is_legal(text: str, analysis: Optional[QueryAnalysis] = None) -> bool:
     """
     Detect legal case citations.
     
@@ -102,65 +116,38 @@ def is_legal(text: str) -> bool:
     """
     if not text:
         return False
-    clean = text.strip()
+    a = analysis or analyze_query(text)
     
     # ==========================================================================
     # FIX: Exclude version patterns (v1, v2, v3.9, etc.)
     # ==========================================================================
     # If text contains version-like patterns, it's probably not legal
-    if re.search(r'\bv\d', clean, re.IGNORECASE):
-        return False
-    if re.search(r'\bversion\s*\d', clean, re.IGNORECASE):
+    if a.version_marker:
         return False
     
     # Exclude Federal Register patterns (these are government, not legal)
-    if re.search(r'\b\d+\s*FR\s+\d+\b', clean, re.IGNORECASE):
-        return False
-    if re.search(r'\bfederal\s+register\b', clean, re.IGNORECASE):
+    if a.federal_register:
         return False
     
     # UK neutral citation pattern: [2024] UKSC 123
-    if '[' in clean and ']' in clean:
-        if re.search(r'\[\d{4}\]', clean):
-            return True
+    if a.bracket_year:
+        return True
     
     # Legal website
-    if is_url(clean):
-        if any(d in clean.lower() for d in LEGAL_DOMAINS):
-            return True
+    if a.is_url and a.domain('legal'):
+        return True
     
     # "v." or "vs" pattern (the classic case name indicator)
     # But require it to be between word characters (not "Team vs" at end)
-    if re.search(r'\b[A-Z][a-z]+\s+(v|vs|versus)\.?\s+[A-Z]', clean):
+    if a.case_name:
         return True
     
-    # Case reporter patterns - multiple patterns to catch variations
-    # Updated: 2025-12-05 - Added Westlaw (WL) pattern
-    reporter_patterns = [
-        # U.S. Reports: 388 U.S. 1
-        r'\d+\s+U\.S\.\s+\d+',
-        # State reporters: 248 N.Y. 339, 17 Cal. 3d 425
-        r'\d+\s+[A-Z][a-z]*\.?\s*\d*[a-z]*\.?\s+\d+',
-        # Federal Reporter: 159 F.2d 169, 400 F.3d 123
-        r'\d+\s+F\.\d+[a-z]*\s+\d+',
-        # Federal Supplement: 400 F. Supp. 2d 707
-        r'\d+\s+F\.\s*Supp\.\s*\d*[a-z]*\s+\d+',
-        # Atlantic/Pacific/etc reporters: 355 A.2d 647
-        r'\d+\s+[A-Z]\.\d+[a-z]*\s+\d+',
-        # Westlaw: 2024 WL 123456
-        r'\d{4}\s+WL\s+\d+',
-        # Generic: Volume Reporter Page with periods
-        r'\d+\s+[A-Z][A-Za-z\.]+\s+\d+',
-    ]
-    
-    for pattern in reporter_patterns:
-        if re.search(pattern, clean):
-            return True
-    
-    return False
+    # Case reporter patterns: U.S. Reports, state reporters, F.2d/F.3d,
+    # F. Supp., A.2d/P.2d, Westlaw (2024 WL 123456), generic Vol Reporter Page
+    return a.reporter
 
 
-def is_newspaper(text: str) -> bool:
+def is_newspaper(text: str, analysis: Optional[QueryAnalysis] = None) -> bool:
     """
     Detect newspaper/magazine article citations.
     
@@ -170,53 +157,17 @@ def is_newspaper(text: str) -> bool:
     """
     if not text:
         return False
-    
-    clean = text.strip()
-    lower = clean.lower()
+    a = analysis or analyze_query(text)
     
     # Check for URL to newspaper
-    if is_url(clean):
-        try:
-            domain = urlparse(clean).netloc.lower().replace('www.', '')
-            if any(nd in domain for nd in NEWSPAPER_DOMAINS):
-                return True
-        except:
-            pass
+    if a.is_url and a.domain('newspaper'):
+        return True
     
     # Check for newspaper names in text
-    newspaper_names = [
-        'new york times',
-        'wall street journal',
-        'washington post',
-        'los angeles times',
-        'chicago tribune',
-        'boston globe',
-        'the guardian',
-        'the economist',
-        'financial times',
-        'usa today',
-        'atlantic',
-        'new yorker',
-        'politico',
-        'huffington post',
-        'huffpost',
-        'buzzfeed',
-        'daily beast',
-        'slate',
-        'vox',
-        'reuters',
-        'associated press',
-        'ap news',
-    ]
-    
-    for name in newspaper_names:
-        if name in lower:
-            return True
-    
-    return False
+    return a.hits('newspaper') > 0
 
 
-def is_government(text: str) -> bool:
+def is_government(text: str, analysis: Optional[QueryAnalysis] = None) -> bool:
     """
     Detect government document sources.
     
@@ -228,36 +179,18 @@ def is_government(text: str) -> bool:
     """
     if not text:
         return False
-    clean = text.rstrip('.,;:)').lower()
+    a = analysis or analyze_query(text)
     
     # .gov domain - but exclude medical sites
-    if re.search(r'\.gov(/|$)', clean):
+    if a.gov_tld:
         # Medical .gov domains should route to MEDICAL, not GOVERNMENT
-        medical_gov_domains = [
-            'pubmed.ncbi.nlm.nih.gov',
-            'ncbi.nlm.nih.gov',
-            'nlm.nih.gov',
-            'nih.gov',
-            'nimh.nih.gov',
-            'nci.nih.gov',
-            'clinicaltrials.gov',
-            'medlineplus.gov',
-        ]
-        for domain in medical_gov_domains:
-            if domain in clean:
-                return False
-        return True
+        return not a.domain('medical')
     
     # Federal Register pattern: 88 FR 12345 or 87 Federal Register 11111
-    if re.search(r'\b\d+\s+FR\s+\d+\b', clean, re.IGNORECASE):
-        return True
-    if re.search(r'\b\d+\s+federal\s+register\s+\d+\b', clean, re.IGNORECASE):
-        return True
-    
-    return False
+    return a.federal_register_cite
 
 
-def is_medical(text: str) -> bool:
+def is_medical(text: str, analysis: Optional[QueryAnalysis] = None) -> bool:
     """
     Detect medical/clinical citations.
     
@@ -270,54 +203,25 @@ def is_medical(text: str) -> bool:
     """
     if not text:
         return False
-    lower = text.lower()
+    a = analysis or analyze_query(text)
     
     # Medical .gov domains
-    medical_gov_domains = [
-        'pubmed.ncbi.nlm.nih.gov',
-        'ncbi.nlm.nih.gov',
-        'nlm.nih.gov',
-        'nih.gov',
-        'nimh.nih.gov',
-        'nci.nih.gov',
-        'clinicaltrials.gov',
-        'medlineplus.gov',
-    ]
-    for domain in medical_gov_domains:
-        if domain in lower:
-            return True
+    if a.domain('medical'):
+        return True
     
     # Explicit PMID patterns
-    pmid_patterns = [
-        r'pmid:?\s*\d+',
-        r'pubmed\s*id:?\s*\d+',
-        r'pubmed:\s*\d+',
-    ]
-    for pattern in pmid_patterns:
-        if re.search(pattern, lower):
-            return True
+    if _PMID_RE.search(a.lower):
+        return True
     
     # Strong medical indicators (single term enough)
-    strong_indicators = [
-        'randomized controlled trial',
-        'double-blind',
-        'placebo-controlled',
-        'meta-analysis',
-        'systematic review',
-        'clinical trial',
-        'clinical efficacy',
-        'treatment-resistant',
-    ]
-    for indicator in strong_indicators:
-        if indicator in lower:
-            return True
+    if a.hits('medical_strong'):
+        return True
     
     # Medical terminology (need at least 2 terms for confidence)
-    term_count = sum(1 for term in MEDICAL_TERMS if term in lower)
-    return term_count >= 2
+    return a.hits('medical') >= 2
 
 
-def is_journal(text: str) -> bool:
+def is_journal(text: str, analysis: Optional[QueryAnalysis] = None) -> bool:
     """
     Detect journal article citations.
     
@@ -328,28 +232,16 @@ def is_journal(text: str) -> bool:
     """
     if not text:
         return False
-    lower = text.lower()
+    a = analysis or analyze_query(text)
     
     # DOI pattern: 10.1234/something
-    if re.search(r'10\.\d{4,}/', lower):
-        return True
-    
-    # Volume/issue patterns: "23(4)" or "vol. 23"
-    if re.search(r'\b\d+\s*\(\d+\)', lower):
-        return True
-    if re.search(r'\bvol\.?\s*\d+', lower):
+    if a.has_doi:
         return True
     
-    # Page range patterns: "pp. 45-67" or "123-145"
-    if re.search(r'\bpp\.?\s*\d+\s*[-–]\s*\d+', lower):
-        return True
-    if re.search(r'\bpages?\s*\d+\s*[-–]\s*\d+', lower):
-        return True
-    
-    return False
+    return bool(_VOLUME_RE.search(a.lower) or _PAGE_RANGE_RE.search(a.lower))
 
 
-def is_book(text: str) -> bool:
+def is_book(text: str, analysis: Optional[QueryAnalysis] = None) -> bool:
     """
     Detect book citations.
     
@@ -361,37 +253,25 @@ def is_book(text: str) -> bool:
     """
     if not text:
         return False
-    lower = text.lower()
+    a = analysis or analyze_query(text)
     
     # ISBN patterns
-    if re.search(r'\b(?:97[89][-\s]?)?(\d[-\s]?){9}[\dX]\b', text, re.IGNORECASE):
-        return True
-    if 'isbn' in lower:
-        return True
-    
-    # Edition indicators
-    if re.search(r'\b\d+(?:st|nd|rd|th)\s+(?:ed|edition)', lower):
-        return True
-    if re.search(r'\bedition\b', lower):
-        return True
-    
-    # Publisher keywords
-    publisher_hints = ['press', 'publishers', 'publishing', 'books']
-    if any(hint in lower for hint in publisher_hints):
+    if a.isbns:
         return True
     
-    # Explicit "book" keyword
-    if re.search(r'\bbook\b', lower):
+    # "isbn", "edition", explicit "book" keyword; publisher keywords
+    if a.hits('book') or a.hits('publisher'):
         return True
     
-    return False
+    # Edition indicators
+    return bool(_EDITION_RE.search(a.lower))
 
 
 # =============================================================================
 # MAIN DETECTION ROUTER
 # =============================================================================
 
-def detect_type(text: str) -> DetectionResult:
+def detect_type(text: str, analysis: Optional[QueryAnalysis] = None) -> DetectionResult:
     """
     Main detection function. Runs all detectors and returns the best match.
     
@@ -406,6 +286,10 @@ def detect_type(text: str) -> DetectionResult:
     8. URL (generic)
     9. Unknown (fallback)
     
+    Args:
+        text: Query text
+        analysis: Precomputed analyze_query(text), if the caller has it
+    
     Returns:
         DetectionResult with type, confidence, and cleaned query
     """
@@ -416,12 +300,13 @@ def detect_type(text: str) -> DetectionResult:
             cleaned_query=""
         )
     
-    clean_text = text.strip()
+    a = analysis or analyze_query(text)
+    clean_text = a.text
     
     # Check each type in priority order
     
     # 1. Interview - very specific keywords
-    if is_interview(clean_text):
+    if is_interview(clean_text, a):
         return DetectionResult(
             citation_type=CitationType.INTERVIEW,
             confidence=0.95,
@@ -429,11 +314,9 @@ def detect_type(text: str) -> DetectionResult:
         )
     
     # 2. Legal - "v." pattern or legal domains
-    if is_legal(clean_text):
-        # Extract case name for searching
-        query = clean_text
+    if is_legal(clean_text, a):
         # Remove citation numbers for cleaner search
-        query = re.sub(r'\d+\s+[A-Z][a-z]*\.?\s*\d*[a-z]*\.?\s+\d+', '', query).strip()
+        query = _CITATION_NUMBERS_RE.sub('', clean_text).strip()
         return DetectionResult(
             citation_type=CitationType.LEGAL,
             confidence=0.9,
@@ -441,7 +324,7 @@ def detect_type(text: str) -> DetectionResult:
         )
     
     # 3. Government - .gov URLs
-    if is_government(clean_text):
+    if is_government(clean_text, a):
         return DetectionResult(
             citation_type=CitationType.GOVERNMENT,
             confidence=0.95,
@@ -449,7 +332,7 @@ def detect_type(text: str) -> DetectionResult:
         )
     
     # 4. Newspaper - news site URLs
-    if is_newspaper(clean_text):
+    if is_newspaper(clean_text, a):
         return DetectionResult(
             citation_type=CitationType.NEWSPAPER,
             confidence=0.95,
@@ -457,7 +340,7 @@ def detect_type(text: str) -> DetectionResult:
         )
     
     # 5. Medical - clinical terminology
-    if is_medical(clean_text):
+    if is_medical(clean_text, a):
         return DetectionResult(
             citation_type=CitationType.MEDICAL,
             confidence=0.8,
@@ -465,7 +348,7 @@ def detect_type(text: str) -> DetectionResult:
         )
     
     # 6. Journal - DOI, volume/issue patterns
-    if is_journal(clean_text):
+    if is_journal(clean_text, a):
         return DetectionResult(
             citation_type=CitationType.JOURNAL,
             confidence=0.85,
@@ -473,7 +356,7 @@ def detect_type(text: str) -> DetectionResult:
         )
     
     # 7. Book - ISBN, publisher patterns
-    if is_book(clean_text):
+    if is_book(clean_text, a):
         return DetectionResult(
             citation_type=CitationType.BOOK,
             confidence=0.8,
@@ -481,7 +364,7 @@ def detect_type(text: str) -> DetectionResult:
         )
     
     # 8. Generic URL
-    if is_url(clean_text):
+    if a.is_url:
         return DetectionResult(
             citation_type=CitationType.URL,
             confidence=0.7,
@@ -12,6 +12,20 @@ This approach extracts the docx as a zip, manipulates the XML directly,
 and repackages it - giving full control over Word's internal structure.
 
 Version History:
+    2026-10-18: process_document resolves the document's DOIs in batches up front
+                (unified_router.prefetch_identifiers)
+    2026-10-18: A note that runs out of time is cancelled (deadline.submit_cancellable)
+                on a shared lookup pool, so process_document moves on without
+                waiting for it and the lookup stops at its next check
+    2026-10-18: Each note gets a NOTE_DEADLINE Deadline passed to get_citation, so its
+                engine calls stop at the budget instead of running on in the background
+    2026-10-18: process_document batch-classifies ambiguous notes up front
+                (unified_router.prefetch_ai_classifications)
+    2026-10-18: write_endnote/write_footnote take formatter Runs (format_runs) and
+                build w:r elements from them directly, links as HYPERLINK fields;
+                strings go through runs_from_html. LinkActivator skips text that
+                is already inside a field. Note parts are parsed once and written
+                back on save, not re-parsed and rewritten for every note.
     2025-12-05 12:53: Enhanced IBID_PATTERN to recognize "Id." (Bluebook) and "pp." prefixes
                       Switched from router to unified_router import
     2025-12-05 13:15: Verified ibid detection passes 13/13 tests including Id. at X patterns
@@ -24,11 +38,18 @@ import zipfile
 import tempfile
 import shutil
 import xml.etree.ElementTree as ET
-from typing import List, Optional, Dict, Any, Tuple
+from typing import List, Optional, Dict, Any, Tuple, Union
 from dataclasses import dataclass, field
 from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
 
-from models import normalize_doi
+from models import normalize_doi, Run
+from formatters.base import runs_from_html
+
+
+# Runs per-note lookups for process_document; a lookup that times out is
+# cancelled and left to wind down here while the next note starts
+_LOOKUP_EXECUTOR = ThreadPoolExecutor(max_workers=4)
 
 
 # =============================================================================
@@ -363,6 +384,11 @@ class WordDocumentProcessor:
         self.temp_dir = tempfile.mkdtemp()
         self.original_path = None
         
+        # Parsed note parts, kept in memory until saved (see _tree)
+        self._trees: Dict[str, ET.ElementTree] = {}
+        self._note_index: Dict[str, Dict[str, ET.Element]] = {}
+        self._dirty: set = set()
+        
         # Handle both file paths and file-like objects
         if hasattr(file_path_or_buffer, 'read'):
             # It's a file-like object (e.g., from upload)
@@ -386,8 +412,7 @@ class WordDocumentProcessor:
             return []
         
         try:
-            tree = ET.parse(endnotes_path)
-            root = tree.getroot()
+            root = self._tree(endnotes_path).getroot()
             notes = []
             
             for endnote in root.findall('.//w:endnote', self.NS):
@@ -428,8 +453,7 @@ class WordDocumentProcessor:
             return []
         
         try:
-            tree = ET.parse(footnotes_path)
-            root = tree.getroot()
+            root = self._tree(footnotes_path).getroot()
             notes = []
             
             for footnote in root.findall('.//w:footnote', self.NS):
@@ -458,15 +482,16 @@ class WordDocumentProcessor:
             print(f"[WordDocumentProcessor] Error reading footnotes: {e}")
             return []
     
-    def write_endnote(self, note_id: str, new_content: str) -> bool:
+    def write_endnote(self, note_id: str, new_content: Union[str, List[Run]]) -> bool:
         """
         Replace an endnote's content with new formatted citation.
-        Handles <i> tags for italics using regex (no BeautifulSoup needed).
+        Takes Runs from a formatter (format_runs), or a string whose <i>
+        tags become italics (runs_from_html).
         PRESERVES the endnoteRef element for proper numbering and linking.
         
         Args:
             note_id: The endnote ID to update
-            new_content: New citation text (may contain <i> tags for italics)
+            new_content: New citation as Runs, or text (may contain <i> tags for italics)
             
         Returns:
             bool: True if successful
@@ -476,19 +501,8 @@ class WordDocumentProcessor:
             return False
         
         try:
-            # Register namespace to preserve it
-            ET.register_namespace('w', self.NS['w'])
-            ET.register_namespace('xml', self.NS['xml'])
-            
-            tree = ET.parse(endnotes_path)
-            root = tree.getroot()
-            
             # Find the target endnote
-            target = None
-            for endnote in root.findall('.//w:endnote', self.NS):
-                if endnote.get(f"{{{self.NS['w']}}}id") == str(note_id):
-                    target = endnote
-                    break
+            target = self._find_note(endnotes_path, 'endnote', note_id)
             
             if target is None:
                 return False
@@ -535,39 +549,19 @@ class WordDocumentProcessor:
                     else:
                         para.insert(0, ref_run)
             
-            # Parse content using regex to handle <i> tags (no BeautifulSoup)
-            parts = re.split(r'(<i>.*?</i>)', html.unescape(new_content))
-            
-            for part in parts:
-                if not part:
-                    continue
-                    
-                run = ET.SubElement(para, f"{{{self.NS['w']}}}r")
-                
-                # Check if this is italic text
-                italic_match = re.match(r'<i>(.*?)</i>', part)
-                if italic_match:
-                    rPr = ET.SubElement(run, f"{{{self.NS['w']}}}rPr")
-                    ET.SubElement(rPr, f"{{{self.NS['w']}}}i")
-                    text_content = italic_match.group(1)
-                else:
-                    text_content = part
-                
-                t = ET.SubElement(run, f"{{{self.NS['w']}}}t")
-                t.text = text_content
-                t.set(f"{{{self.NS['xml']}}}space", "preserve")
+            self._append_runs(para, new_content)
             
-            tree.write(endnotes_path, encoding='UTF-8', xml_declaration=True)
+            self._dirty.add(endnotes_path)
             return True
             
         except Exception as e:
             print(f"[WordDocumentProcessor] Error writing endnote: {e}")
             return False
     
-    def write_footnote(self, note_id: str, new_content: str) -> bool:
+    def write_footnote(self, note_id: str, new_content: Union[str, List[Run]]) -> bool:
         """
         Replace a footnote's content with new formatted citation.
-        Handles <i> tags for italics using regex (no BeautifulSoup needed).
+        Takes Runs or an <i>-tagged string, as write_endnote.
         PRESERVES the footnoteRef element for proper numbering and linking.
         """
         footnotes_path = os.path.join(self.temp_dir, 'word', 'footnotes.xml')
@@ -575,17 +569,7 @@ class WordDocumentProcessor:
             return False
         
         try:
-            ET.register_namespace('w', self.NS['w'])
-            ET.register_namespace('xml', self.NS['xml'])
-            
-            tree = ET.parse(footnotes_path)
-            root = tree.getroot()
-            
-            target = None
-            for footnote in root.findall('.//w:footnote', self.NS):
-                if footnote.get(f"{{{self.NS['w']}}}id") == str(note_id):
-                    target = footnote
-                    break
+            target = self._find_note(footnotes_path, 'footnote', note_id)
             
             if target is None:
                 return False
@@ -631,35 +615,82 @@ class WordDocumentProcessor:
                     else:
                         para.insert(0, ref_run)
             
-            # Parse content using regex to handle <i> tags
-            parts = re.split(r'(<i>.*?</i>)', html.unescape(new_content))
+            self._append_runs(para, new_content)
             
-            for part in parts:
-                if not part:
-                    continue
-                    
-                run = ET.SubElement(para, f"{{{self.NS['w']}}}r")
-                
-                # Check if this is italic text
-                italic_match = re.match(r'<i>(.*?)</i>', part)
-                if italic_match:
-                    rPr = ET.SubElement(run, f"{{{self.NS['w']}}}rPr")
-                    ET.SubElement(rPr, f"{{{self.NS['w']}}}i")
-                    text_content = italic_match.group(1)
-                else:
-                    text_content = part
-                
-                t = ET.SubElement(run, f"{{{self.NS['w']}}}t")
-                t.text = text_content
-                t.set(f"{{{self.NS['xml']}}}space", "preserve")
-            
-            tree.write(footnotes_path, encoding='UTF-8', xml_declaration=True)
+            self._dirty.add(footnotes_path)
             return True
             
         except Exception as e:
             print(f"[WordDocumentProcessor] Error writing footnote: {e}")
             return False
     
+    def _tree(self, path: str) -> ET.ElementTree:
+        """
+        Parsed XML part, loaded once.
+        
+        Note writes modify this tree in memory; _flush() writes changed parts
+        back before saving, instead of a parse and rewrite per note.
+        """
+        tree = self._trees.get(path)
+        if tree is None:
+            # Register namespaces to preserve them
+            ET.register_namespace('w', self.NS['w'])
+            ET.register_namespace('xml', self.NS['xml'])
+            tree = self._trees[path] = ET.parse(path)
+        return tree
+    
+    def _find_note(self, path: str, tag: str, note_id: str) -> Optional[ET.Element]:
+        """The w:endnote / w:footnote element with this id (index built once)."""
+        index = self._note_index.get(path)
+        if index is None:
+            index = self._note_index[path] = {
+                note.get(f"{{{self.NS['w']}}}id"): note
+                for note in self._tree(path).getroot().findall(f'.//w:{tag}', self.NS)
+            }
+        return index.get(str(note_id))
+    
+    def _flush(self) -> None:
+        """Write note parts changed in memory back to the extracted document."""
+        for path in self._dirty:
+            self._trees[path].write(path, encoding='UTF-8', xml_declaration=True)
+        self._dirty.clear()
+    
+    def _append_runs(self, para: ET.Element, content: Union[str, List[Run]]) -> None:
+        """Append a citation to a note paragraph as w:r elements."""
+        w = self.NS['w']
+        runs = runs_from_html(content) if isinstance(content, str) else content
+        
+        for run in runs:
+            if run.link:
+                # HYPERLINK field: begin, instruction, separate, display text, end
+                self._append_field_char(para, 'begin')
+                instr = ET.SubElement(ET.SubElement(para, f"{{{w}}}r"), f"{{{w}}}instrText")
+                instr.text = f' HYPERLINK "{run.link}" '
+                instr.set(f"{{{self.NS['xml']}}}space", "preserve")
+                self._append_field_char(para, 'separate')
+            
+            r = ET.SubElement(para, f"{{{w}}}r")
+            if run.italic or run.underline or run.link:
+                rPr = ET.SubElement(r, f"{{{w}}}rPr")
+                if run.italic:
+                    ET.SubElement(rPr, f"{{{w}}}i")
+                if run.link:
+                    ET.SubElement(rPr, f"{{{w}}}color").set(f"{{{w}}}val", "0000FF")
+                if run.underline or run.link:
+                    ET.SubElement(rPr, f"{{{w}}}u").set(f"{{{w}}}val", "single")
+            
+            t = ET.SubElement(r, f"{{{w}}}t")
+            t.text = run.text
+            t.set(f"{{{self.NS['xml']}}}space", "preserve")
+            
+            if run.link:
+                self._append_field_char(para, 'end')
+    
+    def _append_field_char(self, para: ET.Element, kind: str) -> None:
+        w = self.NS['w']
+        run = ET.SubElement(para, f"{{{w}}}r")
+        ET.SubElement(run, f"{{{w}}}fldChar").set(f"{{{w}}}fldCharType", kind)
+    
     def save_to_buffer(self) -> BytesIO:
         """
         Save the modified document to a BytesIO buffer.
@@ -667,6 +698,7 @@ class WordDocumentProcessor:
         Returns:
             BytesIO buffer containing the .docx file
         """
+        self._flush()
         buffer = BytesIO()
         with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as zipf:
             for root, dirs, files in os.walk(self.temp_dir):
@@ -684,6 +716,7 @@ class WordDocumentProcessor:
         Args:
             output_path: Path for the output .docx file
         """
+        self._flush()
         with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
             for root, dirs, files in os.walk(self.temp_dir):
                 for file in files:
@@ -802,6 +835,10 @@ class LinkActivator:
             if hyperlink_opens > hyperlink_closes:
                 return match.group(0)  # Inside a hyperlink, skip
             
+            # Inside a field result (e.g. a HYPERLINK field the writer built)
+            if content.rfind('w:fldCharType="begin"', 0, pos) > content.rfind('w:fldCharType="end"', 0, pos):
+                return match.group(0)
+            
             # Clean URL
             clean_url = url.rstrip('.,;:)]\'"')
             trailing = url[len(clean_url):]
@@ -893,12 +930,11 @@ def process_document(
         Tuple of (processed_document_bytes, results_list)
     """
     # Import here to avoid circular imports
-    from unified_router import get_citation
+    from unified_router import get_citation, prefetch_ai_classifications, prefetch_identifiers
     from formatters.base import BaseFormatter, get_formatter
-    from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout
-    
-    # Per-note timeout to prevent indefinite hanging
-    NOTE_TIMEOUT = 8  # seconds per note
+    from concurrent.futures import TimeoutError as FuturesTimeout
+    from deadline import Deadline, activate, submit_cancellable
+    from config import NOTE_DEADLINE
     
     results = []
     
@@ -915,19 +951,38 @@ def process_document(
     endnotes = processor.get_endnotes()
     footnotes = processor.get_footnotes()
     
-    # Helper to call get_citation with timeout
-    def get_citation_with_timeout(text: str, style: str, timeout: int = NOTE_TIMEOUT):
-        """Call get_citation with a timeout wrapper."""
-        with ThreadPoolExecutor(max_workers=1) as executor:
-            future = executor.submit(get_citation, text, style)
-            try:
-                return future.result(timeout=timeout)
-            except FuturesTimeout:
-                print(f"[process_document] Timeout after {timeout}s for: {text[:50]}...")
-                return None, None
-            except Exception as e:
-                print(f"[process_document] Error in get_citation: {e}")
-                return None, None
+    note_texts = [note['text'] for note in endnotes + footnotes if not is_ibid(note['text'])]
+    
+    # Resolve every DOI in the document with a few batched requests up front
+    try:
+        prefetch_identifiers(note_texts)
+    except Exception as e:
+        print(f"[process_document] Identifier prefetch failed, resolving per note: {e}")
+    
+    # Classify the ambiguous notes in a few batched model calls up front;
+    # get_citation then finds each answer in the AI cache
+    try:
+        prefetch_ai_classifications(note_texts)
+    except Exception as e:
+        print(f"[process_document] AI prefetch failed, classifying per note: {e}")
+    
+    # Helper to call get_citation within the per-note budget. The deadline
+    # bounds every engine call underneath; a lookup that still overruns is
+    # cancelled, so it stops at its next check instead of running the chain.
+    def get_citation_with_timeout(text: str, style: str, timeout: float = NOTE_DEADLINE):
+        """Call get_citation with a per-note deadline."""
+        deadline = Deadline(timeout)
+        with activate(deadline):
+            future, token = submit_cancellable(_LOOKUP_EXECUTOR, get_citation, text, style)
+        try:
+            return future.result(timeout=deadline.remaining())
+        except FuturesTimeout:
+            token.cancel()
+            print(f"[process_document] Timeout after {timeout}s for: {text[:50]}...")
+            return None, None
+        except Exception as e:
+            print(f"[process_document] Error in get_citation: {e}")
+            return None, None
     
     def process_single_note(note: Dict[str, str], note_type: str) -> ProcessedCitation:
         """
@@ -957,9 +1012,9 @@ def process_document(
                 formatted = BaseFormatter.format_ibid(page)
                 
                 if note_type == 'endnote':
-                    processor.write_endnote(note_id, formatted)
+                    processor.write_endnote(note_id, [Run(formatted)])
                 else:
-                    processor.write_footnote(note_id, formatted)
+                    processor.write_footnote(note_id, [Run(formatted)])
                 
                 return ProcessedCitation(
                     original=original_text,
@@ -994,9 +1049,9 @@ def process_document(
                 formatted = BaseFormatter.format_ibid()
                 
                 if note_type == 'endnote':
-                    processor.write_endnote(note_id, formatted)
+                    processor.write_endnote(note_id, [Run(formatted)])
                 else:
-                    processor.write_footnote(note_id, formatted)
+                    processor.write_footnote(note_id, [Run(formatted)])
                 
                 return ProcessedCitation(
                     original=original_text,
@@ -1012,9 +1067,9 @@ def process_document(
                 formatted = BaseFormatter.format_ibid()
                 
                 if note_type == 'endnote':
-                    processor.write_endnote(note_id, formatted)
+                    processor.write_endnote(note_id, [Run(formatted)])
                 else:
-                    processor.write_footnote(note_id, formatted)
+                    processor.write_footnote(note_id, [Run(formatted)])
                 
                 return ProcessedCitation(
                     original=original_text,
@@ -1028,11 +1083,12 @@ def process_document(
             # Case 4: Check if previously cited → short form
             if history.has_been_cited_before(metadata):
                 formatted = formatter.format_short(metadata)
+                runs = formatter.format_short_runs(metadata)
                 
                 if note_type == 'endnote':
-                    processor.write_endnote(note_id, formatted)
+                    processor.write_endnote(note_id, runs)
                 else:
-                    processor.write_footnote(note_id, formatted)
+                    processor.write_footnote(note_id, runs)
                 
                 history.add(metadata, formatted)
                 
@@ -1046,10 +1102,12 @@ def process_document(
                 )
             
             # Case 5: New source → full citation
+            # (written from runs; full_formatted is the same citation as a string)
+            runs = formatter.format_runs(metadata)
             if note_type == 'endnote':
-                processor.write_endnote(note_id, full_formatted)
+                processor.write_endnote(note_id, runs)
             else:
-                processor.write_footnote(note_id, full_formatted)
+                processor.write_footnote(note_id, runs)
             
             history.add(metadata, full_formatted)
             
@@ -1210,12 +1268,6 @@ def html_to_word_xml(html: str, note_type: str = 'endnote') -> str:
     
     Updated: 2025-12-05 - Added paragraph style to fix font size issue
     """
-    import re
-    import html as html_module
-    
-    # Unescape HTML entities
-    text = html_module.unescape(html)
-    
     # Determine paragraph style based on note type
     if note_type == 'footnote':
         style_name = 'FootnoteText'
@@ -1225,21 +1277,11 @@ def html_to_word_xml(html: str, note_type: str = 'endnote') -> str:
     # Build Word XML paragraph
     runs = []
     
-    # Split by italic tags
-    parts = re.split(r'(<i>.*?</i>)', text)
-    
-    for part in parts:
-        if not part:
-            continue
-            
-        if part.startswith('<i>') and part.endswith('</i>'):
-            # Italic text
-            inner = part[3:-4]
-            inner_escaped = inner.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
-            runs.append(f'<w:r><w:rPr><w:i/></w:rPr><w:t xml:space="preserve">{inner_escaped}</w:t></w:r>')
+    for run in runs_from_html(html):
+        escaped = run.text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+        if run.italic:
+            runs.append(f'<w:r><w:rPr><w:i/></w:rPr><w:t xml:space="preserve">{escaped}</w:t></w:r>')
         else:
-            # Normal text
-            escaped = part.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
             runs.append(f'<w:r><w:t xml:space="preserve">{escaped}</w:t></w:r>')
     
     # Wrap in paragraph WITH style
@@ -11,6 +11,7 @@ from engines.academic import (
     SemanticScholarEngine,
     PubMedEngine,
 )
+from engines.crossref_local import CrossrefLocalEngine
 from engines.superlegal import (
     FamousCasesCache,
     UKCitationParser,
@@ -38,6 +39,7 @@ __all__ = [
     'OpenAlexEngine', 
     'SemanticScholarEngine',
     'PubMedEngine',
+    'CrossrefLocalEngine',
     # Legal
     'FamousCasesCache',
     'UKCitationParser',
@@ -6,15 +6,29 @@ Academic database search engines.
 - OpenAlexEngine: Broad academic coverage
 - SemanticScholarEngine: AI-powered with author matching
 - PubMedEngine: Biomedical literature
+
+Version History:
+    2026-10-18: PubMed's plain ESearch runs only after a phrase miss, or as a hedge
+                once the phrase search has taken ESEARCH_HEDGE
+    2026-10-18: Crossref and OpenAlex requests select only the fields _normalize reads
+                (select=); Crossref get_by_id uses the filtered list route so it can;
+                upstream records reach raw_data only with KEEP_RAW_DATA
+    2026-10-18: get_many batch lookups: Crossref filter=doi:, OpenAlex doi: OR-filter,
+                Semantic Scholar /paper/batch, PubMed multi-id ESummary
+    2026-10-18: Semantic Scholar search requests the citation fields directly (one
+                round trip instead of search + details); PubMed runs its phrase and
+                plain ESearch concurrently ahead of the single ESummary call
 """
 
 import re
 import difflib
-from typing import Optional, List
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout
+from typing import Optional, List, Dict
 
 from engines.base import SearchEngine
-from models import CitationMetadata, CitationType
+from models import CitationMetadata, CitationType, normalize_doi
 from config import PUBMED_API_KEY, SEMANTIC_SCHOLAR_API_KEY
+from deadline import submit, remaining
 
 # Shorter timeout for faster failures
 ENGINE_TIMEOUT = 5  # seconds
@@ -32,11 +46,18 @@ class CrossrefEngine(SearchEngine):
     
     name = "Crossref"
     base_url = "https://api.crossref.org/works"
+    BATCH_SIZE = 50
+    
+    # Fields _normalize reads; full items (reference lists, licenses, links)
+    # can run to hundreds of KB
+    select = ('DOI,title,author,container-title,volume,issue,page,type,publisher,'
+              'published-print,published-online,created')
     
     def search(self, query: str) -> Optional[CitationMetadata]:
         params = {
             'query.bibliographic': query,
-            'rows': 1
+            'rows': 1,
+            'select': self.select
         }
         
         response = self._make_request(self.base_url, params=params)
@@ -56,7 +77,8 @@ class CrossrefEngine(SearchEngine):
     def search_multiple(self, query: str, limit: int = 5) -> List[CitationMetadata]:
         params = {
             'query.bibliographic': query,
-            'rows': limit
+            'rows': limit,
+            'select': self.select
         }
         
         response = self._make_request(self.base_url, params=params)
@@ -74,6 +96,15 @@ class CrossrefEngine(SearchEngine):
         """Look up by DOI directly."""
         # Clean DOI
         doi = doi.replace('https://doi.org/', '').replace('http://dx.doi.org/', '')
+        
+        # The list route (filter=doi:) accepts select=; /works/{doi} does not
+        if ',' not in doi:
+            try:
+                return self._get_many_chunk([doi]).get(doi)
+            except Exception as e:
+                print(f"[{self.name}] Parse error: {e}")
+                return None
+        
         url = f"{self.base_url}/{doi}"
         
         response = self._make_request(url)
@@ -89,6 +120,29 @@ class CrossrefEngine(SearchEngine):
             pass
         return None
     
+    def _get_many_chunk(self, dois: List[str]) -> Dict[str, CitationMetadata]:
+        """Up to BATCH_SIZE DOIs in one filter=doi:...,doi:... query."""
+        # Commas separate filters, so DOIs containing one go by get_by_id
+        wanted = {normalize_doi(d): d for d in dois if ',' not in d}
+        found = super()._get_many_chunk([d for d in dois if ',' in d])
+        if not wanted:
+            return found
+        
+        params = {
+            'filter': ','.join(f'doi:{doi}' for doi in wanted),
+            'rows': len(wanted),
+            'select': self.select
+        }
+        response = self._make_request(self.base_url, params=params)
+        if not response:
+            return found
+        
+        for item in response.json().get('message', {}).get('items', []):
+            doi = wanted.get(normalize_doi(item.get('DOI', '')))
+            if doi:
+                found[doi] = self._normalize(item, doi)
+        return found
+    
     def _normalize(self, item: dict, raw_source: str) -> CitationMetadata:
         """Convert Crossref response to CitationMetadata."""
         # Extract authors
@@ -158,11 +212,16 @@ class OpenAlexEngine(SearchEngine):
     
     name = "OpenAlex"
     base_url = "https://api.openalex.org/works"
+    BATCH_SIZE = 50  # OpenAlex accepts up to 50 values in one OR-filter
+    
+    # Fields _normalize reads (works carry abstracts, concepts, referenced works...)
+    select = 'id,doi,display_name,title,publication_year,authorships,primary_location,biblio'
     
     def search(self, query: str) -> Optional[CitationMetadata]:
         params = {
             'search': query,
-            'per-page': 1
+            'per-page': 1,
+            'select': self.select
         }
         
         response = self._make_request(self.base_url, params=params)
@@ -182,7 +241,8 @@ class OpenAlexEngine(SearchEngine):
     def search_multiple(self, query: str, limit: int = 5) -> List[CitationMetadata]:
         params = {
             'search': query,
-            'per-page': limit
+            'per-page': limit,
+            'select': self.select
         }
         
         response = self._make_request(self.base_url, params=params)
@@ -196,6 +256,33 @@ class OpenAlexEngine(SearchEngine):
         except:
             return []
     
+    def get_by_id(self, doi: str) -> Optional[CitationMetadata]:
+        """Look up by DOI directly."""
+        return self.get_many([doi]).get(doi)
+    
+    def _get_many_chunk(self, dois: List[str]) -> Dict[str, CitationMetadata]:
+        """Up to BATCH_SIZE DOIs in one filter=doi:a|b|... query."""
+        # | separates the OR-ed values, so DOIs containing one are skipped
+        wanted = {normalize_doi(d): d for d in dois if '|' not in d}
+        if not wanted:
+            return {}
+        
+        params = {
+            'filter': 'doi:' + '|'.join(wanted),
+            'per-page': len(wanted),
+            'select': self.select
+        }
+        response = self._make_request(self.base_url, params=params)
+        if not response:
+            return {}
+        
+        found = {}
+        for item in response.json().get('results', []):
+            doi = wanted.get(normalize_doi(item.get('doi') or ''))
+            if doi:
+                found[doi] = self._normalize(item, doi)
+        return found
+    
     def _normalize(self, item: dict, raw_source: str) -> CitationMetadata:
         """Convert OpenAlex response to CitationMetadata."""
         # Extract authors
@@ -252,6 +339,12 @@ class SemanticScholarEngine(SearchEngine):
     name = "Semantic Scholar"
     base_url = "https://api.semanticscholar.org/graph/v1/paper/search"
     details_url = "https://api.semanticscholar.org/graph/v1/paper/"
+    batch_url = "https://api.semanticscholar.org/graph/v1/paper/batch"
+    BATCH_SIZE = 100  # /paper/batch accepts up to 500
+    
+    # Everything _find_best_match and _normalize read; the search endpoint
+    # accepts the same fields as the details endpoint
+    fields = 'paperId,title,authors,venue,publicationVenue,journal,year,externalIds,url'
     
     def __init__(self, api_key: Optional[str] = None, **kwargs):
         super().__init__(api_key=api_key or SEMANTIC_SCHOLAR_API_KEY, **kwargs)
@@ -266,13 +359,14 @@ class SemanticScholarEngine(SearchEngine):
     def search(self, query: str) -> Optional[CitationMetadata]:
         """
         Search with author-aware matching.
-        Gets top 10 results, scores by author/title match, returns best.
+        Gets top 10 results with full citation fields, scores by author/title
+        match, returns best - no second request for details.
         """
         headers = self._get_headers()
         params = {
             'query': query,
             'limit': 10,  # Increased from 5 for better fuzzy matching
-            'fields': 'paperId,title,authors'
+            'fields': self.fields
         }
         
         response = self._make_request(self.base_url, params=params, headers=headers)
@@ -290,9 +384,7 @@ class SemanticScholarEngine(SearchEngine):
             
             # Score each paper for relevance
             best_match = self._find_best_match(papers, query)
-            
-            # Get full details
-            return self._fetch_details(best_match['paperId'], query, headers)
+            return self._normalize(best_match, query)
             
         except Exception as e:
             print(f"[{self.name}] Parse error: {e}")
@@ -347,7 +439,7 @@ class SemanticScholarEngine(SearchEngine):
     def _fetch_details(self, paper_id: str, raw_source: str, headers: dict) -> Optional[CitationMetadata]:
         """Fetch full paper details by ID."""
         params = {
-            'fields': 'title,authors,venue,publicationVenue,year,volume,issue,pages,externalIds,url'
+            'fields': self.fields
         }
         
         url = f"{self.details_url}{paper_id}"
@@ -361,6 +453,35 @@ class SemanticScholarEngine(SearchEngine):
         except:
             return None
     
+    def get_by_id(self, identifier: str) -> Optional[CitationMetadata]:
+        """Look up by DOI, PMID:..., or Semantic Scholar paper ID."""
+        return self._fetch_details(self._paper_id(identifier), identifier, self._get_headers())
+    
+    @staticmethod
+    def _paper_id(identifier: str) -> str:
+        """Prefixed IDs (PMID:, ARXIV:, ...) and S2 paper IDs pass through; DOIs get DOI:."""
+        if re.match(r'(?i)(pmid|pmcid|arxiv|corpusid|mag|acl|url):', identifier) or re.fullmatch(r'[0-9a-f]{40}', identifier):
+            return identifier
+        return f"DOI:{normalize_doi(identifier)}"
+    
+    def _get_many_chunk(self, identifiers: List[str]) -> Dict[str, CitationMetadata]:
+        """Up to BATCH_SIZE IDs in one POST /paper/batch."""
+        response = self._make_request(
+            f"{self.batch_url}?fields={self.fields}",
+            params={'ids': [self._paper_id(i) for i in identifiers]},
+            headers=self._get_headers(),
+            method="POST"
+        )
+        if not response:
+            return {}
+        
+        # One entry per requested ID, in order; null where not found
+        return {
+            identifier: self._normalize(item, identifier)
+            for identifier, item in zip(identifiers, response.json())
+            if item
+        }
+    
     def _normalize(self, item: dict, raw_source: str) -> CitationMetadata:
         """Convert Semantic Scholar response to CitationMetadata."""
         # Extract authors
@@ -372,6 +493,11 @@ class SemanticScholarEngine(SearchEngine):
         if pub_venue.get('name'):
             venue = pub_venue['name']
         
+        # Volume and pages come in the journal object
+        journal = item.get('journal', {}) or {}
+        volume = item.get('volume') or journal.get('volume', '')
+        pages = item.get('pages') or journal.get('pages', '')
+        
         # Get DOI from external IDs
         external_ids = item.get('externalIds', {}) or {}
         doi = external_ids.get('DOI', '')
@@ -387,15 +513,20 @@ class SemanticScholarEngine(SearchEngine):
             authors=authors,
             year=str(item.get('year', '')) if item.get('year') else None,
             journal=venue,
-            volume=str(item.get('volume', '')) if item.get('volume') else '',
+            volume=str(volume).strip() if volume else '',
             issue=str(item.get('issue', '')) if item.get('issue') else '',
-            pages=item.get('pages', ''),
+            pages=str(pages).strip() if pages else '',
             doi=doi,
             url=url,
             raw_data=item
         )
 
 
+# Runs PubMed's phrase search, so a slow one can be hedged with the plain search
+_ESEARCH_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix='esearch')
+ESEARCH_HEDGE = 0.5  # seconds the phrase search answers alone
+
+
 class PubMedEngine(SearchEngine):
     """
     Search PubMed / NCBI - biomedical literature.
@@ -408,6 +539,7 @@ class PubMedEngine(SearchEngine):
     
     name = "PubMed"
     base_url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/"
+    BATCH_SIZE = 200  # ESummary takes a comma-separated id list
     
     def __init__(self, api_key: Optional[str] = None, **kwargs):
         super().__init__(api_key=api_key or PUBMED_API_KEY, **kwargs)
@@ -426,35 +558,75 @@ class PubMedEngine(SearchEngine):
         return self._fetch_details(pmid, f"PMID:{pmid}")
     
     def _search_for_pmid(self, query: str) -> Optional[str]:
-        """Search for PMID using ESearch."""
-        # Try phrase search first
-        for search_query in [f'"{query}"', query]:
-            params = {
-                'db': 'pubmed',
-                'term': search_query,
-                'retmode': 'json',
-                'retmax': 1
-            }
-            if self.api_key:
-                params['api_key'] = self.api_key
-            
-            response = self._make_request(f"{self.base_url}esearch.fcgi", params=params)
-            if response:
-                try:
-                    data = response.json()
-                    id_list = data.get('esearchresult', {}).get('idlist', [])
-                    if id_list:
-                        return id_list[0]
-                except:
-                    pass
+        """
+        Search for PMID using ESearch.
+        
+        The phrase search is preferred; the plain search is sent after a
+        phrase miss, or alongside it once the phrase search has taken
+        ESEARCH_HEDGE without answering (NCBI allows 3 requests/s without
+        an API key, so a quick answer costs one request).
+        """
+        phrase = submit(_ESEARCH_EXECUTOR, self._esearch, f'"{query}"')
+        try:
+            return phrase.result(timeout=remaining(ESEARCH_HEDGE)) or self._esearch(query)
+        except FuturesTimeout:
+            pass
+        plain = self._esearch(query)
+        try:
+            return phrase.result(timeout=remaining(self.timeout)) or plain
+        except FuturesTimeout:
+            return plain
+    
+    def _esearch(self, term: str) -> Optional[str]:
+        """First PMID ESearch returns for term."""
+        params = {
+            'db': 'pubmed',
+            'term': term,
+            'retmode': 'json',
+            'retmax': 1
+        }
+        if self.api_key:
+            params['api_key'] = self.api_key
         
+        response = self._make_request(f"{self.base_url}esearch.fcgi", params=params)
+        if response:
+            try:
+                data = response.json()
+                id_list = data.get('esearchresult', {}).get('idlist', [])
+                if id_list:
+                    return id_list[0]
+            except:
+                pass
         return None
     
     def _fetch_details(self, pmid: str, raw_source: str) -> Optional[CitationMetadata]:
         """Fetch article details using ESummary."""
+        try:
+            article = self._esummary([pmid]).get(pmid)
+            if not article:
+                return None
+            return self._normalize(article, raw_source, pmid)
+        except:
+            return None
+    
+    def _get_many_chunk(self, pmids: List[str]) -> Dict[str, CitationMetadata]:
+        """Up to BATCH_SIZE PMIDs in one ESummary call."""
+        wanted = {re.sub(r'\D', '', p): p for p in pmids}
+        wanted.pop('', None)
+        if not wanted:
+            return {}
+        articles = self._esummary(list(wanted))
+        return {
+            pmid: self._normalize(articles[clean], f"PMID:{clean}", clean)
+            for clean, pmid in wanted.items()
+            if clean in articles
+        }
+    
+    def _esummary(self, pmids: List[str]) -> Dict[str, dict]:
+        """{pmid: ESummary record} for the PMIDs found."""
         params = {
             'db': 'pubmed',
-            'id': pmid,
+            'id': ','.join(pmids),
             'retmode': 'json'
         }
         if self.api_key:
@@ -462,16 +634,13 @@ class PubMedEngine(SearchEngine):
         
         response = self._make_request(f"{self.base_url}esummary.fcgi", params=params)
         if not response:
-            return None
+            return {}
         
-        try:
-            data = response.json()
-            article = data.get('result', {}).get(pmid, {})
-            if not article or 'error' in article:
-                return None
-            return self._normalize(article, raw_source, pmid)
-        except:
-            return None
+        result = response.json().get('result', {})
+        return {
+            pmid: result[pmid] for pmid in pmids
+            if result.get(pmid) and 'error' not in result[pmid]
+        }
     
     def _normalize(self, item: dict, raw_source: str, pmid: str) -> CitationMetadata:
         """Convert PubMed response to CitationMetadata."""
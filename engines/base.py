@@ -3,15 +3,29 @@ citeflex/engines/base.py
 
 Abstract base class for all search engines.
 Each engine must implement the search() method.
+
+Version History:
+    2026-10-18: raw_data is kept only when config.KEEP_RAW_DATA is set (keep_raw)
+    2026-10-18: get_many(ids): batched identifier lookup, chunked by BATCH_SIZE;
+                engines with a native batch endpoint override _get_many_chunk
+    2026-10-18: _make_request takes its timeout from the current request deadline
+                (deadline.py) and does not retry or send once it has passed;
+                MultiAttemptEngine stops between attempts at the deadline
 """
 
 import time
 from abc import ABC, abstractmethod
-from typing import Optional, List
+from typing import Optional, List, Dict
 import requests
 
 from models import CitationMetadata, CitationType
-from config import DEFAULT_HEADERS, DEFAULT_TIMEOUT
+from config import DEFAULT_HEADERS, DEFAULT_TIMEOUT, KEEP_RAW_DATA
+from deadline import DeadlineExceeded, request_timeout, remaining, deadline_expired
+
+
+def keep_raw(item: dict) -> dict:
+    """item for CitationMetadata.raw_data when KEEP_RAW_DATA is set, else {}."""
+    return item if KEEP_RAW_DATA else {}
 
 
 class SearchEngine(ABC):
@@ -24,12 +38,16 @@ class SearchEngine(ABC):
     Engines may optionally implement:
     - search_multiple(query, limit) -> List[CitationMetadata]
     - get_by_id(id) -> CitationMetadata (for DOI, PMID, ISBN lookup)
+    - _get_many_chunk(ids) -> Dict[id, CitationMetadata] (batched get_by_id)
     """
     
     # Override in subclasses
     name: str = "Base Engine"
     base_url: str = ""
     
+    # Identifiers per get_many request (engines with a batch endpoint)
+    BATCH_SIZE = 20
+    
     # Rate limit retry settings
     MAX_RETRIES = 2
     RETRY_DELAY_BASE = 2  # Base delay in seconds for exponential backoff
@@ -88,6 +106,35 @@ class SearchEngine(ABC):
         """
         return None
     
+    def get_many(self, identifiers: List[str]) -> Dict[str, CitationMetadata]:
+        """
+        Fetch many identifiers, BATCH_SIZE per request.
+        
+        Returns {identifier: CitationMetadata} for those found, keyed by the
+        identifiers as given. Identifiers not found, and chunks whose request
+        failed, are simply absent; callers fall back to get_by_id/search.
+        """
+        unique = list(dict.fromkeys(i for i in identifiers if i))
+        found = {}
+        for start in range(0, len(unique), self.BATCH_SIZE):
+            if deadline_expired():
+                break
+            chunk = unique[start:start + self.BATCH_SIZE]
+            try:
+                found.update(self._get_many_chunk(chunk))
+            except Exception as e:
+                print(f"[{self.name}] Batch lookup error ({len(chunk)} ids): {e}")
+        return found
+    
+    def _get_many_chunk(self, identifiers: List[str]) -> Dict[str, CitationMetadata]:
+        """One batch of get_many. Default: get_by_id for each."""
+        found = {}
+        for identifier in identifiers:
+            result = self.get_by_id(identifier)
+            if result:
+                found[identifier] = result
+        return found
+    
     def _make_request(
         self,
         url: str,
@@ -100,6 +147,8 @@ class SearchEngine(ABC):
         Make an HTTP request with error handling and rate limit retry.
         
         Implements exponential backoff for 429 (Too Many Requests) responses.
+        The timeout is self.timeout capped by the current deadline; no request
+        is sent (and no retry waited for) once the deadline has passed.
         
         Returns:
             Response object if successful, None on error
@@ -109,19 +158,20 @@ class SearchEngine(ABC):
             if headers:
                 merged_headers.update(headers)
             
+            timeout = request_timeout(self.timeout)
             if method.upper() == "GET":
                 response = self.session.get(
                     url,
                     params=params,
                     headers=merged_headers,
-                    timeout=self.timeout
+                    timeout=timeout
                 )
             else:
                 response = self.session.post(
                     url,
                     json=params,
                     headers=merged_headers,
-                    timeout=self.timeout
+                    timeout=timeout
                 )
             
             # Handle rate limiting with exponential backoff
@@ -137,6 +187,10 @@ class SearchEngine(ABC):
                     else:
                         delay = self.RETRY_DELAY_BASE * (2 ** retry_count)
                     
+                    if remaining(delay + 1) <= delay:
+                        print(f"[{self.name}] Rate limited; no time left to retry")
+                        return None
+                    
                     print(f"[{self.name}] Rate limited. Retrying in {delay}s (attempt {retry_count + 1}/{self.MAX_RETRIES})...")
                     time.sleep(delay)
                     return self._make_request(url, params, headers, method, retry_count + 1)
@@ -147,6 +201,9 @@ class SearchEngine(ABC):
             response.raise_for_status()
             return response
             
+        except DeadlineExceeded:
+            print(f"[{self.name}] Deadline passed, request skipped")
+            return None
         except requests.Timeout:
             print(f"[{self.name}] Request timeout after {self.timeout}s")
             return None
@@ -162,7 +219,10 @@ class SearchEngine(ABC):
     ) -> CitationMetadata:
         """
         Helper to create CitationMetadata with common fields pre-filled.
+        The upstream record passed as raw_data is dropped unless KEEP_RAW_DATA.
         """
+        if 'raw_data' in kwargs:
+            kwargs['raw_data'] = keep_raw(kwargs['raw_data'])
         return CitationMetadata(
             citation_type=citation_type,
             raw_source=raw_source,
@@ -202,6 +262,9 @@ class MultiAttemptEngine(SearchEngine):
         attempts = self.get_search_attempts(query)
         
         for i, attempt in enumerate(attempts, 1):
+            if deadline_expired():
+                print(f"[{self.name}] Deadline passed after {i - 1} attempts")
+                return None
             name = attempt.get('name', f'attempt_{i}')
             params = attempt.get('params', {})
             url = attempt.get('url', self.base_url)
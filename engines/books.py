@@ -4,6 +4,7 @@ citeflex/engines/books.py
 Book citation metadata extraction using multiple APIs.
 
 Engines (in priority order):
+0. Local edition index - ISBN + title lookup with no network I/O (optional)
 1. Open Library - ISBN lookup (precise)
 2. Google Books - fuzzy search (robust)
 3. Library of Congress - US publications (authoritative)
@@ -12,6 +13,26 @@ Engines (in priority order):
 6. Open Library Search - fallback
 
 Version History:
+    2026-10-18: Google Books query variants are hedged (VARIANT_HEDGE): the next one
+                is sent only after the earlier ones missed or stayed silent
+    2026-10-18: Engine and query-variant tasks use deadline.submit_child (not counted
+                in LOOKUP_STATS)
+    2026-10-18: ISBNs come from identifiers.first_identifier (labelled, hyphenated or
+                978/979-prefixed, checksum-valid); get_by_isbn is the ISBN-only path
+    2026-10-18: GoogleBooksAPI.search issues its query variants concurrently on a
+                pooled session and keeps the first non-empty one in preference order
+    2026-10-18: Network engines run concurrently: search_all_engines gathers them in
+                parallel; extract_metadata races them and keeps the highest-priority
+                answer within PRIORITY_GRACE, cancelling the rest
+    2026-10-18: HTTP timeouts come from the current request deadline (deadline.py);
+                extract_metadata stops trying engines once it has passed
+    2026-10-18: PUBLISHER_PLACE_MAP moved to config.py; resolve_place delegates to
+                config.resolve_publisher_place (single-pass longest-match automaton)
+    2026-10-18: Added fill_from_isbn: publisher/place resolved offline from the ISBN
+                registrant prefix (engines/isbn_registrants.py)
+    2026-10-18: Added local ISBN/edition index (engines/openlibrary_local.py).
+                ISBNs are checksum-validated before any lookup; network engines
+                are only called on a local miss.
     2025-12-06 11:55: Expanded PUBLISHER_PLACE_MAP to 300+ publishers with abbreviations
                       (e.g., 'Univ of California Press', 'UC Press' → Berkeley)
     2025-12-05 12:53: Expanded PUBLISHER_PLACE_MAP with 40+ publishers including
@@ -24,453 +45,79 @@ Version History:
 import requests
 import re
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED, TimeoutError as FuturesTimeout
+
+from engines.openlibrary_local import OpenLibraryLocalIndex
+from identifiers import first_identifier
+from engines.isbn_registrants import publisher_for_isbn
+from deadline import request_timeout, deadline_expired, remaining, submit_child
 
 # WorldCat API key (optional - get from https://www.worldcat.org/webservices/)
 WORLDCAT_API_KEY = os.environ.get('WORLDCAT_API_KEY', '')
 
+# ==================== CONCURRENCY ====================
+# Network engines are queried side by side, so a lookup costs the slowest
+# engine instead of the sum of them. The pool is shared across requests.
+ENGINE_WORKERS = 8
+ENGINE_EXECUTOR = ThreadPoolExecutor(max_workers=ENGINE_WORKERS, thread_name_prefix='books')
+SEARCH_TIMEOUT = 10     # seconds; one fan-out (the request deadline may cut it shorter)
+PRIORITY_GRACE = 1.0    # seconds a lower-priority answer waits for higher-priority engines
+
+# Query variants within one engine (GoogleBooksAPI.search). A separate pool:
+# engine tasks wait on these, so sharing ENGINE_EXECUTOR could deadlock.
+VARIANT_EXECUTOR = ThreadPoolExecutor(max_workers=ENGINE_WORKERS, thread_name_prefix='books-variant')
+# The next variant starts when the earlier ones have missed, or after this
+# many seconds without an answer. Each variant is a billed Google Books request.
+VARIANT_HEDGE = 1.0
+
 # ==================== DATA: PUBLISHER MAPPING ====================
-# Preserved from original citation.py to ensure city data is filled
-# even when APIs omit it.
-# Updated: 2025-12-06 - Massively expanded with abbreviations and 300+ publishers
-PUBLISHER_PLACE_MAP = {
-    # === MAJOR TRADE PUBLISHERS (Big 5 and imprints) ===
-    'Simon & Schuster': 'New York',
-    'Simon and Schuster': 'New York',
-    'Scribner': 'New York',
-    'Atria': 'New York',
-    'Gallery Books': 'New York',
-    'Pocket Books': 'New York',
-    'Threshold': 'New York',
-    
-    'Penguin': 'New York',
-    'Penguin Random House': 'New York',
-    'Penguin Books': 'New York',
-    'Penguin Press': 'New York',
-    'Viking': 'New York',
-    'Dutton': 'New York',
-    'Putnam': 'New York',
-    'Putnam Juvenile': 'New York',
-    'Berkley': 'New York',
-    'Ace Books': 'New York',
-    'Plume': 'New York',
-    'Riverhead': 'New York',
-    
-    'Random House': 'New York',
-    'Knopf': 'New York',
-    'Alfred A. Knopf': 'New York',
-    'Doubleday': 'New York',
-    'Crown': 'New York',
-    'Ballantine': 'New York',
-    'Bantam': 'New York',
-    'Dell': 'New York',
-    'Anchor Books': 'New York',
-    'Anchor': 'New York',
-    'Vintage': 'New York',
-    'Vintage Books': 'New York',
-    'Pantheon': 'New York',
-    'Modern Library': 'New York',
-    
-    'HarperCollins': 'New York',
-    'Harper': 'New York',
-    'Harper & Row': 'New York',
-    'Harper Perennial': 'New York',
-    'William Morrow': 'New York',
-    'Morrow': 'New York',
-    'Avon': 'New York',
-    'Ecco': 'New York',
-    'HarperOne': 'New York',
-    
-    'Hachette': 'New York',
-    'Little, Brown': 'Boston',
-    'Little Brown': 'Boston',
-    'Grand Central': 'New York',
-    'Twelve': 'New York',
-    'Basic Books': 'New York',
-    'PublicAffairs': 'New York',
-    'Public Affairs': 'New York',
-    
-    'Macmillan': 'New York',
-    "St. Martin's": 'New York',
-    "St Martin's": 'New York',
-    "St. Martin's Press": 'New York',
-    "St Martin's Press": 'New York',
-    'St. Martins': 'New York',
-    'Henry Holt': 'New York',
-    'Holt': 'New York',
-    'Farrar, Straus': 'New York',
-    'Farrar Straus': 'New York',
-    'Farrar, Straus and Giroux': 'New York',
-    'FSG': 'New York',
-    'Hill and Wang': 'New York',
-    'Picador': 'New York',
-    'Flatiron': 'New York',
-    'Tor Books': 'New York',
-    'Tor': 'New York',
-    
-    # === OTHER MAJOR TRADE ===
-    'Norton': 'New York',
-    'W. W. Norton': 'New York',
-    'W.W. Norton': 'New York',
-    'Liveright': 'New York',
-    'Bloomsbury': 'New York',
-    'Grove': 'New York',
-    'Grove Atlantic': 'New York',
-    'Grove Press': 'New York',
-    'Atlantic Monthly': 'New York',
-    'Algonquin': 'Chapel Hill',
-    'Workman': 'New York',
-    'Artisan': 'New York',
-    'Abrams': 'New York',
-    'Chronicle Books': 'San Francisco',
-    'Ten Speed': 'Berkeley',
-    'Clarkson Potter': 'New York',
-    'Potter': 'New York',
-    'Rizzoli': 'New York',
-    'Phaidon': 'London',
-    'Taschen': 'Cologne',
-    'DK': 'New York',
-    'Dorling Kindersley': 'New York',
-    'National Geographic': 'Washington, DC',
-    'Smithsonian': 'Washington, DC',
-    'Time Life': 'New York',
-    "Reader's Digest": 'New York',
-    'Rodale': 'New York',
-    'Hay House': 'Carlsbad, CA',
-    'Sounds True': 'Boulder',
-    'Shambhala': 'Boulder',
-    'New World Library': 'Novato, CA',
-    'Berrett-Koehler': 'San Francisco',
-    'Jossey-Bass': 'San Francisco',
-    'Wiley': 'Hoboken',
-    'John Wiley': 'Hoboken',
-    'For Dummies': 'Hoboken',
-    'McGraw-Hill': 'New York',
-    'McGraw Hill': 'New York',
-    'Pearson': 'New York',
-    'Cengage': 'Boston',
-    'Wadsworth': 'Belmont, CA',
-    'SAGE': 'Thousand Oaks, CA',
-    'Sage Publications': 'Thousand Oaks, CA',
-    'Free Press': 'New York',
-    'Beacon Press': 'Boston',
-    'Houghton Mifflin': 'Boston',
-    'Houghton Mifflin Harcourt': 'Boston',
-    
-    # === UNIVERSITY PRESSES (full names and abbreviations) ===
-    'Oxford University Press': 'Oxford',
-    'Oxford Univ Press': 'Oxford',
-    'OUP': 'Oxford',
-    'Cambridge University Press': 'Cambridge',
-    'Cambridge Univ Press': 'Cambridge',
-    'CUP': 'Cambridge',
-    'Cambridge Scholars': 'Newcastle upon Tyne',
-    'Cambridge Scholars Publishing': 'Newcastle upon Tyne',
-    'Harvard University Press': 'Cambridge, MA',
-    'Harvard Univ Press': 'Cambridge, MA',
-    'Yale University Press': 'New Haven',
-    'Yale Univ Press': 'New Haven',
-    'Princeton University Press': 'Princeton',
-    'Princeton Univ Press': 'Princeton',
-    'Columbia University Press': 'New York',
-    'Columbia Univ Press': 'New York',
-    'MIT Press': 'Cambridge, MA',
-    'Stanford University Press': 'Stanford',
-    'Stanford Univ Press': 'Stanford',
-    'University of Chicago Press': 'Chicago',
-    'Univ of Chicago Press': 'Chicago',
-    'U of Chicago Press': 'Chicago',
-    'Chicago University Press': 'Chicago',
-    'University of California Press': 'Berkeley',
-    'Univ of California Press': 'Berkeley',
-    'U of California Press': 'Berkeley',
-    'UC Press': 'Berkeley',
-    'California University Press': 'Berkeley',
-    'Johns Hopkins University Press': 'Baltimore',
-    'Johns Hopkins Univ Press': 'Baltimore',
-    'JHU Press': 'Baltimore',
-    'Johns Hopkins': 'Baltimore',
-    'Duke University Press': 'Durham',
-    'Duke Univ Press': 'Durham',
-    'Cornell University Press': 'Ithaca',
-    'Cornell Univ Press': 'Ithaca',
-    'University of Pennsylvania Press': 'Philadelphia',
-    'Univ of Pennsylvania Press': 'Philadelphia',
-    'Penn Press': 'Philadelphia',
-    'UPenn Press': 'Philadelphia',
-    'University of North Carolina Press': 'Chapel Hill',
-    'Univ of North Carolina Press': 'Chapel Hill',
-    'UNC Press': 'Chapel Hill',
-    'University of Virginia Press': 'Charlottesville',
-    'Univ of Virginia Press': 'Charlottesville',
-    'UVA Press': 'Charlottesville',
-    'University of Texas Press': 'Austin',
-    'Univ of Texas Press': 'Austin',
-    'UT Press': 'Austin',
-    'University of Michigan Press': 'Ann Arbor',
-    'Univ of Michigan Press': 'Ann Arbor',
-    'Michigan University Press': 'Ann Arbor',
-    'University of Illinois Press': 'Urbana',
-    'Univ of Illinois Press': 'Urbana',
-    'Illinois University Press': 'Urbana',
-    'University of Wisconsin Press': 'Madison',
-    'Univ of Wisconsin Press': 'Madison',
-    'Wisconsin University Press': 'Madison',
-    'University of Minnesota Press': 'Minneapolis',
-    'Univ of Minnesota Press': 'Minneapolis',
-    'Minnesota University Press': 'Minneapolis',
-    'Indiana University Press': 'Bloomington',
-    'Indiana Univ Press': 'Bloomington',
-    'IU Press': 'Bloomington',
-    'Ohio State University Press': 'Columbus',
-    'Ohio State Univ Press': 'Columbus',
-    'OSU Press': 'Columbus',
-    'Penn State University Press': 'University Park',
-    'Penn State Univ Press': 'University Park',
-    'PSU Press': 'University Park',
-    'University of Georgia Press': 'Athens',
-    'Univ of Georgia Press': 'Athens',
-    'UGA Press': 'Athens',
-    'Louisiana State University Press': 'Baton Rouge',
-    'LSU Press': 'Baton Rouge',
-    'University of Washington Press': 'Seattle',
-    'Univ of Washington Press': 'Seattle',
-    'UW Press': 'Seattle',
-    'University of Arizona Press': 'Tucson',
-    'Univ of Arizona Press': 'Tucson',
-    'University of New Mexico Press': 'Albuquerque',
-    'Univ of New Mexico Press': 'Albuquerque',
-    'UNM Press': 'Albuquerque',
-    'University of Oklahoma Press': 'Norman',
-    'Univ of Oklahoma Press': 'Norman',
-    'OU Press': 'Norman',
-    'University of Nebraska Press': 'Lincoln',
-    'Univ of Nebraska Press': 'Lincoln',
-    'Nebraska University Press': 'Lincoln',
-    'University of Iowa Press': 'Iowa City',
-    'Univ of Iowa Press': 'Iowa City',
-    'Iowa University Press': 'Iowa City',
-    'University of Missouri Press': 'Columbia, MO',
-    'Univ of Missouri Press': 'Columbia, MO',
-    'University of Kansas Press': 'Lawrence',
-    'Univ of Kansas Press': 'Lawrence',
-    'University of Colorado Press': 'Boulder',
-    'Univ of Colorado Press': 'Boulder',
-    'University of Utah Press': 'Salt Lake City',
-    'Univ of Utah Press': 'Salt Lake City',
-    'University of Hawaii Press': 'Honolulu',
-    'Univ of Hawaii Press': 'Honolulu',
-    'University of Toronto Press': 'Toronto',
-    'Univ of Toronto Press': 'Toronto',
-    'UTP': 'Toronto',
-    "McGill-Queen's University Press": 'Montreal',
-    "McGill-Queens University Press": 'Montreal',
-    "McGill Queen's": 'Montreal',
-    'University of British Columbia Press': 'Vancouver',
-    'UBC Press': 'Vancouver',
-    'Edinburgh University Press': 'Edinburgh',
-    'Manchester University Press': 'Manchester',
-    'University of Wales Press': 'Cardiff',
-    'Liverpool University Press': 'Liverpool',
-    'Bristol University Press': 'Bristol',
-    'Amsterdam University Press': 'Amsterdam',
-    'Leiden University Press': 'Leiden',
-    'Rutgers University Press': 'New Brunswick',
-    'Rutgers Univ Press': 'New Brunswick',
-    'NYU Press': 'New York',
-    'New York University Press': 'New York',
-    'SUNY Press': 'Albany',
-    'State University of New York Press': 'Albany',
-    'Temple University Press': 'Philadelphia',
-    'Fordham University Press': 'New York',
-    'Georgetown University Press': 'Washington, DC',
-    'Catholic University of America Press': 'Washington, DC',
-    'University of Notre Dame Press': 'Notre Dame',
-    'Baylor University Press': 'Waco',
-    'University of South Carolina Press': 'Columbia, SC',
-    'University of Tennessee Press': 'Knoxville',
-    'University of Kentucky Press': 'Lexington',
-    'University of Alabama Press': 'Tuscaloosa',
-    'University of Arkansas Press': 'Fayetteville',
-    'Texas A&M University Press': 'College Station',
-    'University of Nevada Press': 'Reno',
-    'Oregon State University Press': 'Corvallis',
-    'University of Massachusetts Press': 'Amherst',
-    'Wesleyan University Press': 'Middletown',
-    'University Press of Florida': 'Gainesville',
-    'University Press of Kansas': 'Lawrence',
-    'University Press of Kentucky': 'Lexington',
-    'University Press of Mississippi': 'Jackson',
-    'University Press of New England': 'Hanover',
-    'University Press of Colorado': 'Louisville, CO',
-    
-    # === ACADEMIC/SCHOLARLY PUBLISHERS ===
-    'Routledge': 'London',
-    'Taylor & Francis': 'London',
-    'Taylor and Francis': 'London',
-    'CRC Press': 'Boca Raton',
-    'Brill': 'Leiden',
-    'Elsevier': 'Amsterdam',
-    'Springer': 'New York',
-    'Springer Nature': 'New York',
-    'Springer Verlag': 'Berlin',
-    'Springer-Verlag': 'Berlin',
-    'Springer Science': 'New York',
-    'Palgrave': 'London',
-    'Palgrave Macmillan': 'London',
-    'De Gruyter': 'Berlin',
-    'Walter de Gruyter': 'Berlin',
-    'Mouton de Gruyter': 'Berlin',
-    'Academic Press': 'San Diego',
-    'Blackwell': 'Oxford',
-    'Wiley-Blackwell': 'Oxford',
-    'Polity': 'Cambridge',
-    'Polity Press': 'Cambridge',
-    'Verso': 'London',
-    'Zed Books': 'London',
-    'Pluto Press': 'London',
-    'Berg': 'Oxford',
-    'Ashgate': 'Farnham',
-    'Edward Elgar': 'Cheltenham',
-    'Peter Lang': 'New York',
-    'Lexington Books': 'Lanham',
-    'Rowman & Littlefield': 'Lanham',
-    'Rowman and Littlefield': 'Lanham',
-    'Scarecrow': 'Lanham',
-    'University Press of America': 'Lanham',
-    'UPA': 'Lanham',
-    'Continuum': 'London',
-    'T&T Clark': 'London',
-    'T & T Clark': 'London',
-    'Fortress Press': 'Minneapolis',
-    'Westminster John Knox': 'Louisville',
-    'WJK': 'Louisville',
-    'Eerdmans': 'Grand Rapids',
-    'Baker Academic': 'Grand Rapids',
-    'InterVarsity Press': 'Downers Grove',
-    'IVP': 'Downers Grove',
-    'Zondervan': 'Grand Rapids',
-    'Abingdon': 'Nashville',
-    'Broadman & Holman': 'Nashville',
-    'B&H': 'Nashville',
-    'Moody': 'Chicago',
-    'Crossway': 'Wheaton',
-    'Psychology Press': 'Hove',
-    'Psychology Press/Routledge': 'London',
-    'Infobase': 'New York',
-    'Infobase Publishing': 'New York',
-    'Facts on File': 'New York',
-    'Greenwood': 'Westport',
-    'Praeger': 'Westport',
-    'ABC-CLIO': 'Santa Barbara',
-    'McFarland': 'Jefferson, NC',
-    "BoD": 'Norderstedt',
-    "Books on Demand": 'Norderstedt',
-    
-    # === LAW PUBLISHERS ===
-    'West': 'St. Paul',
-    'West Publishing': 'St. Paul',
-    'Thomson West': 'St. Paul',
-    'LexisNexis': 'New York',
-    'Lexis Nexis': 'New York',
-    'Matthew Bender': 'New York',
-    'Wolters Kluwer': 'New York',
-    'Aspen': 'New York',
-    'Aspen Publishers': 'New York',
-    'Foundation Press': 'St. Paul',
-    'Carolina Academic Press': 'Durham',
-    'CAP': 'Durham',
-    
-    # === MEDICAL/SCIENCE ===
-    'Lippincott': 'Philadelphia',
-    'Lippincott Williams': 'Philadelphia',
-    'LWW': 'Philadelphia',
-    'Saunders': 'Philadelphia',
-    'Mosby': 'St. Louis',
-    'Elsevier Health': 'Philadelphia',
-    'Thieme': 'New York',
-    'Karger': 'Basel',
-    'Nature Publishing': 'London',
-    'Cold Spring Harbor': 'Cold Spring Harbor',
-    'CSHL Press': 'Cold Spring Harbor',
-    'ASM Press': 'Washington, DC',
-    'American Chemical Society': 'Washington, DC',
-    'ACS': 'Washington, DC',
-    'American Psychological Association': 'Washington, DC',
-    'APA': 'Washington, DC',
-    'American Psychiatric': 'Washington, DC',
-    'Guilford': 'New York',
-    'Guilford Press': 'New York',
-    
-    # === ARTS/HUMANITIES ===
-    'Yale Art': 'New Haven',
-    'Metropolitan Museum': 'New York',
-    'Met Publications': 'New York',
-    'Getty': 'Los Angeles',
-    'Getty Publications': 'Los Angeles',
-    'Prestel': 'Munich',
-    'Thames & Hudson': 'London',
-    'Thames and Hudson': 'London',
-    'Laurence King': 'London',
-    
-    # === TECH ===
-    "O'Reilly": 'Sebastopol',
-    'OReilly': 'Sebastopol',
-    'Addison-Wesley': 'Boston',
-    'Addison Wesley': 'Boston',
-    'Prentice Hall': 'Upper Saddle River',
-    'Apress': 'New York',
-    'Manning': 'Shelter Island',
-    'No Starch': 'San Francisco',
-    'No Starch Press': 'San Francisco',
-    'Pragmatic': 'Raleigh',
-    'Pragmatic Bookshelf': 'Raleigh',
-    'Packt': 'Birmingham',
-    'Sams': 'Indianapolis',
-    'Que': 'Indianapolis',
-    'New Riders': 'Berkeley',
-    'Peachpit': 'San Francisco',
-    
-    # === INTERNATIONAL ===
-    'Gallimard': 'Paris',
-    'Flammarion': 'Paris',
-    'Seuil': 'Paris',
-    'Albin Michel': 'Paris',
-    'Fayard': 'Paris',
-    'Hachette Livre': 'Paris',
-    'PUF': 'Paris',
-    'Suhrkamp': 'Frankfurt',
-    'Fischer': 'Frankfurt',
-    'Rowohlt': 'Hamburg',
-    'Hanser': 'Munich',
-    'Beck': 'Munich',
-    'C.H. Beck': 'Munich',
-    'DTV': 'Munich',
-    'Einaudi': 'Turin',
-    'Mondadori': 'Milan',
-    'Feltrinelli': 'Milan',
-    'Laterza': 'Rome',
-    'Alianza': 'Madrid',
-    'Anagrama': 'Barcelona',
-    'Tusquets': 'Barcelona',
-    'Fondo de Cultura': 'Mexico City',
-    'Siglo XXI': 'Mexico City',
-}
+# Lives in config.py (shared with claude_router.py).
+from config import resolve_publisher_place
 
 # ==================== HELPER: PLACE RESOLVER ====================
 def resolve_place(publisher, current_place):
     """
     If the API didn't return a city, check our internal map.
     """
-    if current_place: 
-        return current_place
-    
-    if not publisher: 
-        return ''
-        
-    for pub_name, pub_place in PUBLISHER_PLACE_MAP.items():
-        if pub_name.lower() in publisher.lower():
-            return pub_place
-    return ''
+    return resolve_publisher_place(publisher, current_place)
+
+# ==================== HELPER: ISBN → PUBLISHER/PLACE ====================
+def fill_from_isbn(result, isbn=''):
+    """
+    Fill missing publisher/place on a result dict from its ISBN alone,
+    using the offline registrant table (no network).
+    """
+    isbn = isbn or result.get('isbn', '')
+    if not isbn:
+        return result
+    if not result.get('publisher'):
+        result['publisher'] = publisher_for_isbn(isbn)
+    result['place'] = resolve_place(result.get('publisher', ''), result.get('place', ''))
+    return result
+
+# ==================== ENGINE 0: LOCAL EDITION INDEX (Offline) ====================
+class LocalEditionsAPI:
+    """
+    Best for: ISBN queries and common titles, when OPENLIBRARY_LOCAL_DB is set.
+    Returns: Same dicts as the network engines, in microseconds.
+    """
+    _index = OpenLibraryLocalIndex()
+
+    @staticmethod
+    def get_by_isbn(isbn):
+        result = LocalEditionsAPI._index.get_by_isbn(isbn)
+        if not result:
+            return []
+        result['place'] = resolve_place(result['publisher'], result['place'])
+        return [result]
+
+    @staticmethod
+    def search(query):
+        results = LocalEditionsAPI._index.search(query)
+        for result in results:
+            result['place'] = resolve_place(result['publisher'], result['place'])
+        return results
 
 # ==================== ENGINE 1: OPEN LIBRARY (New / Precise) ====================
 class OpenLibraryAPI:
@@ -494,7 +141,7 @@ class OpenLibraryAPI:
                 'jscmd': 'data' # 'data' endpoint gives rich metadata including places
             }
             
-            response = requests.get(OpenLibraryAPI.BASE_URL, params=params, timeout=5)
+            response = requests.get(OpenLibraryAPI.BASE_URL, params=params, timeout=request_timeout(5))
             data = response.json()
             
             if key in data:
@@ -549,7 +196,7 @@ class OpenLibraryAPI:
                 'fields': 'title,author_name,publisher,publish_year,isbn'
             }
             
-            response = requests.get(OpenLibraryAPI.SEARCH_URL, params=params, timeout=5)
+            response = requests.get(OpenLibraryAPI.SEARCH_URL, params=params, timeout=request_timeout(5))
             data = response.json()
             
             candidates = []
@@ -602,75 +249,120 @@ class GoogleBooksAPI:
         text = re.sub(r',?\s*\d+\.?$', '', text)
         return text.strip()
 
+    # Pooled connections shared by all searches (and their concurrent variants)
+    _session = requests.Session()
+
+    @staticmethod
+    def query_variants(cleaned_query):
+        """Query strings to try, in preference order."""
+        queries_to_try = [cleaned_query]
+        
+        # If query looks like "Author Title", try intitle: and inauthor:
+        words = cleaned_query.split()
+        if len(words) >= 3:
+            # Try: first word as author, rest as title
+            # e.g. "ilyon woo master slave" -> inauthor:ilyon+intitle:master slave
+            potential_author = words[0]
+            potential_title = ' '.join(words[1:])
+            queries_to_try.append(f'inauthor:{potential_author}+intitle:{potential_title}')
+            
+            # Try: first two words as author
+            # e.g. "ilyon woo master slave" -> inauthor:ilyon woo+intitle:master slave
+            if len(words) >= 4:
+                potential_author = ' '.join(words[:2])
+                potential_title = ' '.join(words[2:])
+                queries_to_try.append(f'inauthor:{potential_author}+intitle:{potential_title}')
+        return queries_to_try
+
     @staticmethod
     def search(query):
         if not query: return []
-        candidates = []
         try:
             cleaned_query = GoogleBooksAPI.clean_search_term(query)
+            queries_to_try = GoogleBooksAPI.query_variants(cleaned_query)
+            if len(queries_to_try) == 1:
+                return GoogleBooksAPI._fetch(queries_to_try[0], query)
             
-            # Try multiple query strategies
-            queries_to_try = [cleaned_query]
-            
-            # If query looks like "Author Title", try intitle: and inauthor:
-            words = cleaned_query.split()
-            if len(words) >= 3:
-                # Try: first word as author, rest as title
-                # e.g. "ilyon woo master slave" -> inauthor:ilyon+intitle:master slave
-                potential_author = words[0]
-                potential_title = ' '.join(words[1:])
-                queries_to_try.append(f'inauthor:{potential_author}+intitle:{potential_title}')
-                
-                # Try: first two words as author
-                # e.g. "ilyon woo master slave" -> inauthor:ilyon woo+intitle:master slave
-                if len(words) >= 4:
-                    potential_author = ' '.join(words[:2])
-                    potential_title = ' '.join(words[2:])
-                    queries_to_try.append(f'inauthor:{potential_author}+intitle:{potential_title}')
-            
+            # Hedged: variant N+1 is sent only after the earlier ones missed or
+            # stayed silent for VARIANT_HEDGE, so a quick hit costs one request.
+            # The first non-empty result in preference order wins; variants not
+            # yet sent are skipped, ones already in flight are ignored.
+            started = []
+            candidates = None
             for q in queries_to_try:
-                params = {'q': q, 'maxResults': 3, 'printType': 'books', 'orderBy': 'relevance'}
-                response = requests.get(GoogleBooksAPI.BASE_URL, params=params, timeout=5)
-                
-                if response.status_code == 200:
-                    items = response.json().get('items', [])
-                    for item in items:
-                        info = item.get('volumeInfo', {})
-                        
-                        # Authors
-                        authors = info.get('authors', [])
-                        
-                        # Title
-                        title = info.get('title', '')
-                        if info.get('subtitle'):
-                            title = f"{title}: {info.get('subtitle')}"
-                        
-                        # Publisher
-                        publisher = info.get('publisher', '')
-                        
-                        # Date/Year
-                        date_str = info.get('publishedDate', '')
-                        year = date_str.split('-')[0] if date_str else ''
-                        
-                        # Place (Google Books rarely provides this, so we rely heavily on the Map)
-                        place = resolve_place(publisher, '')
+                started.append(submit_child(VARIANT_EXECUTOR, GoogleBooksAPI._fetch, q, query))
+                candidates = GoogleBooksAPI._first_hit(started, VARIANT_HEDGE)
+                if candidates is not None or deadline_expired():
+                    break
+            if candidates is None:
+                candidates = GoogleBooksAPI._first_hit(started, SEARCH_TIMEOUT)
+            for _, token in started:
+                token.cancel()
+            return candidates or []
+        except Exception as e:
+            print(f"[GoogleBooks] Error: {e}")
+            return []
 
-                        candidates.append({
-                            'type': 'book',
-                            'authors': authors,
-                            'title': title,
-                            'publisher': publisher,
-                            'place': place,
-                            'year': year,
-                            'source_engine': 'Google Books',
-                            'raw_source': query
-                        })
+    @staticmethod
+    def _first_hit(started, timeout):
+        """
+        First non-empty result of started variants in preference order, once
+        every earlier one has missed. None when all missed, or one is still
+        running after timeout.
+        """
+        end = time.monotonic() + remaining(timeout)
+        for future, _ in started:
+            try:
+                candidates = future.result(timeout=max(0.0, end - time.monotonic()))
+            except FuturesTimeout:
+                return None
+            if candidates:
+                return candidates
+        return None
+
+    @staticmethod
+    def _fetch(q, raw_query):
+        """Results of one query string ([] on any failure)."""
+        candidates = []
+        try:
+            params = {'q': q, 'maxResults': 3, 'printType': 'books', 'orderBy': 'relevance'}
+            response = GoogleBooksAPI._session.get(GoogleBooksAPI.BASE_URL, params=params, timeout=request_timeout(5))
+            
+            if response.status_code == 200:
+                items = response.json().get('items', [])
+                for item in items:
+                    info = item.get('volumeInfo', {})
+                    
+                    # Authors
+                    authors = info.get('authors', [])
                     
-                    # If we got results, stop trying other queries
-                    if candidates:
-                        break
-                else:
-                    print(f"[GoogleBooks] HTTP {response.status_code} for query: {q[:30]}...")
+                    # Title
+                    title = info.get('title', '')
+                    if info.get('subtitle'):
+                        title = f"{title}: {info.get('subtitle')}"
+                    
+                    # Publisher
+                    publisher = info.get('publisher', '')
+                    
+                    # Date/Year
+                    date_str = info.get('publishedDate', '')
+                    year = date_str.split('-')[0] if date_str else ''
+                    
+                    # Place (Google Books rarely provides this, so we rely heavily on the Map)
+                    place = resolve_place(publisher, '')
+
+                    candidates.append({
+                        'type': 'book',
+                        'authors': authors,
+                        'title': title,
+                        'publisher': publisher,
+                        'place': place,
+                        'year': year,
+                        'source_engine': 'Google Books',
+                        'raw_source': raw_query
+                    })
+            else:
+                print(f"[GoogleBooks] HTTP {response.status_code} for query: {q[:30]}...")
         except Exception as e:
             print(f"[GoogleBooks] Error: {e}")
         return candidates
@@ -701,7 +393,7 @@ class LibraryOfCongressAPI:
                 'c': 3  # max 3 results
             }
             
-            response = requests.get(LibraryOfCongressAPI.SEARCH_URL, params=params, timeout=8)
+            response = requests.get(LibraryOfCongressAPI.SEARCH_URL, params=params, timeout=request_timeout(8))
             
             if response.status_code == 200:
                 data = response.json()
@@ -797,7 +489,7 @@ class WorldCatAPI:
                 'count': 3
             }
             
-            response = requests.get(WorldCatAPI.SEARCH_URL, params=params, timeout=8)
+            response = requests.get(WorldCatAPI.SEARCH_URL, params=params, timeout=request_timeout(8))
             
             if response.status_code == 200:
                 data = response.json()
@@ -883,7 +575,7 @@ class InternetArchiveAPI:
                 'output': 'json'
             }
             
-            response = requests.get(InternetArchiveAPI.SEARCH_URL, params=params, timeout=8)
+            response = requests.get(InternetArchiveAPI.SEARCH_URL, params=params, timeout=request_timeout(8))
             
             if response.status_code == 200:
                 data = response.json()
@@ -940,44 +632,122 @@ class InternetArchiveAPI:
 
 # ==================== MAIN CONTROLLER ====================
 
+def _network_engines():
+    """(name, search) for the network title/author engines, in priority order."""
+    engines = [
+        ('Google Books', GoogleBooksAPI.search),
+        ('Library of Congress', LibraryOfCongressAPI.search),
+    ]
+    if WORLDCAT_API_KEY:
+        engines.append(('WorldCat', WorldCatAPI.search))
+    engines.append(('Open Library', OpenLibraryAPI.search))
+    return engines
+
+
+def _fan_out(engines, text):
+    """Start every engine on the shared pool; returns [(name, future, token)]."""
+    started = []
+    for name, search in engines:
+        future, token = submit_child(ENGINE_EXECUTOR, search, text)
+        started.append((name, future, token))
+    return started
+
+
+def _engine_result(name, future):
+    try:
+        return future.result() or []
+    except Exception as e:
+        print(f"[books] {name} error: {e}")
+        return []
+
+
+def _race_by_priority(engines, text, grace=PRIORITY_GRACE):
+    """
+    Run engines concurrently and return the results of the highest-priority
+    one that answers.
+
+    Once any engine has results, higher-priority engines still running get
+    `grace` seconds to finish; the answer is taken as soon as every engine
+    above the best one so far has come back empty. Engines whose results are
+    not used are cancelled.
+    """
+    started = _fan_out(engines, text)
+    results = [None] * len(started)
+    index = {future: i for i, (_, future, _) in enumerate(started)}
+    pending = set(index)
+    give_up = time.monotonic() + remaining(SEARCH_TIMEOUT)
+    grace_end = None
+    best = None
+    
+    while pending:
+        answered = [i for i, r in enumerate(results) if r]
+        best = answered[0] if answered else None
+        if best is not None and all(r is not None for r in results[:best]):
+            break
+        timeout = (grace_end if grace_end is not None else give_up) - time.monotonic()
+        if timeout <= 0:
+            break
+        done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+        for future in done:
+            i = index[future]
+            results[i] = _engine_result(started[i][0], future)
+            if results[i] and grace_end is None:
+                grace_end = min(give_up, time.monotonic() + grace)
+    else:
+        answered = [i for i, r in enumerate(results) if r]
+        best = answered[0] if answered else None
+    
+    for i, (_, _, token) in enumerate(started):
+        if i != best:
+            token.cancel()
+    if best is None:
+        return []
+    print(f"[books] Using {started[best][0]} ({len(results[best])} results)")
+    return results[best]
+
+
+def get_by_isbn(isbn):
+    """
+    Look up a normalized ISBN: local edition index first, then Open Library
+    (the authority). Publisher/place gaps are filled from the ISBN
+    registrant table. No fuzzy search.
+    """
+    results = LocalEditionsAPI.get_by_isbn(isbn)
+    if not results:
+        results = OpenLibraryAPI.get_by_isbn(isbn)
+    return [fill_from_isbn(r, isbn) for r in results]
+
+
 def extract_metadata(text):
     """
-    Extract book metadata using multiple engines in fallback order.
-    Returns first successful result.
+    Extract book metadata using multiple engines.
+    
+    ISBNs and the local index are tried first; the network engines are then
+    raced concurrently and the highest-priority answer wins (see
+    _race_by_priority).
     """
     clean_text = text.strip()
     
     # STRATEGY 1: ISBN DETECTION
-    # Look for ISBN-10 or ISBN-13 patterns
-    isbn_match = re.search(r'\b(?:97[89][-\s]?)?(\d[-\s]?){9}[\dX]\b', clean_text)
-    
-    if isbn_match:
-        # If we have an ISBN, Open Library is the authority
-        results = OpenLibraryAPI.get_by_isbn(isbn_match.group(0))
+    # Only checksum-valid ISBNs (see identifiers.py) are looked up
+    isbn = first_identifier(clean_text, 'isbn')
+    if isbn:
+        results = get_by_isbn(isbn)
         if results:
             return results
-
-    # STRATEGY 2: GOOGLE BOOKS FUZZY SEARCH
-    results = GoogleBooksAPI.search(clean_text)
-    if results:
-        return results
     
-    # STRATEGY 3: LIBRARY OF CONGRESS (no API key needed)
-    print(f"[books] Google Books returned nothing, trying Library of Congress...")
-    results = LibraryOfCongressAPI.search(clean_text)
+    # STRATEGY 1b: LOCAL TITLE/AUTHOR INDEX
+    results = LocalEditionsAPI.search(clean_text)
     if results:
         return results
     
-    # STRATEGY 4: WORLDCAT (if API key configured)
-    if WORLDCAT_API_KEY:
-        print(f"[books] LOC returned nothing, trying WorldCat...")
-        results = WorldCatAPI.search(clean_text)
-        if results:
-            return results
-    
-    # STRATEGY 5: OPEN LIBRARY SEARCH (final fallback)
-    print(f"[books] Trying Open Library search as final fallback...")
-    return OpenLibraryAPI.search(clean_text)
+    # Network engines below: stop once the request deadline has passed
+    if deadline_expired():
+        return []
+
+    # STRATEGY 2: NETWORK ENGINES, RACED IN PRIORITY ORDER
+    # Google Books > Library of Congress > WorldCat (if configured) > Open Library search
+    return _race_by_priority(_network_engines(), clean_text)
 
 
 def search_all_engines(text):
@@ -985,56 +755,40 @@ def search_all_engines(text):
     Search ALL book engines and return combined results.
     Used by multi-candidate UI to show options from different sources.
     
+    Network engines are queried concurrently; results keep engine order.
     Returns list of results from all engines (not deduplicated).
     """
     clean_text = text.strip()
     all_results = []
     
-    # Google Books
-    try:
-        print(f"[books] Searching Google Books for: {clean_text[:30]}...")
-        results = GoogleBooksAPI.search(clean_text)
-        print(f"[books] Google Books returned {len(results)} results")
-        all_results.extend(results[:2])
-    except Exception as e:
-        print(f"[books] Google Books error: {e}")
-    
-    # Library of Congress
-    try:
-        print(f"[books] Searching Library of Congress...")
-        results = LibraryOfCongressAPI.search(clean_text)
-        print(f"[books] LOC returned {len(results)} results")
-        all_results.extend(results[:2])
-    except Exception as e:
-        print(f"[books] LOC error: {e}")
-    
-    # Internet Archive (free, no key needed)
+    # Local edition index (no network)
     try:
-        print(f"[books] Searching Internet Archive...")
-        results = InternetArchiveAPI.search(clean_text)
-        print(f"[books] Internet Archive returned {len(results)} results")
+        results = LocalEditionsAPI.search(clean_text)
         all_results.extend(results[:2])
     except Exception as e:
-        print(f"[books] Internet Archive error: {e}")
+        print(f"[books] Local index error: {e}")
     
-    # WorldCat (if configured)
+    engines = [
+        ('Google Books', GoogleBooksAPI.search),
+        ('Library of Congress', LibraryOfCongressAPI.search),
+        ('Internet Archive', InternetArchiveAPI.search),
+    ]
     if WORLDCAT_API_KEY:
-        try:
-            print(f"[books] Searching WorldCat...")
-            results = WorldCatAPI.search(clean_text)
-            print(f"[books] WorldCat returned {len(results)} results")
-            all_results.extend(results[:2])
-        except Exception as e:
-            print(f"[books] WorldCat error: {e}")
-    
-    # Open Library
-    try:
-        print(f"[books] Searching Open Library...")
-        results = OpenLibraryAPI.search(clean_text)
-        print(f"[books] Open Library returned {len(results)} results")
+        engines.append(('WorldCat', WorldCatAPI.search))
+    engines.append(('Open Library', OpenLibraryAPI.search))
+    
+    print(f"[books] Searching {len(engines)} engines for: {clean_text[:30]}...")
+    started = _fan_out(engines, clean_text)
+    wait([future for _, future, _ in started], timeout=remaining(SEARCH_TIMEOUT))
+    
+    for name, future, token in started:
+        if not future.done():
+            token.cancel()
+            print(f"[books] {name} timed out")
+            continue
+        results = _engine_result(name, future)
+        print(f"[books] {name} returned {len(results)} results")
         all_results.extend(results[:2])
-    except Exception as e:
-        print(f"[books] Open Library error: {e}")
     
     print(f"[books] Total results from all engines: {len(all_results)}")
     return all_results
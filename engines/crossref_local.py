@@ -0,0 +1,331 @@
+"""
+citeflex/engines/crossref_local.py
+
+Offline Crossref snapshot index.
+
+An optional SQLite FTS5 index built from Crossref public data-file JSONL
+(or any subset of it). Title/author/container/year are indexed and ranked
+with BM25, so most journal queries resolve with zero network I/O. When the
+index file is not configured or not present the engine simply returns no
+results and callers fall through to the live Crossref API.
+
+Build:
+    python -m engines.crossref_local build crossref.db 0.json.gz 1.json.gz ...
+
+Then point CROSSREF_LOCAL_DB at crossref.db.
+
+Version History:
+    2026-10-18: get_many looks up a batch of DOIs in one local query
+    2026-10-18: Initial version (FTS5 index, BM25 ranking, DOI lookup)
+"""
+
+import os
+import re
+import sys
+import gzip
+import json
+import sqlite3
+import threading
+from typing import Optional, List, Dict, Iterator
+
+from engines.academic import CrossrefEngine
+from models import CitationMetadata, normalize_doi
+from config import CROSSREF_LOCAL_DB
+
+
+# =============================================================================
+# SETTINGS
+# =============================================================================
+
+# BM25 column weights: title, authors, container, year
+BM25_WEIGHTS = (10.0, 4.0, 2.0, 1.0)
+
+# Candidates pulled from FTS before the title-coverage check
+CANDIDATE_MULTIPLIER = 4
+
+# Fraction of the title's content words that must appear in the query.
+# BM25 over an OR query always returns *something*; this keeps weak
+# partial matches from short-circuiting the network engines.
+MIN_TITLE_COVERAGE = 0.75
+
+# Cap on query terms sent to FTS (bounds cost on long, messy notes)
+MAX_QUERY_TERMS = 32
+
+# Only these Crossref fields are kept in the index
+STORED_FIELDS = (
+    'DOI', 'title', 'author', 'container-title', 'published-print',
+    'published-online', 'created', 'volume', 'issue', 'page',
+    'publisher', 'type',
+)
+
+STOPWORDS = {
+    'the', 'and', 'for', 'with', 'from', 'into', 'onto', 'that', 'this',
+    'are', 'was', 'were', 'its', 'his', 'her', 'their', 'our', 'via',
+    'between', 'among', 'about', 'over', 'under', 'des', 'der', 'die',
+    'das', 'les', 'una', 'del', 'von',
+}
+
+_WORD_RE = re.compile(r'[a-z0-9]+')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS works (
+    id INTEGER PRIMARY KEY,
+    doi TEXT UNIQUE,
+    title TEXT,
+    authors TEXT,
+    container TEXT,
+    year TEXT,
+    item TEXT
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS works_fts USING fts5(
+    title, authors, container, year,
+    content='works', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2'
+);
+"""
+
+
+def _words(text: str) -> List[str]:
+    return _WORD_RE.findall(text.lower())
+
+
+def _content_words(text: str) -> set:
+    return {w for w in _words(text) if len(w) > 2 and w not in STOPWORDS}
+
+
+# =============================================================================
+# ENGINE
+# =============================================================================
+
+class CrossrefLocalEngine(CrossrefEngine):
+    """
+    Search a local Crossref snapshot (SQLite FTS5, BM25 ranked).
+
+    Shares CrossrefEngine's normalization so results are indistinguishable
+    from live API results apart from source_engine.
+    """
+
+    name = "Crossref (Local)"
+    base_url = ""
+
+    def __init__(self, db_path: str = CROSSREF_LOCAL_DB, **kwargs):
+        super().__init__(**kwargs)
+        self.db_path = db_path
+        self._local = threading.local()
+
+    @property
+    def available(self) -> bool:
+        return bool(self.db_path) and os.path.exists(self.db_path)
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        """One read-only connection per thread (engines run in executors)."""
+        if not self.available:
+            return None
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            try:
+                conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True)
+                self._local.conn = conn
+            except sqlite3.Error as e:
+                print(f"[{self.name}] Cannot open index: {e}")
+                return None
+        return conn
+
+    def search(self, query: str) -> Optional[CitationMetadata]:
+        results = self.search_multiple(query, limit=1)
+        return results[0] if results else None
+
+    def search_multiple(self, query: str, limit: int = 5) -> List[CitationMetadata]:
+        conn = self._connect()
+        if conn is None:
+            return []
+
+        query_words = _words(query)
+        terms = [w for w in dict.fromkeys(query_words) if w not in STOPWORDS][:MAX_QUERY_TERMS]
+        if not terms:
+            return []
+
+        match = " OR ".join(f'"{t}"' for t in terms)
+        try:
+            rows = conn.execute(
+                "SELECT w.title, w.item FROM works_fts "
+                "JOIN works w ON w.id = works_fts.rowid "
+                "WHERE works_fts MATCH ? "
+                "ORDER BY bm25(works_fts, ?, ?, ?, ?) LIMIT ?",
+                (match, *BM25_WEIGHTS, limit * CANDIDATE_MULTIPLIER)
+            ).fetchall()
+        except sqlite3.Error as e:
+            print(f"[{self.name}] Query error: {e}")
+            return []
+
+        query_set = set(query_words)
+        results = []
+        for title, item in rows:
+            title_words = _content_words(title or '')
+            if not title_words:
+                continue
+            if len(title_words & query_set) / len(title_words) < MIN_TITLE_COVERAGE:
+                continue
+            try:
+                results.append(self._normalize(json.loads(item), query))
+            except Exception:
+                continue
+            if len(results) >= limit:
+                break
+
+        return results
+
+    def get_by_id(self, doi: str) -> Optional[CitationMetadata]:
+        """Look up by DOI in the local index."""
+        conn = self._connect()
+        if conn is None:
+            return None
+
+        doi = doi.replace('https://doi.org/', '').replace('http://dx.doi.org/', '')
+        try:
+            row = conn.execute(
+                "SELECT item FROM works WHERE doi = ?", (doi.lower(),)
+            ).fetchone()
+            if row:
+                return self._normalize(json.loads(row[0]), doi)
+        except Exception as e:
+            print(f"[{self.name}] Lookup error: {e}")
+        return None
+
+    def _get_many_chunk(self, dois: List[str]) -> Dict[str, CitationMetadata]:
+        """A batch of DOIs in one local query (never the live API)."""
+        conn = self._connect()
+        if conn is None:
+            return {}
+
+        wanted = {normalize_doi(d): d for d in dois}
+        found = {}
+        try:
+            rows = conn.execute(
+                f"SELECT doi, item FROM works WHERE doi IN ({','.join('?' * len(wanted))})",
+                list(wanted)
+            ).fetchall()
+            for doi, item in rows:
+                found[wanted[doi]] = self._normalize(json.loads(item), wanted[doi])
+        except Exception as e:
+            print(f"[{self.name}] Lookup error: {e}")
+        return found
+
+
+# =============================================================================
+# INDEX BUILD
+# =============================================================================
+
+def _open(path: str):
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8')
+    return open(path, 'r', encoding='utf-8')
+
+
+def iter_crossref_items(path: str) -> Iterator[dict]:
+    """
+    Yield work items from a Crossref data file.
+
+    Accepts both the public data-file layout ({"items": [...]} per file)
+    and plain JSONL with one work per line.
+    """
+    with _open(path) as f:
+        if '.jsonl' not in path:
+            try:
+                data = json.load(f)
+                for item in data.get('items', []) if isinstance(data, dict) else data:
+                    yield item
+                return
+            except ValueError:
+                f.seek(0)
+
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                data = json.loads(line)
+            except ValueError:
+                continue
+            if 'items' in data:
+                yield from data['items']
+            else:
+                yield data
+
+
+def _index_row(item: dict) -> Optional[tuple]:
+    doi = item.get('DOI')
+    titles = item.get('title') or []
+    if not doi or not titles:
+        return None
+
+    compact = {k: item[k] for k in STORED_FIELDS if k in item}
+    authors = " ".join(
+        f"{a.get('given', '')} {a.get('family', '')}".strip()
+        for a in item.get('author', [])
+    )
+    containers = item.get('container-title') or []
+
+    year = ''
+    for date_field in ('published-print', 'published-online', 'created'):
+        parts = (item.get(date_field) or {}).get('date-parts') or [[]]
+        if parts[0] and parts[0][0]:
+            year = str(parts[0][0])
+            break
+
+    return (
+        doi.lower(),
+        titles[0],
+        authors,
+        containers[0] if containers else '',
+        year,
+        json.dumps(compact, separators=(',', ':')),
+    )
+
+
+def build_index(db_path: str, sources: List[str], batch_size: int = 5000) -> int:
+    """
+    Build (or extend) a local index from Crossref data files.
+
+    Returns the number of works indexed.
+    """
+    conn = sqlite3.connect(db_path)
+    conn.executescript(SCHEMA)
+    count = 0
+
+    def flush(batch):
+        conn.executemany(
+            "INSERT OR REPLACE INTO works (doi, title, authors, container, year, item) "
+            "VALUES (?, ?, ?, ?, ?, ?)", batch
+        )
+        conn.commit()
+
+    for path in sources:
+        batch = []
+        for item in iter_crossref_items(path):
+            row = _index_row(item)
+            if row:
+                batch.append(row)
+            if len(batch) >= batch_size:
+                flush(batch)
+                count += len(batch)
+                batch = []
+        if batch:
+            flush(batch)
+            count += len(batch)
+        print(f"[CrossrefLocal] Indexed {path} ({count} works total)")
+
+    # Index the content table in one pass (also drops entries for replaced rows)
+    conn.execute("INSERT INTO works_fts(works_fts) VALUES ('rebuild')")
+    conn.execute("INSERT INTO works_fts(works_fts) VALUES ('optimize')")
+    conn.commit()
+    conn.close()
+    return count
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 4 or sys.argv[1] != 'build':
+        print("Usage: python -m engines.crossref_local build <index.db> <file> [<file> ...]")
+        sys.exit(1)
+    total = build_index(sys.argv[2], sys.argv[3:])
+    print(f"[CrossrefLocal] Done: {total} works in {sys.argv[2]}")
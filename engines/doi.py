@@ -2,6 +2,11 @@
 citeflex/engines/doi.py
 
 DOI extraction and academic publisher URL handling.
+
+Version History:
+    2026-10-18: Generic DOI, arXiv and PMID extraction delegate to identifiers.py
+    2026-10-18: Publisher domain lookup goes through config.DOMAIN_TRIE
+                (most specific registered domain) instead of substring scans
 """
 
 import re
@@ -9,6 +14,8 @@ from typing import Optional
 from urllib.parse import urlparse
 
 from models import CitationMetadata
+from identifiers import first_identifier
+from config import DOMAIN_TRIE
 
 
 # Academic publisher domains and their DOI URL patterns
@@ -36,6 +43,14 @@ ACADEMIC_PUBLISHER_DOMAINS = {
 }
 
 
+def _publisher_domain(host: str) -> Optional[str]:
+    """Most specific academic domain for host that has a URL pattern."""
+    for domain, category, _ in DOMAIN_TRIE.iter_matches(host):
+        if category == 'academic' and domain in ACADEMIC_PUBLISHER_DOMAINS:
+            return domain
+    return None
+
+
 def extract_doi_from_url(url: str) -> Optional[str]:
     """
     Extract DOI from an academic publisher URL.
@@ -64,26 +79,22 @@ def extract_doi_from_url(url: str) -> Optional[str]:
             if path.startswith('10.'):
                 return path
         
-        # Check each publisher pattern
-        for pub_domain, pattern in ACADEMIC_PUBLISHER_DOMAINS.items():
-            if pub_domain in domain:
-                match = re.search(pattern, url, re.IGNORECASE)
-                if match:
-                    extracted = match.group(1)
-                    # For ScienceDirect, we got PII not DOI
-                    if 'sciencedirect' in domain:
-                        return None  # Need different handling
-                    # Ensure it looks like a DOI
-                    if extracted.startswith('10.'):
-                        return extracted
-                    return None
+        # Check the most specific publisher pattern for this host
+        pub_domain = _publisher_domain(domain)
+        if pub_domain:
+            match = re.search(ACADEMIC_PUBLISHER_DOMAINS[pub_domain], url, re.IGNORECASE)
+            if match:
+                extracted = match.group(1)
+                # For ScienceDirect, we got PII not DOI
+                if 'sciencedirect' in domain:
+                    return None  # Need different handling
+                # Ensure it looks like a DOI
+                if extracted.startswith('10.'):
+                    return extracted
+                return None
         
         # Generic DOI pattern in URL
-        doi_match = re.search(r'(10\.\d{4,}/[^\s&?#]+)', url)
-        if doi_match:
-            return doi_match.group(1).rstrip('.')
-        
-        return None
+        return first_identifier(url, 'doi')
         
     except Exception:
         return None
@@ -106,11 +117,7 @@ def is_academic_publisher_url(url: str) -> bool:
         parsed = urlparse(url)
         domain = parsed.netloc.lower().replace('www.', '')
         
-        for pub_domain in ACADEMIC_PUBLISHER_DOMAINS:
-            if pub_domain in domain:
-                return True
-        
-        return False
+        return _publisher_domain(domain) is not None
         
     except Exception:
         return False
@@ -148,17 +155,8 @@ def extract_arxiv_id(url: str) -> Optional[str]:
     if not url or 'arxiv' not in url.lower():
         return None
     
-    # Patterns: arxiv.org/abs/2301.12345 or arxiv.org/pdf/2301.12345
-    match = re.search(r'arxiv\.org/(?:abs|pdf)/(\d+\.\d+)', url, re.IGNORECASE)
-    if match:
-        return match.group(1)
-    
-    # Old format: arxiv.org/abs/hep-th/9901001
-    match = re.search(r'arxiv\.org/(?:abs|pdf)/([a-z-]+/\d+)', url, re.IGNORECASE)
-    if match:
-        return match.group(1)
-    
-    return None
+    # arxiv.org/abs/2301.12345, arxiv.org/pdf/2301.12345, arxiv.org/abs/hep-th/9901001
+    return first_identifier(url, 'arxiv')
 
 
 def extract_pmid_from_url(url: str) -> Optional[str]:
@@ -174,14 +172,5 @@ def extract_pmid_from_url(url: str) -> Optional[str]:
     if not url:
         return None
     
-    # Pattern: pubmed.ncbi.nlm.nih.gov/12345678/
-    match = re.search(r'pubmed\.ncbi\.nlm\.nih\.gov/(\d+)', url, re.IGNORECASE)
-    if match:
-        return match.group(1)
-    
-    # Pattern: ncbi.nlm.nih.gov/pubmed/12345678
-    match = re.search(r'ncbi\.nlm\.nih\.gov/pubmed/(\d+)', url, re.IGNORECASE)
-    if match:
-        return match.group(1)
-    
-    return None
+    # pubmed.ncbi.nlm.nih.gov/12345678/ or ncbi.nlm.nih.gov/pubmed/12345678
+    return first_identifier(url, 'pmid')
@@ -8,9 +8,9 @@ import re
 from typing import Optional, List
 from urllib.parse import urlparse
 
-from engines.base import SearchEngine
+from engines.base import SearchEngine, keep_raw
 from models import CitationMetadata, CitationType
-from config import GOOGLE_CSE_API_KEY, GOOGLE_CSE_ID, ACADEMIC_DOMAINS
+from config import GOOGLE_CSE_API_KEY, GOOGLE_CSE_ID, DOMAIN_TRIE
 
 
 class GoogleCSEEngine(SearchEngine):
@@ -46,7 +46,7 @@ class GoogleCSEEngine(SearchEngine):
                 link = item.get('link', '')
                 domain = urlparse(link).netloc.lower()
                 
-                if any(ad in domain for ad in ACADEMIC_DOMAINS):
+                if DOMAIN_TRIE.match(domain, 'academic'):
                     return self._normalize(item, query)
             
             if items:
@@ -63,7 +63,7 @@ class GoogleCSEEngine(SearchEngine):
             source_engine=self.name,
             title=item.get('title', ''),
             url=item.get('link', ''),
-            raw_data=item
+            raw_data=keep_raw(item)
         )
 
 
@@ -133,7 +133,7 @@ class GoogleBooksEngine(SearchEngine):
             publisher=info.get('publisher', ''),
             isbn=isbn,
             url=info.get('infoLink', ''),
-            raw_data=item
+            raw_data=keep_raw(item)
         )
 
 
@@ -181,5 +181,5 @@ class OpenLibraryEngine(SearchEngine):
             year=year,
             publisher=publisher,
             isbn=isbn,
-            raw_data=item
+            raw_data=keep_raw(item)
         )
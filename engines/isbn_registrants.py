@@ -0,0 +1,281 @@
+"""
+citeflex/engines/isbn_registrants.py
+
+Offline ISBN registrant lookup: ISBN prefix → publisher.
+
+Every ISBN-13 is prefix-group-registrant-publication-check. The registrant
+element identifies the publisher, so a compact prefix table answers
+"who published this ISBN" with no network I/O. Combined with the
+publisher → place map this fills publisher and place from the ISBN alone.
+
+Data:
+- REGISTRANT_PUBLISHERS below covers the major academic and trade presses.
+- ISBN_REGISTRANTS_FILE (optional) adds/overrides entries from a
+  "prefix,publisher" CSV (prefix may be hyphenated, e.g. 978-0-19).
+- ISBN_RANGES_FILE (optional) points at the International ISBN Agency's
+  RangeMessage.xml; when present, ISBNs are split on the official
+  registrant boundaries instead of longest-prefix matching.
+
+Version History:
+    2026-10-18: Initial version (registrant prefix table, RangeMessage.xml rules)
+"""
+
+import os
+import csv
+import xml.etree.ElementTree as ET
+from typing import Optional, Dict, List, Tuple
+
+from config import ISBN_RANGES_FILE, ISBN_REGISTRANTS_FILE
+from identifiers import normalize_isbn
+
+
+# =============================================================================
+# DATA: REGISTRANT PREFIXES
+# =============================================================================
+
+REGISTRANT_PUBLISHERS: Dict[str, str] = {
+    # --- Group 978-0 (English) ---
+    '978-0-00': 'HarperCollins',
+    '978-0-02': 'Macmillan',
+    '978-0-04': 'Allen & Unwin',
+    '978-0-06': 'HarperCollins',
+    '978-0-07': 'McGraw-Hill',
+    '978-0-08': 'Pergamon',
+    '978-0-11': 'The Stationery Office',
+    '978-0-12': 'Academic Press',
+    '978-0-13': 'Prentice Hall',
+    '978-0-14': 'Penguin',
+    '978-0-15': 'Harcourt',
+    '978-0-16': 'U.S. Government Printing Office',
+    '978-0-19': 'Oxford University Press',
+    '978-0-201': 'Addison-Wesley',
+    '978-0-226': 'University of Chicago Press',
+    '978-0-231': 'Columbia University Press',
+    '978-0-252': 'University of Illinois Press',
+    '978-0-253': 'Indiana University Press',
+    '978-0-262': 'MIT Press',
+    '978-0-271': 'Penn State University Press',
+    '978-0-292': 'University of Texas Press',
+    '978-0-295': 'University of Washington Press',
+    '978-0-299': 'University of Wisconsin Press',
+    '978-0-300': 'Yale University Press',
+    '978-0-312': "St. Martin's Press",
+    '978-0-316': 'Little, Brown',
+    '978-0-345': 'Ballantine',
+    '978-0-374': 'Farrar, Straus and Giroux',
+    '978-0-385': 'Doubleday',
+    '978-0-387': 'Springer',
+    '978-0-393': 'W. W. Norton',
+    '978-0-394': 'Random House',
+    '978-0-399': 'Putnam',
+    '978-0-415': 'Routledge',
+    '978-0-444': 'Elsevier',
+    '978-0-465': 'Basic Books',
+    '978-0-470': 'Wiley',
+    '978-0-471': 'Wiley',
+    '978-0-472': 'University of Michigan Press',
+    '978-0-520': 'University of California Press',
+    '978-0-521': 'Cambridge University Press',
+    '978-0-553': 'Bantam',
+    '978-0-571': 'Faber & Faber',
+    '978-0-618': 'Houghton Mifflin',
+    '978-0-674': 'Harvard University Press',
+    '978-0-679': 'Random House',
+    '978-0-684': 'Scribner',
+    '978-0-691': 'Princeton University Press',
+    '978-0-7432': 'Simon & Schuster',
+    '978-0-7456': 'Polity',
+    '978-0-7619': 'Sage Publications',
+    '978-0-8014': 'Cornell University Press',
+    '978-0-8018': 'Johns Hopkins University Press',
+    '978-0-8032': 'University of Nebraska Press',
+    '978-0-8047': 'Stanford University Press',
+    '978-0-8061': 'University of Oklahoma Press',
+    '978-0-8070': 'Beacon Press',
+    '978-0-8078': 'University of North Carolina Press',
+    '978-0-8101': 'Northwestern University Press',
+    '978-0-8122': 'University of Pennsylvania Press',
+    '978-0-8131': 'University Press of Kentucky',
+    '978-0-8166': 'University of Minnesota Press',
+    '978-0-8223': 'Duke University Press',
+    '978-0-8229': 'University of Pittsburgh Press',
+    # --- Group 978-1 (English) ---
+    '978-1-009': 'Cambridge University Press',
+    '978-1-107': 'Cambridge University Press',
+    '978-1-108': 'Cambridge University Press',
+    '978-1-118': 'Wiley',
+    '978-1-119': 'Wiley',
+    '978-1-137': 'Palgrave Macmillan',
+    '978-1-138': 'Routledge',
+    '978-1-250': 'Macmillan',
+    '978-1-316': 'Cambridge University Press',
+    '978-1-4000': 'Random House',
+    '978-1-4008': 'Princeton University Press',
+    '978-1-4039': 'Palgrave Macmillan',
+    '978-1-4088': 'Bloomsbury',
+    '978-1-4129': 'Sage Publications',
+    '978-1-4165': 'Simon & Schuster',
+    '978-1-4214': 'Johns Hopkins University Press',
+    '978-1-4391': 'Simon & Schuster',
+    '978-1-4516': 'Simon & Schuster',
+    '978-1-4696': 'University of North Carolina Press',
+    '978-1-4729': 'Bloomsbury',
+    '978-1-4767': 'Simon & Schuster',
+    '978-1-4773': 'University of Texas Press',
+    '978-1-4780': 'Duke University Press',
+    '978-1-5011': 'Simon & Schuster',
+    '978-1-5017': 'Cornell University Press',
+    '978-1-5416': 'Basic Books',
+    '978-1-59420': 'Penguin Press',
+    '978-1-78168': 'Verso',
+    '978-1-84467': 'Verso',
+    # --- Other groups ---
+    '978-2-02': 'Seuil',
+    '978-2-07': 'Gallimard',
+    '978-2-13': 'Presses Universitaires de France',
+    '978-3-030': 'Springer',
+    '978-3-031': 'Springer',
+    '978-3-11': 'De Gruyter',
+    '978-3-16': 'Mohr Siebeck',
+    '978-3-319': 'Springer',
+    '978-3-518': 'Suhrkamp',
+    '978-3-540': 'Springer',
+    '978-90-04': 'Brill',
+    '978-90-272': 'John Benjamins',
+}
+
+# Registration-group boundaries within the 978 prefix (stable since 2007).
+# Each rule: (low, high, length) over the first 7 digits after the prefix.
+_GROUP_RULES_978: List[Tuple[int, int, int]] = [
+    (0, 5999999, 1),
+    (6000000, 6499999, 3),
+    (6500000, 6599999, 2),
+    (7000000, 7999999, 1),
+    (8000000, 9499999, 2),
+    (9500000, 9899999, 3),
+    (9900000, 9989999, 4),
+    (9990000, 9999999, 5),
+]
+
+# Registrant rules for 978-0, used when RangeMessage.xml is not configured
+_DEFAULT_REGISTRANT_RULES: Dict[str, List[Tuple[int, int, int]]] = {
+    '978-0': [
+        (0, 1999999, 2),
+        (2000000, 6999999, 3),
+        (7000000, 8499999, 4),
+        (8500000, 8999999, 5),
+        (9000000, 9499999, 6),
+        (9500000, 9999999, 7),
+    ],
+}
+
+
+# =============================================================================
+# LOADING
+# =============================================================================
+
+def _digits(prefix: str) -> str:
+    return ''.join(c for c in prefix if c.isdigit())
+
+
+def _load_range_message(path: str) -> Tuple[Dict[str, list], Dict[str, list]]:
+    """Parse RangeMessage.xml into {prefix: [(low, high, length), ...]} dicts."""
+    def rules(node):
+        out = []
+        for rule in node.iter('Rule'):
+            low, high = rule.findtext('Range', '').split('-')
+            out.append((int(low), int(high), int(rule.findtext('Length', '0'))))
+        return out
+
+    root = ET.parse(path).getroot()
+    groups = {p.findtext('Prefix'): rules(p) for p in root.iter('EAN.UCC')}
+    registrants = {g.findtext('Prefix'): rules(g) for g in root.iter('Group')}
+    return groups, registrants
+
+
+def _load_registrants_csv(path: str) -> Dict[str, str]:
+    out = {}
+    with open(path, newline='', encoding='utf-8') as f:
+        for row in csv.reader(f):
+            if len(row) >= 2 and _digits(row[0]):
+                out[row[0].strip()] = row[1].strip()
+    return out
+
+
+_group_rules: Dict[str, list] = {'978': _GROUP_RULES_978}
+_registrant_rules: Dict[str, list] = dict(_DEFAULT_REGISTRANT_RULES)
+_publishers = dict(REGISTRANT_PUBLISHERS)
+
+if ISBN_RANGES_FILE and os.path.exists(ISBN_RANGES_FILE):
+    try:
+        _group_rules, _registrant_rules = _load_range_message(ISBN_RANGES_FILE)
+    except Exception as e:
+        print(f"[ISBNRegistrants] Could not load {ISBN_RANGES_FILE}: {e}")
+
+if ISBN_REGISTRANTS_FILE and os.path.exists(ISBN_REGISTRANTS_FILE):
+    try:
+        _publishers.update(_load_registrants_csv(ISBN_REGISTRANTS_FILE))
+    except Exception as e:
+        print(f"[ISBNRegistrants] Could not load {ISBN_REGISTRANTS_FILE}: {e}")
+
+# Digits-only prefix → publisher, plus the prefix lengths present
+_PREFIX_INDEX: Dict[str, str] = {_digits(k): v for k, v in _publishers.items()}
+_PREFIX_LENGTHS = sorted({len(k) for k in _PREFIX_INDEX}, reverse=True)
+
+
+# =============================================================================
+# LOOKUP
+# =============================================================================
+
+def _rule_length(rules: list, digits: str) -> int:
+    value = int(digits[:7].ljust(7, '0'))
+    for low, high, length in rules:
+        if low <= value <= high:
+            return length
+    return 0
+
+
+def split_isbn(isbn: str) -> Optional[Tuple[str, str, str, str, str]]:
+    """
+    Split an ISBN into (prefix, group, registrant, publication, check).
+
+    Returns None if the ISBN is invalid or its range is not known.
+    """
+    isbn13 = normalize_isbn(isbn)
+    if not isbn13:
+        return None
+
+    prefix, rest = isbn13[:3], isbn13[3:12]
+    group_len = _rule_length(_group_rules.get(prefix, []), rest)
+    if not group_len:
+        return None
+    group = rest[:group_len]
+
+    registrant_len = _rule_length(_registrant_rules.get(f"{prefix}-{group}", []), rest[group_len:])
+    if not registrant_len:
+        return None
+    registrant = rest[group_len:group_len + registrant_len]
+    publication = rest[group_len + registrant_len:]
+    return prefix, group, registrant, publication, isbn13[12]
+
+
+def publisher_for_isbn(isbn: str) -> str:
+    """
+    Resolve the publisher of an ISBN from its registrant prefix.
+
+    Uses the official registrant boundary when the range is known,
+    otherwise the longest matching prefix in the table. Returns '' if
+    the ISBN is invalid or the registrant is not in the table.
+    """
+    parts = split_isbn(isbn)
+    if parts:
+        return _PREFIX_INDEX.get(''.join(parts[:3]), '')
+
+    isbn13 = normalize_isbn(isbn)
+    if not isbn13:
+        return ''
+    for length in _PREFIX_LENGTHS:
+        publisher = _PREFIX_INDEX.get(isbn13[:length])
+        if publisher:
+            return publisher
+    return ''
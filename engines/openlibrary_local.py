@@ -0,0 +1,320 @@
+"""
+citeflex/engines/openlibrary_local.py
+
+Local ISBN / Open Library edition index.
+
+An optional SQLite index built from the Open Library editions dump
+(https://openlibrary.org/developers/dumps). ISBN-10 and ISBN-13 are
+normalized to checksum-valid ISBN-13 keys, so ISBN queries resolve with a
+single primary-key lookup. A title/author FTS5 secondary index lets common
+titles resolve locally too. books.extract_metadata only calls the network
+engines on a local miss.
+
+Build:
+    python -m engines.openlibrary_local build editions.db \\
+        ol_dump_editions.txt.gz [--authors ol_dump_authors.txt.gz]
+
+Then point OPENLIBRARY_LOCAL_DB at editions.db.
+
+Version History:
+    2026-10-18: ISBN checksum helpers moved to identifiers.py
+    2026-10-18: Initial version (ISBN primary index, title/author FTS5 index)
+"""
+
+import os
+import re
+import sys
+import gzip
+import json
+import sqlite3
+import threading
+from typing import Optional, List, Iterator, Tuple
+
+from config import OPENLIBRARY_LOCAL_DB
+from identifiers import normalize_isbn
+
+
+# =============================================================================
+# SETTINGS
+# =============================================================================
+
+# Fraction of the title's content words that must appear in the query
+MIN_TITLE_COVERAGE = 0.75
+
+# Cap on query terms sent to FTS
+MAX_QUERY_TERMS = 24
+
+STOPWORDS = {
+    'the', 'and', 'for', 'with', 'from', 'into', 'that', 'this', 'its',
+    'his', 'her', 'their', 'our', 'des', 'der', 'die', 'das', 'les', 'una',
+    'del', 'von', 'press', 'books', 'edition', 'isbn',
+}
+
+_WORD_RE = re.compile(r'[a-z0-9]+')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS editions (
+    id INTEGER PRIMARY KEY,
+    ol_key TEXT UNIQUE,
+    title TEXT,
+    authors TEXT,
+    publisher TEXT,
+    place TEXT,
+    year TEXT
+);
+CREATE TABLE IF NOT EXISTS isbns (
+    isbn TEXT PRIMARY KEY,
+    edition_id INTEGER
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS author_names (
+    key TEXT PRIMARY KEY,
+    name TEXT
+) WITHOUT ROWID;
+CREATE VIRTUAL TABLE IF NOT EXISTS editions_fts USING fts5(
+    title, authors,
+    content='editions', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2'
+);
+"""
+
+
+def _words(text: str) -> List[str]:
+    return _WORD_RE.findall(text.lower())
+
+
+# =============================================================================
+# INDEX
+# =============================================================================
+
+class OpenLibraryLocalIndex:
+    """
+    Read side of the local edition index.
+
+    Returns book dicts in the same shape as the books.py API classes
+    (type/authors/title/publisher/place/year/isbn/source_engine/raw_source).
+    """
+
+    source_name = "Open Library (Local)"
+
+    def __init__(self, db_path: str = OPENLIBRARY_LOCAL_DB):
+        self.db_path = db_path
+        self._local = threading.local()
+
+    @property
+    def available(self) -> bool:
+        return bool(self.db_path) and os.path.exists(self.db_path)
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        if not self.available:
+            return None
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            try:
+                conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True)
+                self._local.conn = conn
+            except sqlite3.Error as e:
+                print(f"[OpenLibraryLocal] Cannot open index: {e}")
+                return None
+        return conn
+
+    def _to_dict(self, row: tuple, raw_source: str, isbn: str = '') -> dict:
+        title, authors, publisher, place, year = row
+        return {
+            'type': 'book',
+            'authors': json.loads(authors) if authors else [],
+            'title': title,
+            'publisher': publisher,
+            'place': place,
+            'year': year,
+            'isbn': isbn,
+            'source_engine': self.source_name,
+            'raw_source': raw_source,
+        }
+
+    def get_by_isbn(self, isbn: str) -> Optional[dict]:
+        """Exact ISBN lookup. Accepts ISBN-10 or ISBN-13 in any formatting."""
+        key = normalize_isbn(isbn)
+        if not key:
+            return None
+        conn = self._connect()
+        if conn is None:
+            return None
+        try:
+            row = conn.execute(
+                "SELECT e.title, e.authors, e.publisher, e.place, e.year "
+                "FROM isbns i JOIN editions e ON e.id = i.edition_id WHERE i.isbn = ?",
+                (key,)
+            ).fetchone()
+        except sqlite3.Error as e:
+            print(f"[OpenLibraryLocal] Lookup error: {e}")
+            return None
+        if row:
+            return self._to_dict(row, f"ISBN: {key}", key)
+        return None
+
+    def search(self, query: str, limit: int = 3) -> List[dict]:
+        """
+        Title/author lookup via the FTS secondary index.
+
+        Only returns editions whose title is (almost) fully contained in the
+        query, so partial matches fall through to the network engines.
+        Among equally ranked editions, complete records are preferred.
+        """
+        conn = self._connect()
+        if conn is None:
+            return []
+
+        query_words = _words(query)
+        terms = [w for w in dict.fromkeys(query_words) if w not in STOPWORDS][:MAX_QUERY_TERMS]
+        if not terms:
+            return []
+
+        match = " OR ".join(f'"{t}"' for t in terms)
+        try:
+            rows = conn.execute(
+                "SELECT e.title, e.authors, e.publisher, e.place, e.year, "
+                "(SELECT isbn FROM isbns WHERE edition_id = e.id LIMIT 1) "
+                "FROM editions_fts JOIN editions e ON e.id = editions_fts.rowid "
+                "WHERE editions_fts MATCH ? "
+                "ORDER BY bm25(editions_fts, 10.0, 4.0), e.publisher = '', e.year = '' "
+                "LIMIT ?",
+                (match, limit * 8)
+            ).fetchall()
+        except sqlite3.Error as e:
+            print(f"[OpenLibraryLocal] Query error: {e}")
+            return []
+
+        query_set = set(query_words)
+        results = []
+        seen = set()
+        for row in rows:
+            title_words = {w for w in _words(row[0] or '') if len(w) > 2 and w not in STOPWORDS}
+            if not title_words:
+                continue
+            if len(title_words & query_set) / len(title_words) < MIN_TITLE_COVERAGE:
+                continue
+            dedupe_key = (row[0].lower(), row[1])
+            if dedupe_key in seen:
+                continue
+            seen.add(dedupe_key)
+            results.append(self._to_dict(row[:5], query, row[5] or ''))
+            if len(results) >= limit:
+                break
+        return results
+
+
+# =============================================================================
+# INDEX BUILD
+# =============================================================================
+
+def _open(path: str):
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8')
+    return open(path, 'r', encoding='utf-8')
+
+
+def iter_dump_records(path: str) -> Iterator[Tuple[str, dict]]:
+    """Yield (key, record) from an Open Library dump (5-column TSV)."""
+    with _open(path) as f:
+        for line in f:
+            parts = line.rstrip('\n').split('\t')
+            if len(parts) != 5:
+                continue
+            try:
+                yield parts[1], json.loads(parts[4])
+            except ValueError:
+                continue
+
+
+def _edition_row(conn: sqlite3.Connection, key: str, record: dict) -> Optional[tuple]:
+    title = record.get('title')
+    if not title:
+        return None
+    if record.get('subtitle'):
+        title = f"{title}: {record['subtitle']}"
+
+    authors = []
+    author_keys = [a.get('key') for a in record.get('authors', []) if isinstance(a, dict)]
+    for author_key in author_keys:
+        row = conn.execute("SELECT name FROM author_names WHERE key = ?", (author_key,)).fetchone()
+        if row:
+            authors.append(row[0])
+    if not authors and record.get('by_statement'):
+        authors = [record['by_statement'].strip().rstrip('.')]
+
+    publishers = record.get('publishers') or ['']
+    places = record.get('publish_places') or ['']
+    year_match = re.search(r'\d{4}', record.get('publish_date', ''))
+
+    return (
+        key,
+        title,
+        json.dumps(authors, ensure_ascii=False),
+        publishers[0],
+        places[0],
+        year_match.group(0) if year_match else '',
+    )
+
+
+def build_index(db_path: str, editions_path: str, authors_path: str = '',
+                batch_size: int = 5000) -> int:
+    """
+    Build (or extend) a local edition index from Open Library dumps.
+
+    Editions without a valid ISBN are still indexed for title search.
+    Returns the number of editions indexed.
+    """
+    conn = sqlite3.connect(db_path)
+    conn.executescript(SCHEMA)
+
+    if authors_path:
+        batch = []
+        for key, record in iter_dump_records(authors_path):
+            if record.get('name'):
+                batch.append((key, record['name']))
+            if len(batch) >= batch_size:
+                conn.executemany("INSERT OR REPLACE INTO author_names VALUES (?, ?)", batch)
+                batch = []
+        conn.executemany("INSERT OR REPLACE INTO author_names VALUES (?, ?)", batch)
+        conn.commit()
+        print(f"[OpenLibraryLocal] Loaded author names from {authors_path}")
+
+    count = 0
+    for key, record in iter_dump_records(editions_path):
+        row = _edition_row(conn, key, record)
+        if not row:
+            continue
+        cur = conn.execute(
+            "INSERT OR REPLACE INTO editions (ol_key, title, authors, publisher, place, year) "
+            "VALUES (?, ?, ?, ?, ?, ?)", row
+        )
+        edition_id = cur.lastrowid
+        isbns = {normalize_isbn(i) for i in record.get('isbn_13', []) + record.get('isbn_10', [])}
+        conn.executemany(
+            "INSERT OR REPLACE INTO isbns VALUES (?, ?)",
+            [(isbn, edition_id) for isbn in isbns if isbn]
+        )
+        count += 1
+        if count % batch_size == 0:
+            conn.commit()
+            print(f"[OpenLibraryLocal] {count} editions...")
+
+    conn.execute("INSERT INTO editions_fts(editions_fts) VALUES ('rebuild')")
+    conn.execute("INSERT INTO editions_fts(editions_fts) VALUES ('optimize')")
+    conn.commit()
+    conn.close()
+    return count
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    authors_dump = ''
+    if '--authors' in args:
+        i = args.index('--authors')
+        authors_dump = args[i + 1] if i + 1 < len(args) else ''
+        del args[i:i + 2]
+    if len(args) != 3 or args[0] != 'build':
+        print("Usage: python -m engines.openlibrary_local build <index.db> <editions dump> [--authors <authors dump>]")
+        sys.exit(1)
+    total = build_index(args[1], args[2], authors_dump)
+    print(f"[OpenLibraryLocal] Done: {total} editions in {args[1]}")
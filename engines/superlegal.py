@@ -4,6 +4,14 @@ citeflex/engines/superlegal.py
 Unified Legal Citation Engine - Merged from court.py + legal.py
 
 Version History:
+    2026-10-18: CourtListener results keep raw_data only with KEEP_RAW_DATA
+    2026-10-18: CourtListener requests take their timeout from the current request
+                deadline (deadline.py); no further attempts once it has passed
+    2026-10-18: is_legal_citation reads the shared analysis.QueryAnalysis and
+                runs the fuzzy cache match last; _find_best_cache_match is
+                memoized (it runs difflib over every cached case).
+    2026-10-18: Legal URL check uses config.DOMAIN_TRIE (config.LEGAL_DOMAINS)
+                instead of the local KNOWN_LEGAL_DOMAINS substring scan.
     2025-12-06 16:30: Fixed CourtListener search to use extracted case name.
                       Previously, full citation text was passed to API, causing
                       garbage results. Now extracts "Osheroff v. Chestnut Lodge"
@@ -31,12 +39,15 @@ import re
 import difflib
 import requests
 import time
+from functools import lru_cache
 from typing import Optional, List, Dict
 from urllib.parse import urlparse, unquote
 
-from engines.base import SearchEngine
+from engines.base import SearchEngine, keep_raw
 from models import CitationMetadata, CitationType
 from config import COURTLISTENER_API_KEY
+from deadline import request_timeout, deadline_expired
+from analysis import QueryAnalysis, analyze_query
 
 
 # =============================================================================
@@ -234,6 +245,7 @@ def _extract_case_name(text: str) -> str:
     return text  # Fallback to original
 
 
+@lru_cache(maxsize=1024)
 def _find_best_cache_match(text: str) -> Optional[str]:
     """Find the best matching key in FAMOUS_CASES using fuzzy matching."""
     # First, extract just the case name (strips citation details like "388 U.S. 1 (1967)")
@@ -272,58 +284,42 @@ def _extract_query_from_url(url: str) -> str:
 # LEGAL CITATION DETECTION (from court.py)
 # =============================================================================
 
-KNOWN_LEGAL_DOMAINS = [
-    'courtlistener.com', 'oyez.org', 'case.law', 'justia.com',
-    'supremecourt.gov', 'law.cornell.edu', 'findlaw.com'
-]
 
-
-def is_legal_citation(text: str) -> bool:
+def is_legal_citation(text: str, analysis: Optional[QueryAnalysis] = None) -> bool:
     """
     Check if text appears to be a legal citation.
     
     Detects:
     - UK neutral citations: [2024] UKSC 123
-    - Famous cases from cache
     - Legal URLs
     - Case name patterns: X v Y
     - Reporter patterns: Westlaw, Federal Reporter, U.S. Reports, etc.
+    - Famous cases from cache (checked last: fuzzy match is the costly one)
     """
     if not text:
         return False
-    clean = text.strip()
+    a = analysis or analyze_query(text)
     
     # UK neutral citation: [2024] UKSC 123
-    if '[' in clean and ']' in clean and re.search(r'\[\d{4}\]', clean):
-        return True
-    
-    # Check famous cases cache
-    if _find_best_cache_match(clean):
+    if a.bracket_year:
         return True
     
     # Legal URLs
-    if 'http' in clean and any(d in clean for d in KNOWN_LEGAL_DOMAINS):
+    if 'http' in a.text and a.domain('legal'):
         return True
     
     # Case name pattern: X v Y
-    if re.search(r'\s(v|vs|versus)\.?\s', clean, re.IGNORECASE):
+    if a.versus:
         return True
     
-    # Reporter patterns (US case citations)
-    # Westlaw: 2024 WL 123456
-    if re.search(r'\d{4}\s+WL\s+\d+', clean):
-        return True
-    # Federal Reporter: 123 F.2d 456, 123 F.3d 456
-    if re.search(r'\d+\s+F\.\d+[a-z]*\s+\d+', clean):
-        return True
-    # U.S. Reports: 388 U.S. 1
-    if re.search(r'\d+\s+U\.S\.\s+\d+', clean):
-        return True
-    # Atlantic/Pacific reporters: 355 A.2d 647
-    if re.search(r'\d+\s+[A-Z]\.\d+[a-z]*\s+\d+', clean):
+    # Reporter patterns (US case citations): Westlaw (2024 WL 123456),
+    # Federal Reporter (123 F.2d 456), U.S. Reports (388 U.S. 1),
+    # Atlantic/Pacific reporters (355 A.2d 647)
+    if a.strict_reporter:
         return True
     
-    return False
+    # Check famous cases cache
+    return _find_best_cache_match(a.text) is not None
 
 
 # =============================================================================
@@ -533,6 +529,8 @@ class CourtListenerEngine(SearchEngine):
     
     def _api_request(self, original_query: str, search_query: str) -> List[dict]:
         """Make API request to CourtListener."""
+        if deadline_expired():
+            return []
         try:
             params = {
                 'q': search_query,
@@ -544,7 +542,7 @@ class CourtListenerEngine(SearchEngine):
                 self.base_url,
                 params=params,
                 headers=self.headers,
-                timeout=8
+                timeout=request_timeout(8)
             )
             if response.status_code == 200:
                 return response.json().get('results', [])
@@ -584,7 +582,7 @@ class CourtListenerEngine(SearchEngine):
             jurisdiction='US',
             url=url,
             raw_source=query,
-            raw_data=item
+            raw_data=keep_raw(item)
         )
     
     @staticmethod
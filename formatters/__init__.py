@@ -4,7 +4,8 @@ citeflex/formatters/__init__.py
 Citation formatters package.
 """
 
-from formatters.base import BaseFormatter, get_formatter
+from formatters.base import BaseFormatter, get_formatter, expand_styles, format_styles, STYLE_NAMES
+from formatters.templates import TemplateFormatter, Template, Group, Alt, When
 from formatters.chicago import ChicagoFormatter
 from formatters.apa import APAFormatter
 from formatters.mla import MLAFormatter
@@ -13,6 +14,14 @@ from formatters.legal import BluebookFormatter, OSCOLAFormatter
 __all__ = [
     'BaseFormatter',
     'get_formatter',
+    'expand_styles',
+    'format_styles',
+    'STYLE_NAMES',
+    'TemplateFormatter',
+    'Template',
+    'Group',
+    'Alt',
+    'When',
     'ChicagoFormatter',
     'APAFormatter',
     'MLAFormatter',
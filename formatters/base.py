@@ -7,12 +7,42 @@ All style-specific formatters inherit from BaseFormatter.
 FIX APPLIED: Consistent period handling across all formatters.
 All format methods now use _ensure_period() to guarantee consistent
 ending punctuation.
+
+Version History:
+    2026-10-18: format_runs/format_short_runs return structured Runs for the
+                Word writer (runs_from_html parses strings into the same form)
+    2026-10-18: expand_styles/format_styles render one metadata in several styles
+    2026-10-18: get_formatter caches one instance per formatter class
 """
 
+import html
+import re
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Dict, List, Optional, Union
+
+from models import CitationMetadata, CitationType, CitationStyle, Run
+
+# Italic spans of a formatted citation string
+_ITALIC_SPLIT_RE = re.compile(r'(<i>.*?</i>)')
+
 
-from models import CitationMetadata, CitationType, CitationStyle
+def runs_from_html(text: str) -> List[Run]:
+    """
+    Split a formatted citation string into Runs.
+    
+    Entities are unescaped and <i>...</i> spans become italic runs; any
+    other markup stays literal text. This is the fallback for strings;
+    template formatters emit runs directly (format_runs).
+    """
+    runs = []
+    for part in _ITALIC_SPLIT_RE.split(html.unescape(text)):
+        if not part:
+            continue
+        if part.startswith('<i>') and part.endswith('</i>') and len(part) >= 7:
+            runs.append(Run(part[3:-4], italic=True))
+        else:
+            runs.append(Run(part))
+    return runs
 
 
 class BaseFormatter(ABC):
@@ -104,6 +134,19 @@ class BaseFormatter(ABC):
         """
         pass
     
+    def format_runs(self, metadata: CitationMetadata) -> List[Run]:
+        """
+        Format a full citation as Runs (text with italic/link flags).
+        
+        Default: parse format()'s output. Template formatters override
+        this with renderers that build the runs directly.
+        """
+        return runs_from_html(self.format(metadata))
+    
+    def format_short_runs(self, metadata: CitationMetadata) -> List[Run]:
+        """Format a short form citation as Runs."""
+        return runs_from_html(self.format_short(metadata))
+    
     def _format_authors(
         self,
         authors: list,
@@ -174,9 +217,28 @@ class BaseFormatter(ABC):
 # FORMATTER FACTORY
 # =============================================================================
 
+# Style keyword -> formatter class name, first match wins; Chicago otherwise
+STYLE_FORMATTERS = (
+    ('chicago', 'ChicagoFormatter'),
+    ('apa', 'APAFormatter'),
+    ('mla', 'MLAFormatter'),
+    ('bluebook', 'BluebookFormatter'),
+    ('oscola', 'OSCOLAFormatter'),
+)
+
+# Style names as the UI offers them; "all" expands to these
+STYLE_NAMES = ('Chicago Manual of Style', 'APA', 'MLA', 'Bluebook', 'OSCOLA')
+
+# One instance per formatter class (formatters are stateless)
+_FORMATTERS: Dict[str, BaseFormatter] = {}
+
+
 def get_formatter(style: str) -> BaseFormatter:
     """
-    Get a formatter instance for the specified style.
+    Get the formatter for the specified style.
+    
+    Formatters are stateless and compile their templates once, so each
+    class is instantiated on first use and the instance shared after.
     
     Args:
         style: Style name (e.g., "Chicago Manual of Style", "APA", "MLA")
@@ -184,24 +246,54 @@ def get_formatter(style: str) -> BaseFormatter:
     Returns:
         Appropriate formatter instance
     """
-    # Import here to avoid circular imports
-    from formatters.chicago import ChicagoFormatter
-    from formatters.apa import APAFormatter
-    from formatters.mla import MLAFormatter
-    from formatters.legal import BluebookFormatter, OSCOLAFormatter
-    
     style_lower = style.lower().strip()
+    name = next((name for key, name in STYLE_FORMATTERS if key in style_lower), 'ChicagoFormatter')
+    
+    formatter = _FORMATTERS.get(name)
+    if formatter is None:
+        # Import here to avoid circular imports
+        import formatters
+        formatter = _FORMATTERS[name] = getattr(formatters, name)()
+    return formatter
+
+
+def expand_styles(styles: Union[str, List[str]]) -> List[str]:
+    """
+    Normalize a style request to a list of style names.
     
-    if 'chicago' in style_lower:
-        return ChicagoFormatter()
-    elif 'apa' in style_lower:
-        return APAFormatter()
-    elif 'mla' in style_lower:
-        return MLAFormatter()
-    elif 'bluebook' in style_lower:
-        return BluebookFormatter()
-    elif 'oscola' in style_lower:
-        return OSCOLAFormatter()
-    else:
-        # Default to Chicago
-        return ChicagoFormatter()
+    Accepts one style name, a list of names, or "all" (STYLE_NAMES).
+    Duplicates and blanks are dropped; order is kept.
+    """
+    if isinstance(styles, str):
+        styles = [styles]
+    names: List[str] = []
+    for style in styles or []:
+        if not isinstance(style, str) or not style.strip():
+            continue
+        for name in (STYLE_NAMES if style.strip().lower() == 'all' else (style.strip(),)):
+            if name not in names:
+                names.append(name)
+    return names
+
+
+def format_styles(
+    metadata: CitationMetadata,
+    styles: Union[str, List[str]],
+    short: bool = False
+) -> Dict[str, str]:
+    """
+    Render one metadata record in several styles.
+    
+    Args:
+        metadata: Citation metadata (resolved once)
+        styles: Style name, list of names, or "all"
+        short: Short forms instead of full citations
+        
+    Returns:
+        {style name: formatted citation}, in request order
+    """
+    rendered = {}
+    for name in expand_styles(styles):
+        formatter = get_formatter(name)
+        rendered[name] = formatter.format_short(metadata) if short else formatter.format(metadata)
+    return rendered
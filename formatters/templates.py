@@ -0,0 +1,415 @@
+"""
+citeflex/formatters/templates.py
+
+Declarative citation templates, compiled once into render functions.
+
+A style describes each citation type as a Template: segments joined by a
+separator, with the ending normalized by _ensure_period(). Segments are data:
+
+    '"{title},"'                rendered when every field it names is non-empty
+    '{volume} {journal} {pages?}'
+                                a trailing '?' prints the field without requiring it
+    'Interview.'                no fields: always rendered
+    Alt(seg, seg, ...)          the first alternative that renders
+    When('sender recipient', seg)
+                                seg, only when the named fields are non-empty
+    Group(seg, ..., sep, wrap)  the inner segments joined by sep, emitted as
+                                one segment (wrap='({})' etc.) if any rendered
+
+Field names are CitationMetadata attributes, or derived values a formatter
+provides as `_field_<name>(self, m)` methods (author lists, short titles).
+
+TemplateFormatter compiles every template of a style when the class is
+created: each becomes a generated Python function that is a straight run of
+`if` tests and f-strings, the same work the hand-written formatters did,
+with no interpretation per call. The generated code is kept on the function
+(`render.source`) for inspection. Each template also compiles to a runs
+renderer (format_runs) that emits the citation as Runs for the Word
+writer, with italics and URL/DOI links split out at compile time.
+
+Version History:
+    2026-10-18: Behaviour change since the initial version, not noted then: an
+                author list that renders empty (e.g. authors=['']) is an empty
+                field, so no separator is left in front of it. The hand-written
+                formatters gave ' (2020). T. <i>J</i>.' (APA) and ', <i>T</i>.'
+                (Bluebook short); templates give '(2020). T. <i>J</i>.' and
+                '<i>T</i>.'. Output is otherwise the same as theirs.
+    2026-10-18: Runs renderers (format_runs, format_short_runs)
+    2026-10-18: Initial version (Template, Alt, When, Group, TemplateFormatter)
+"""
+
+import html
+import re
+from dataclasses import fields as dataclass_fields
+from string import Formatter
+from typing import Callable, Dict, List, Optional, Tuple
+
+from models import CitationMetadata, CitationType, Run
+from formatters.base import BaseFormatter, runs_from_html
+
+
+# =============================================================================
+# TEMPLATE DATA
+# =============================================================================
+
+class Template:
+    """A sequence of segments joined by sep; wrap must contain '{}'."""
+
+    def __init__(self, *segments, sep: str = ' ', wrap: str = '{}'):
+        if '{}' not in wrap:
+            raise ValueError(f"Template wrap needs a '{{}}' placeholder: {wrap!r}")
+        self.segments = segments
+        self.sep = sep
+        self.wrap = wrap
+
+
+class Group(Template):
+    """Nested Template, emitted as a single segment only if non-empty."""
+
+
+class Alt:
+    """The first of several segments that renders."""
+
+    def __init__(self, *options):
+        self.options = options
+
+
+class When:
+    """A segment rendered only when the named fields are non-empty."""
+
+    def __init__(self, fields: str, segment):
+        self.fields = tuple(fields.split())
+        self.segment = segment
+
+
+# CitationMetadata attributes a template may name (fields and properties)
+METADATA_FIELDS = frozenset(
+    [f.name for f in dataclass_fields(CitationMetadata)]
+    + [name for name, value in vars(CitationMetadata).items() if isinstance(value, property)]
+)
+
+
+# =============================================================================
+# COMPILER
+# =============================================================================
+
+# Italic tags in segment text (runs mode splits segments on them)
+_TAG_RE = re.compile(r'(</?i>)')
+
+# Link targets: a {url} field, or a {doi} field right after this prefix
+_DOI_PREFIX = 'https://doi.org/'
+
+# Field values that become hyperlinks, and the punctuation left outside them
+_URL_RE = re.compile(r'https?://[^\s<>"]+')
+_URL_TRAILING = '.,;:)]\'"'
+
+
+class _Compiler:
+    """
+    Generates the source of one render function.
+
+    In text mode a segment's value is a string expression. In runs mode it
+    is a list of (text, italic, link) pieces, split on <i> tags and URL
+    fields at compile time; join_pieces/finish_runs assemble them.
+    """
+
+    def __init__(self, derived: frozenset, runs: bool = False):
+        self.derived = derived
+        self.runs = runs
+        self.used: List[str] = []
+        self.lines: List[str] = []
+        self.groups = 0
+
+    def ref(self, name: str) -> str:
+        """Python expression for a field."""
+        if name in self.derived:
+            if name not in self.used:
+                self.used.append(name)
+            return f'f_{name}'
+        if name not in METADATA_FIELDS:
+            raise ValueError(f"Unknown template field: {name!r}")
+        return f'm.{name}'
+
+    @staticmethod
+    def string(pieces: List[Tuple[str, Optional[str]]]) -> str:
+        """Expression joining (literal, field expression or None) pieces."""
+        if len(pieces) == 1 and not pieces[0][0] and pieces[0][1]:
+            return pieces[0][1]
+        if not any(expr for _, expr in pieces):
+            return repr(''.join(literal for literal, _ in pieces))
+        source = ''
+        for literal, expr in pieces:
+            source += literal.replace('{', '{{').replace('}', '}}')
+            if expr:
+                source += '{' + expr + '}'
+        return 'f' + repr(source)
+
+    def fields(self, text: str, required: List[str]) -> List[Tuple[str, Optional[str]]]:
+        """(literal, field expression) pieces of segment text; collects required fields."""
+        pieces = []
+        for literal, name, spec, conversion in Formatter().parse(text):
+            if name is None:
+                pieces.append((literal, None))
+                continue
+            if spec or conversion:
+                raise ValueError(f"Template fields take no format spec: {text!r}")
+            expr = self.ref(name.rstrip('?'))
+            if not name.endswith('?') and expr not in required:
+                required.append(expr)
+            pieces.append((literal, expr))
+        return pieces
+
+    def text(self, segment: str) -> Tuple[List[str], str]:
+        """(required field expressions, value expression) of a string segment."""
+        required: List[str] = []
+        if not self.runs:
+            return required, self.string(self.fields(segment, required))
+
+        runs = []
+        italic = False
+        for chunk in _TAG_RE.split(segment):
+            if chunk in ('<i>', '</i>'):
+                if italic == (chunk == '<i>'):
+                    raise ValueError(f"Unbalanced <i> in template segment: {segment!r}")
+                italic = chunk == '<i>'
+                continue
+            text: List[Tuple[str, Optional[str]]] = []
+            for literal, expr in self.fields(chunk, required):
+                if expr == 'm.url' or (expr == 'm.doi' and literal.endswith(_DOI_PREFIX)):
+                    if expr == 'm.doi':
+                        literal = literal[:-len(_DOI_PREFIX)]
+                    if literal:
+                        text.append((literal, None))
+                    if text:
+                        runs.append((self.string(text), italic, False))
+                        text = []
+                    link = 'm.url' if expr == 'm.url' else self.string([(_DOI_PREFIX, 'm.doi')])
+                    runs.append((link, italic, True))
+                else:
+                    text.append((literal, expr))
+            if text and any(literal or expr for literal, expr in text):
+                runs.append((self.string(text), italic, False))
+        if italic:
+            raise ValueError(f"Unbalanced <i> in template segment: {segment!r}")
+        return required, '[' + ', '.join(f'({e}, {i}, {l})' for e, i, l in runs) + ']'
+
+    def condition(self, segment) -> Tuple[List[str], str]:
+        """(required expressions, value expression) of an Alt option."""
+        if isinstance(segment, str):
+            return self.text(segment)
+        if isinstance(segment, When) and isinstance(segment.segment, str):
+            required, expr = self.text(segment.segment)
+            gates = [self.ref(name) for name in segment.fields]
+            return gates + [r for r in required if r not in gates], expr
+        raise TypeError(f"Alt options must be strings or When(fields, string): {segment!r}")
+
+    def emit(self, segment, out: str, depth: int) -> None:
+        pad = '    ' * depth
+        if isinstance(segment, str):
+            required, expr = self.text(segment)
+            if required:
+                self.lines.append(f"{pad}if {' and '.join(required)}:")
+                self.lines.append(f"{pad}    {out}.append({expr})")
+            else:
+                self.lines.append(f"{pad}{out}.append({expr})")
+        elif isinstance(segment, When):
+            self.lines.append(f"{pad}if {' and '.join(self.ref(name) for name in segment.fields)}:")
+            self.emit(segment.segment, out, depth + 1)
+        elif isinstance(segment, Alt):
+            keyword = 'if'
+            for option in segment.options:
+                required, expr = self.condition(option)
+                if not required:
+                    if keyword == 'if':
+                        self.lines.append(f"{pad}{out}.append({expr})")
+                    else:
+                        self.lines.append(f"{pad}else:")
+                        self.lines.append(f"{pad}    {out}.append({expr})")
+                    break
+                self.lines.append(f"{pad}{keyword} {' and '.join(required)}:")
+                self.lines.append(f"{pad}    {out}.append({expr})")
+                keyword = 'elif'
+        elif isinstance(segment, Group):
+            self.groups += 1
+            name = f'group{self.groups}'
+            self.lines.append(f"{pad}{name} = []")
+            for inner in segment.segments:
+                self.emit(inner, name, depth)
+            self.lines.append(f"{pad}if {name}:")
+            self.lines.append(f"{pad}    {out}.append({self.joined(segment, name)})")
+        else:
+            raise TypeError(f"Unknown template segment: {segment!r}")
+
+    def joined(self, template: Template, name: str) -> str:
+        prefix, suffix = template.wrap.split('{}', 1)
+        if self.runs:
+            return f"join_pieces({name}, {template.sep!r}, {prefix!r}, {suffix!r})"
+        expr = f"{template.sep!r}.join({name})"
+        if prefix:
+            expr = f"{prefix!r} + {expr}"
+        if suffix:
+            expr = f"{expr} + {suffix!r}"
+        return expr
+
+
+def join_pieces(segments: list, sep: str, prefix: str = '', suffix: str = '') -> list:
+    """Runs-mode counterpart of prefix + sep.join(segments) + suffix."""
+    pieces = [(prefix, False, False)] if prefix else []
+    for i, segment in enumerate(segments):
+        if i and sep:
+            pieces.append((sep, False, False))
+        pieces.extend(segment)
+    if suffix:
+        pieces.append((suffix, False, False))
+    return pieces
+
+
+def finish_runs(pieces: list) -> List[Run]:
+    """
+    Merge (text, italic, link) pieces into Runs and apply _ensure_period().
+
+    Field values carrying markup or entities (e.g. italics inside a title)
+    go through runs_from_html, as the whole string did before.
+    """
+    runs: List[Run] = []
+    for text, italic, link in pieces:
+        if not text:
+            continue
+        if link:
+            url = html.unescape(text) if '&' in text else text
+            match = _URL_RE.fullmatch(url)
+            if match:
+                # Trailing punctuation stays outside the link (as LinkActivator does)
+                target = url.rstrip(_URL_TRAILING)
+                runs.append(Run(target, italic=italic, underline=True, link=target))
+                text = url[len(target):]
+                if not text:
+                    continue
+        parsed = runs_from_html(text) if ('<' in text or '&' in text) else (Run(text),)
+        for run in parsed:
+            run = run._replace(italic=run.italic or italic)
+            if runs and not runs[-1].link and runs[-1].italic == run.italic:
+                runs[-1] = runs[-1]._replace(text=runs[-1].text + run.text)
+            else:
+                runs.append(run)
+
+    # _ensure_period() on the string: trailing whitespace goes and "." is added
+    # unless it ends in . ? ! (an italic span ends in "</i>", so always gets one)
+    while runs and not runs[-1].italic and not runs[-1].link:
+        text = runs[-1].text.rstrip()
+        if text:
+            runs[-1] = runs[-1]._replace(text=text)
+            break
+        runs.pop()
+    if not runs:
+        return runs
+    last = runs[-1]
+    if last.italic or not last.text.endswith(('.', '?', '!')):
+        if last.italic or last.link:
+            runs.append(Run('.'))
+        else:
+            runs[-1] = last._replace(text=last.text + '.')
+    return runs
+
+
+def compile_template(
+    template: Template,
+    derived=frozenset(),
+    name: str = 'template',
+    runs: bool = False
+) -> Callable:
+    """
+    Compile a Template into render(metadata, formatter).
+
+    The function returns the formatted string, or with runs=True the same
+    citation as a list of Runs. derived names the fields the formatter
+    supplies as _field_<name> methods; any other field must be a
+    CitationMetadata attribute (checked here, once).
+    """
+    compiler = _Compiler(frozenset(derived), runs)
+    for segment in template.segments:
+        compiler.emit(segment, 'parts', 1)
+
+    lines = ["def render(m, fmt):"]
+    lines += [f"    f_{field} = fmt._field_{field}(m)" for field in compiler.used]
+    lines.append("    parts = []")
+    lines += compiler.lines
+    if runs:
+        lines.append(f"    return finish_runs({compiler.joined(template, 'parts')})")
+    else:
+        lines.append(f"    return ensure_period({compiler.joined(template, 'parts')})")
+    source = '\n'.join(lines) + '\n'
+
+    namespace = {
+        'ensure_period': BaseFormatter._ensure_period,
+        'join_pieces': join_pieces,
+        'finish_runs': finish_runs,
+    }
+    exec(compile(source, f'<{name}>', 'exec'), namespace)
+    render = namespace['render']
+    render.source = source
+    return render
+
+
+# =============================================================================
+# TEMPLATE FORMATTER
+# =============================================================================
+
+class TemplateFormatter(BaseFormatter):
+    """
+    Formatter whose citation types are declared as Templates.
+
+    Subclasses set `templates` (full form) and `short_templates`, each a
+    {CitationType: Template} dict in which the key None is the fallback for
+    unlisted types. Both are compiled when the subclass is defined.
+    """
+
+    templates: Dict[Optional[CitationType], Template] = {}
+    short_templates: Dict[Optional[CitationType], Template] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        derived = frozenset(name[len('_field_'):] for name in dir(cls) if name.startswith('_field_'))
+        compiled: Dict[Tuple[int, bool], Callable] = {}
+
+        def compile_all(templates: dict, form: str, runs: bool = False) -> dict:
+            renderers = {}
+            for citation_type, template in templates.items():
+                key = (id(template), runs)
+                if key not in compiled:
+                    label = citation_type.name.lower() if citation_type else 'default'
+                    compiled[key] = compile_template(template, derived, f'{cls.__name__} {form} {label}', runs)
+                renderers[citation_type] = compiled[key]
+            return renderers
+
+        cls._render = compile_all(cls.templates, 'full')
+        cls._render_short = compile_all(cls.short_templates, 'short')
+        cls._render_runs = compile_all(cls.templates, 'full runs', runs=True)
+        cls._render_short_runs = compile_all(cls.short_templates, 'short runs', runs=True)
+
+    def format(self, metadata: CitationMetadata) -> str:
+        render = self._render.get(metadata.citation_type) or self._render[None]
+        return render(metadata, self)
+
+    def format_short(self, metadata: CitationMetadata) -> str:
+        render = self._render_short.get(metadata.citation_type) or self._render_short[None]
+        return render(metadata, self)
+
+    def format_runs(self, metadata: CitationMetadata) -> List[Run]:
+        render = self._render_runs.get(metadata.citation_type) or self._render_runs[None]
+        return render(metadata, self)
+
+    def format_short_runs(self, metadata: CitationMetadata) -> List[Run]:
+        render = self._render_short_runs.get(metadata.citation_type) or self._render_short_runs[None]
+        return render(metadata, self)
+
+    # =========================================================================
+    # DERIVED FIELDS (shared; styles override or add their own)
+    # =========================================================================
+
+    def _field_authors(self, m: CitationMetadata) -> str:
+        return self._format_authors(m.authors)
+
+    def _field_last_name(self, m: CitationMetadata) -> str:
+        """First author's last name."""
+        return self._get_last_name(m.authors[0]) if m.authors else ""
@@ -4,15 +4,32 @@ citeflex/gemini_router.py
 Gemini AI-powered citation type detection for ambiguous inputs.
 
 SECURITY FIX: API key passed in header (x-goog-api-key), not URL.
+
+Version History:
+    2026-10-18: classify_cached_with_gemini - the answer when no model call is needed, else None
+    2026-10-18: Requests take their timeout from the current request deadline (deadline.py)
+    2026-10-18: classify_batch_with_gemini - one model call per AI_BATCH_SIZE notes,
+                answers stored per note in ai_cache for classify_with_gemini
+    2026-10-18: Answers cached in ai_cache (keyed by query, versioned by model/prompt);
+                requests go through one pooled session and a shared router
 """
 
 import re
 import json
 import requests
-from typing import Optional, Tuple
+from typing import Optional, Tuple, List, Dict
+from concurrent.futures import ThreadPoolExecutor
 
 from models import CitationType, CitationMetadata
-from config import GEMINI_API_KEY, GEMINI_MODEL, DEFAULT_TIMEOUT
+from config import GEMINI_API_KEY, GEMINI_MODEL, DEFAULT_TIMEOUT, AI_BATCH_SIZE, AI_BATCH_WORKERS
+from ai_cache import ai_cache, prompt_version, split_batch_response
+from deadline import request_timeout, deadline_expired
+
+# A full batch generates thousands of tokens; allow it more than one call
+BATCH_TIMEOUT = 60  # seconds
+
+# Keep-alive connection pool shared by every GeminiRouter
+_session = requests.Session()
 
 
 class GeminiRouter:
@@ -27,48 +44,117 @@ journal, book, legal, interview, newspaper, government, medical, url, or unknown
 Respond in JSON only:
 {"type": "...", "confidence": 0.0-1.0, "title": "", "authors": [], "year": ""}"""
 
+    BATCH_PROMPT = """Analyze each numbered input independently and classify it as:
+journal, book, legal, interview, newspaper, government, medical, url, or unknown.
+
+Respond in JSON only: an array with one object per input, in input order:
+[{"id": 1, "type": "...", "confidence": 0.0-1.0, "title": "", "authors": [], "year": ""}, ...]"""
+
     def __init__(self, api_key: Optional[str] = None, timeout: int = DEFAULT_TIMEOUT):
         self.api_key = api_key or GEMINI_API_KEY
         self.timeout = timeout
         self.model = GEMINI_MODEL
+        # Batch answers are cached per note under the single-note version
+        self.version = prompt_version(self.model, self.SYSTEM_PROMPT + self.BATCH_PROMPT)
     
-    def classify(self, text: str) -> Tuple[CitationType, Optional[CitationMetadata]]:
+    def classify_cached(self, text: str) -> Optional[Tuple[CitationType, Optional[CitationMetadata]]]:
+        """
+        The answer classify gives without a model call (cached, or UNKNOWN
+        with no API key), or None when classify would call the model.
+        """
+        cached = ai_cache.get(self.version, text)
+        if cached is not None:
+            return self._parse_response(cached, text)
         if not self.api_key:
             return CitationType.UNKNOWN, None
+        return None
+    
+    def classify(self, text: str) -> Tuple[CitationType, Optional[CitationMetadata]]:
+        cached = self.classify_cached(text)
+        if cached is not None:
+            return cached
+        
+        if not self.api_key or deadline_expired():
+            return CitationType.UNKNOWN, None
         
         try:
-            # SECURITY FIX: API key in header, not URL
-            url = f"{self.API_URL}/{self.model}:generateContent"
-            
-            headers = {
-                'Content-Type': 'application/json',
-                'x-goog-api-key': self.api_key,  # Key in header
-            }
-            
-            payload = {
-                'contents': [{'parts': [{'text': f"{self.SYSTEM_PROMPT}\n\nInput:\n{text}"}]}],
-                'generationConfig': {'temperature': 0.1, 'maxOutputTokens': 500}
-            }
-            
-            response = requests.post(url, headers=headers, json=payload, timeout=self.timeout)
-            
-            if response.status_code == 429:
+            response_text = self._generate(f"{self.SYSTEM_PROMPT}\n\nInput:\n{text}", 500, self.timeout)
+            if not response_text:
                 return CitationType.UNKNOWN, None
-            
-            response.raise_for_status()
-            data = response.json()
-            
-            candidates = data.get('candidates', [])
-            if not candidates:
-                return CitationType.UNKNOWN, None
-            
-            response_text = candidates[0].get('content', {}).get('parts', [{}])[0].get('text', '')
+            ai_cache.put(self.version, text, response_text)
             return self._parse_response(response_text, text)
             
         except Exception as e:
             print(f"[GeminiRouter] Error: {e}")
             return CitationType.UNKNOWN, None
     
+    def classify_batch(self, texts: List[str]) -> Dict[str, Tuple[CitationType, Optional[CitationMetadata]]]:
+        """
+        Classify many queries with one model call per AI_BATCH_SIZE of them.
+        Cached queries are not sent; each answer is cached on its own.
+        """
+        results = {}
+        pending = []
+        for text in dict.fromkeys(texts):
+            cached = ai_cache.get(self.version, text)
+            if cached is not None:
+                results[text] = self._parse_response(cached, text)
+            else:
+                pending.append(text)
+        
+        if not pending or not self.api_key:
+            return results
+        
+        chunks = [pending[i:i + AI_BATCH_SIZE] for i in range(0, len(pending), AI_BATCH_SIZE)]
+        print(f"[GeminiRouter] Batch classifying {len(pending)} queries in {len(chunks)} calls")
+        with ThreadPoolExecutor(max_workers=min(len(chunks), AI_BATCH_WORKERS)) as executor:
+            for answers in executor.map(self._classify_chunk, chunks):
+                for text, response_text in answers.items():
+                    ai_cache.put(self.version, text, response_text)
+                    results[text] = self._parse_response(response_text, text)
+        return results
+    
+    def _classify_chunk(self, texts: List[str]) -> Dict[str, str]:
+        numbered = "\n\n".join(f"{i}. {text}" for i, text in enumerate(texts, 1))
+        try:
+            response_text = self._generate(
+                f"{self.BATCH_PROMPT}\n\nInputs:\n{numbered}", 160 * len(texts), BATCH_TIMEOUT
+            )
+        except Exception as e:
+            print(f"[GeminiRouter] Batch error: {e}")
+            return {}
+        
+        return split_batch_response(response_text, texts)
+    
+    def _generate(self, prompt: str, max_tokens: int, timeout: float) -> str:
+        """Text of the first candidate ('' when rate limited or empty)."""
+        # SECURITY FIX: API key in header, not URL
+        url = f"{self.API_URL}/{self.model}:generateContent"
+        
+        headers = {
+            'Content-Type': 'application/json',
+            'x-goog-api-key': self.api_key,  # Key in header
+        }
+        
+        payload = {
+            'contents': [{'parts': [{'text': prompt}]}],
+            'generationConfig': {'temperature': 0.1, 'maxOutputTokens': max_tokens}
+        }
+        
+        response = _session.post(url, headers=headers, json=payload, timeout=request_timeout(timeout))
+        
+        if response.status_code == 429:
+            return ''
+        
+        response.raise_for_status()
+        data = response.json()
+        
+        candidates = data.get('candidates', [])
+        if not candidates:
+            return ''
+        
+        return candidates[0].get('content', {}).get('parts', [{}])[0].get('text', '')
+    
     def _parse_response(self, response_text: str, original: str) -> Tuple[CitationType, Optional[CitationMetadata]]:
         try:
             json_match = re.search(r'\{[\s\S]*\}', response_text)
@@ -105,5 +191,23 @@ Respond in JSON only:
             return CitationType.UNKNOWN, None
 
 
+_router = None
+
+
+def _shared_router() -> GeminiRouter:
+    global _router
+    if _router is None:
+        _router = GeminiRouter()
+    return _router
+
+
 def classify_with_gemini(text: str) -> Tuple[CitationType, Optional[CitationMetadata]]:
-    return GeminiRouter().classify(text)
+    return _shared_router().classify(text)
+
+
+def classify_cached_with_gemini(text: str) -> Optional[Tuple[CitationType, Optional[CitationMetadata]]]:
+    return _shared_router().classify_cached(text)
+
+
+def classify_batch_with_gemini(texts: List[str]) -> Dict[str, Tuple[CitationType, Optional[CitationMetadata]]]:
+    return _shared_router().classify_batch(texts)
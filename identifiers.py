@@ -0,0 +1,242 @@
+"""
+citeflex/identifiers.py
+
+Identifier extraction and validation.
+
+One scan of a note finds every DOI, ISBN-10/13, PMID, PMCID, arXiv ID and
+Westlaw cite in it. Each candidate is validated (ISBN checksums, plausible
+arXiv dates and Westlaw years) and normalized before anything goes to the
+network, so a phone number or docket number never becomes an Open Library
+call, and the router can send a note carrying an identifier straight to
+the matching get_by_id.
+
+Usage:
+    from identifiers import find_identifiers, first_identifier
+
+    for ident in find_identifiers(note):
+        print(ident.kind, ident.value)       # 'doi', '10.1038/nature12373'
+
+    isbn = first_identifier(note, 'isbn')    # normalized ISBN-13 or None
+
+Check the extraction rules against known notes:
+    python -m identifiers
+
+Version History:
+    2026-10-18: Labelled ISBNs stop at 13/10 significant characters; DOI suffixes
+                keep <> (SICI DOIs); CHECKS run with python -m identifiers
+    2026-10-18: Initial version (DOI, ISBN, PMID, PMCID, arXiv, Westlaw in one
+                pass; ISBN checksums moved here from engines/openlibrary_local.py)
+"""
+
+import re
+from typing import List, NamedTuple, Optional, Tuple
+
+from models import normalize_doi
+
+
+class Identifier(NamedTuple):
+    """One validated identifier: kind, normalized value, offset in the text."""
+    kind: str     # 'doi', 'isbn', 'pmid', 'pmcid', 'arxiv', 'westlaw'
+    value: str
+    start: int
+
+
+# Order in which the router tries identifiers when a note has several
+PRIORITY = ('doi', 'pmid', 'pmcid', 'arxiv', 'isbn', 'westlaw')
+
+
+# =============================================================================
+# ISBN NORMALIZATION / CHECKSUMS
+# =============================================================================
+
+def is_valid_isbn10(isbn: str) -> bool:
+    """Check ISBN-10 checksum (weights 10..1, mod 11, X = 10)."""
+    if len(isbn) != 10 or not isbn[:9].isdigit():
+        return False
+    if not (isbn[9].isdigit() or isbn[9] == 'X'):
+        return False
+    total = sum((10 - i) * int(c) for i, c in enumerate(isbn[:9]))
+    total += 10 if isbn[9] == 'X' else int(isbn[9])
+    return total % 11 == 0
+
+
+def is_valid_isbn13(isbn: str) -> bool:
+    """Check ISBN-13 checksum (weights 1,3 alternating, mod 10)."""
+    if len(isbn) != 13 or not isbn.isdigit() or not isbn.startswith(('978', '979')):
+        return False
+    total = sum(int(c) * (3 if i % 2 else 1) for i, c in enumerate(isbn))
+    return total % 10 == 0
+
+
+def isbn10_to_isbn13(isbn10: str) -> str:
+    """Convert a (valid) ISBN-10 to its 978-prefixed ISBN-13."""
+    core = '978' + isbn10[:9]
+    check = (10 - sum(int(c) * (3 if i % 2 else 1) for i, c in enumerate(core)) % 10) % 10
+    return core + str(check)
+
+
+def normalize_isbn(raw: str) -> str:
+    """
+    Normalize an ISBN-10/13 string to a checksum-valid ISBN-13.
+
+    Returns '' when the input is not a valid ISBN (wrong length or checksum).
+    """
+    if not raw:
+        return ''
+    clean = re.sub(r'[^0-9Xx]', '', raw).upper()
+    if len(clean) == 13 and is_valid_isbn13(clean):
+        return clean
+    if len(clean) == 10 and is_valid_isbn10(clean):
+        return isbn10_to_isbn13(clean)
+    return ''
+
+
+# =============================================================================
+# PATTERNS
+# =============================================================================
+
+# One alternation, scanned once. Bare ten-digit runs are NOT ISBN candidates:
+# an ISBN-10 needs an "ISBN" label or the four hyphenated groups it is
+# printed with; an ISBN-13 needs its 978/979 prefix. A labelled ISBN stops
+# at 13 or 10 significant characters, so digits after it ("ISBN 0195335562
+# 12 pp.") are not pulled in. DOI suffixes may contain <> (SICI DOIs).
+_IDENTIFIER_RE = re.compile(r'''
+      (?P<doi>\b10\.\d{4,9}/[^\s"'?#&]+)
+    | \bPMID:?\s*(?P<pmid>\d{1,8})\b
+    | (?:pubmed\.ncbi\.nlm\.nih\.gov/|ncbi\.nlm\.nih\.gov/pubmed/)(?P<pmid_url>\d{1,8})
+    | \b(?P<pmcid>PMC\d{4,9})\b
+    | (?:\barXiv:\s*|arxiv\.org/(?:abs|pdf)/)
+      (?P<arxiv>\d{4}\.\d{4,5}(?:v\d+)?|[a-z-]+(?:\.[A-Z]{2})?/\d{7}(?:v\d+)?)
+    | \b(?P<westlaw>(?:19|20)\d{2}\s+WL\s+\d{3,})\b
+    | \bISBN(?:-1[03])?:?\s*(?P<isbn_label>97[89](?:[-\s]?\d){10}(?![\dX])|(?:\d[-\s]?){9}[\dX](?![\dX]))
+    | (?P<isbn13>\b97[89](?:[-\s]?\d){10}\b)
+    | (?P<isbn10>\b\d{1,5}-\d{1,7}-\d{1,7}-[\dX]\b)
+''', re.VERBOSE | re.IGNORECASE)
+
+# A digit is needed by every identifier; most notes can skip the scan
+_DIGIT_RE = re.compile(r'\d')
+
+_ARXIV_NEW_RE = re.compile(r'(\d{2})(\d{2})\.')
+_TRAILING_PUNCT = '.,;:'
+_CLOSING = {')': '(', ']': '[', '>': '<'}
+
+
+# =============================================================================
+# VALIDATION
+# =============================================================================
+
+def _clean_doi(raw: str) -> str:
+    """Strip a closing markup tag, sentence punctuation and unbalanced closing brackets."""
+    doi = raw.split('</', 1)[0].rstrip(_TRAILING_PUNCT)
+    while doi and doi[-1] in _CLOSING and doi.count(doi[-1]) > doi.count(_CLOSING[doi[-1]]):
+        doi = doi[:-1].rstrip(_TRAILING_PUNCT)
+    _, _, suffix = doi.partition('/')
+    return normalize_doi(doi) if suffix else ''
+
+
+def _valid_arxiv(value: str) -> bool:
+    """New-style IDs must start with a real YYMM (April 2007 onwards)."""
+    match = _ARXIV_NEW_RE.match(value)
+    if not match:
+        return True  # old style (archive/YYMMNNN): shape checked by the pattern
+    year, month = int(match.group(1)), int(match.group(2))
+    return 1 <= month <= 12 and (year, month) >= (7, 4)
+
+
+def _validate(kind: str, raw: str) -> str:
+    """Normalized value, or '' when the candidate is not a valid identifier."""
+    if kind == 'doi':
+        return _clean_doi(raw)
+    if kind == 'isbn_label':
+        # A 978/979 run that fails as an ISBN-13 may be an ISBN-10 plus digits
+        isbn = normalize_isbn(raw)
+        digits = re.sub(r'[-\s]', '', raw)
+        return isbn or (normalize_isbn(digits[:10]) if len(digits) == 13 else '')
+    if kind in ('isbn13', 'isbn10'):
+        return normalize_isbn(raw)
+    if kind in ('pmid', 'pmid_url'):
+        return raw.lstrip('0')
+    if kind == 'pmcid':
+        return raw.upper()
+    if kind == 'arxiv':
+        value = re.sub(r'v\d+$', '', raw)
+        return value if _valid_arxiv(value) else ''
+    if kind == 'westlaw':
+        return ' '.join(raw.upper().split())
+    return ''
+
+
+_KIND = {'pmid_url': 'pmid', 'isbn_label': 'isbn', 'isbn13': 'isbn', 'isbn10': 'isbn'}
+
+
+# =============================================================================
+# PUBLIC API
+# =============================================================================
+
+def find_identifiers(text: str) -> Tuple[Identifier, ...]:
+    """Every valid identifier in text, in order of appearance (duplicates dropped)."""
+    if not text or not _DIGIT_RE.search(text):
+        return ()
+    found = []
+    seen = set()
+    for match in _IDENTIFIER_RE.finditer(text):
+        group = match.lastgroup
+        value = _validate(group, match.group(group))
+        kind = _KIND.get(group, group)
+        if value and (kind, value) not in seen:
+            seen.add((kind, value))
+            found.append(Identifier(kind, value, match.start(group)))
+    return tuple(found)
+
+
+def first_identifier(text: str, kind: str) -> Optional[str]:
+    """Value of the first identifier of kind in text, or None."""
+    for ident in find_identifiers(text):
+        if ident.kind == kind:
+            return ident.value
+    return None
+
+
+def by_priority(identifiers: Tuple[Identifier, ...]) -> List[Identifier]:
+    """identifiers ordered by PRIORITY (then by position)."""
+    return sorted(identifiers, key=lambda i: (PRIORITY.index(i.kind), i.start))
+
+
+# =============================================================================
+# CHECKS
+# =============================================================================
+
+# (note, identifiers expected in it as (kind, value))
+CHECKS = (
+    ('ISBN 978-0-19-953556-9', (('isbn', '9780199535569'),)),
+    ('ISBN 0195335562 12 pp.', (('isbn', '9780195335569'),)),
+    ('ISBN 0-8044-2957-X 1999 printing', (('isbn', '9780804429573'),)),
+    ('ISBN 080442957X 23', (('isbn', '9780804429573'),)),
+    ('ISBN 9780195335569 12', (('isbn', '9780195335569'),)),
+    ('Call 555-123-4567 or 0195335561', ()),
+    ('Nature 500, 10.1038/nature12373.', (('doi', '10.1038/nature12373'),)),
+    ('(doi:10.1038/nature12373)', (('doi', '10.1038/nature12373'),)),
+    ('<doi>10.1038/nature12373</doi>', (('doi', '10.1038/nature12373'),)),
+    ('10.1002/(SICI)1097-4571(199806)49:8<693::AID-ASI4>3.0.CO;2-O.',
+     (('doi', '10.1002/(sici)1097-4571(199806)49:8<693::aid-asi4>3.0.co;2-o'),)),
+    ('PMID: 23903748; PMC3776390', (('pmid', '23903748'), ('pmcid', 'PMC3776390'))),
+    ('arXiv:1706.03762v5', (('arxiv', '1706.03762'),)),
+    ('arXiv:0613.01234', ()),
+    ('2019 WL 1234567 (S.D.N.Y.)', (('westlaw', '2019 WL 1234567'),)),
+)
+
+
+def main() -> None:
+    failed = 0
+    for note, expected in CHECKS:
+        found = tuple((i.kind, i.value) for i in find_identifiers(note))
+        if found != expected:
+            failed += 1
+            print(f"FAIL {note!r}: expected {expected}, found {found}")
+    print(f"{len(CHECKS) - failed}/{len(CHECKS)} identifier checks passed")
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,342 @@
+"""
+citeflex/local_classifier.py
+
+Local citation-type classifier for queries the detectors leave UNKNOWN.
+
+A multinomial naive Bayes model over character n-grams, words and the
+QueryAnalysis flags (quotes, years, "v.", keyword and domain hits). It is
+trained on the answers the AI routers have already given - the ai_cache
+database is the log of every Claude/Gemini classification - and answers in
+well under a millisecond. The router only asks Claude/Gemini when the
+model is less than LOCAL_CLASSIFIER_THRESHOLD sure (or no weights file
+is present).
+
+Overlapping n-grams are far from independent, so raw naive Bayes
+posteriors are close to 1.0 for nearly any query. predict() averages the
+per-feature log likelihoods and scales them by a sharpness fitted on
+held-out queries (minimum log loss), so the confidence it reports is a
+usable probability for the threshold.
+
+Train (and report held-out accuracy / coverage at the threshold):
+    python -m local_classifier train citation_classifier.json.gz \\
+        --cache /tmp/citeflex_ai_cache.db --jsonl extra_labels.jsonl --holdout 0.1
+
+--jsonl files hold {"query": "...", "type": "book"} lines. Point
+LOCAL_CLASSIFIER_FILE at the output (default: citation_classifier.json.gz
+next to config.py).
+
+Version History:
+    2026-10-18: Calibrated confidence: length-normalized log likelihoods scaled by a
+                sharpness fitted on a held-out split and stored in the weights file
+    2026-10-18: Initial version (naive Bayes, gzip JSON weights, training CLI)
+"""
+
+import os
+import re
+import sys
+import gzip
+import json
+import math
+import random
+import sqlite3
+import threading
+from typing import Dict, List, Optional, Tuple, Iterator
+
+from models import CitationType
+from analysis import QueryAnalysis, analyze_query
+from config import LOCAL_CLASSIFIER_FILE, LOCAL_CLASSIFIER_THRESHOLD
+
+
+# =============================================================================
+# FEATURES
+# =============================================================================
+
+NGRAM_SIZES = (3, 4)
+
+# Longer notes add nothing but cost
+MAX_CHARS = 300
+
+# Boolean QueryAnalysis fields used as features
+FLAG_FIELDS = (
+    'is_url', 'has_doi', 'bracket_year', 'versus', 'case_name', 'case_prefix',
+    'version_marker', 'reporter', 'federal_register', 'gov_tld',
+    'double_quoted', 'single_quoted', 'italics', 'pub_parenthetical',
+)
+
+# Classes the model may answer (what the AI routers answer, minus unknown)
+CLASSES = (
+    CitationType.JOURNAL, CitationType.BOOK, CitationType.LEGAL,
+    CitationType.NEWSPAPER, CitationType.GOVERNMENT, CitationType.MEDICAL,
+    CitationType.INTERVIEW, CitationType.URL,
+)
+_CLASS_BY_NAME = {t.name.lower(): t for t in CLASSES}
+
+# Sharpness values tried when calibrating, and the one used by weights files
+# written before calibration existed
+SHARPNESS_GRID = tuple(round(0.5 * 1.25 ** i, 3) for i in range(30))
+DEFAULT_SHARPNESS = 4.0
+
+# Share of the labelled queries held out for calibration when --holdout is not given
+CALIBRATION_SPLIT = 0.1
+
+_DIGITS_RE = re.compile(r'\d')
+_SPACE_RE = re.compile(r'\s+')
+_WORD_RE = re.compile(r'[a-z0]{2,}')
+
+
+def features(analysis: QueryAnalysis) -> List[str]:
+    """Feature strings of one query (digits folded to 0, so years and pages generalize)."""
+    text = ' ' + _SPACE_RE.sub(' ', _DIGITS_RE.sub('0', analysis.lower[:MAX_CHARS])) + ' '
+    feats = [text[i:i + n] for n in NGRAM_SIZES for i in range(len(text) - n + 1)]
+    feats.extend('w:' + w for w in _WORD_RE.findall(text))
+    feats.extend('f:' + name for name in FLAG_FIELDS if getattr(analysis, name))
+    if analysis.isbns:
+        feats.append('f:isbn')
+    if analysis.paren_years:
+        feats.append('f:paren_year')
+    feats.extend('k:' + category for category in analysis.keywords)
+    feats.extend('d:' + category for category in analysis.domains)
+    return feats
+
+
+# =============================================================================
+# MODEL
+# =============================================================================
+
+class LocalClassifier:
+    """
+    Naive Bayes over features(); weights loaded lazily from a gzip JSON file.
+
+    When the file is not configured or missing, classify() always returns
+    UNKNOWN and callers go straight to the AI routers.
+    """
+
+    def __init__(self, path: str = LOCAL_CLASSIFIER_FILE, threshold: float = LOCAL_CLASSIFIER_THRESHOLD):
+        self.path = path
+        self.threshold = threshold
+        self._classes: Tuple[CitationType, ...] = ()
+        self._priors: List[float] = []
+        self._weights: Dict[str, Tuple[float, ...]] = {}
+        self._sharpness = DEFAULT_SHARPNESS
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    @property
+    def available(self) -> bool:
+        self._load()
+        return bool(self._weights)
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            if self.path and os.path.exists(self.path):
+                try:
+                    with gzip.open(self.path, 'rt', encoding='utf-8') as f:
+                        self._set_counts(json.load(f))
+                    print(f"[LocalClassifier] Loaded {len(self._weights):,} features from {self.path}")
+                except (OSError, ValueError, KeyError) as e:
+                    print(f"[LocalClassifier] Cannot load {self.path}: {e}")
+            self._loaded = True
+
+    def _set_counts(self, data: dict) -> None:
+        """Turn stored counts into log priors and per-feature log likelihoods."""
+        classes = tuple(_CLASS_BY_NAME[name] for name in data['classes'])
+        alpha = data['alpha']
+        vocab = len(data['counts'])
+        docs = data['docs']
+        totals = [0] * len(classes)
+        for counts in data['counts'].values():
+            totals = [t + c for t, c in zip(totals, counts)]
+
+        denominators = [t + alpha * vocab for t in totals]
+        self._classes = classes
+        self._sharpness = data.get('sharpness', DEFAULT_SHARPNESS)
+        self._priors = [math.log(d / sum(docs)) for d in docs]
+        self._weights = {
+            feat: tuple(math.log((c + alpha) / d) for c, d in zip(counts, denominators))
+            for feat, counts in data['counts'].items()
+        }
+
+    def predict(self, query: str, analysis: Optional[QueryAnalysis] = None) -> Tuple[CitationType, float]:
+        """Most likely type and its calibrated probability ((UNKNOWN, 0.0) without weights)."""
+        self._load()
+        if not self._weights:
+            return CitationType.UNKNOWN, 0.0
+        
+        scores = self._scores(self._evidence(query, analysis), self._sharpness)
+        best = max(range(len(scores)), key=scores.__getitem__)
+        top = scores[best]
+        confidence = 1.0 / sum(math.exp(s - top) for s in scores)
+        return self._classes[best], confidence
+    
+    def _evidence(self, query: str, analysis: Optional[QueryAnalysis] = None) -> Optional[List[float]]:
+        """Mean log likelihood of the query's known features per class (None if none are known)."""
+        get = self._weights.get
+        known = [w for w in map(get, features(analysis or analyze_query(query))) if w is not None]
+        if not known:
+            return None
+        return [sum(column) / len(known) for column in zip(*known)]
+    
+    def _scores(self, evidence: Optional[List[float]], sharpness: float) -> List[float]:
+        if evidence is None:
+            return self._priors
+        return [p + sharpness * e for p, e in zip(self._priors, evidence)]
+    
+    def classify(self, query: str, analysis: Optional[QueryAnalysis] = None) -> CitationType:
+        """The predicted type if at least threshold sure, else UNKNOWN."""
+        citation_type, confidence = self.predict(query, analysis)
+        if confidence < self.threshold:
+            return CitationType.UNKNOWN
+        return citation_type
+
+
+# Shared instance used by unified_router
+local_classifier = LocalClassifier()
+
+
+# =============================================================================
+# TRAINING
+# =============================================================================
+
+def _type_from_answer(response: str) -> Optional[str]:
+    """Class name from a cached AI router answer (None for unknown/unparseable)."""
+    json_match = re.search(r'\{[\s\S]*\}', response)
+    if not json_match:
+        return None
+    try:
+        name = str(json.loads(json_match.group()).get('type', '')).lower()
+    except (ValueError, AttributeError):
+        return None
+    return name if name in _CLASS_BY_NAME else None
+
+
+def iter_cache_examples(db_path: str) -> Iterator[Tuple[str, str]]:
+    """(query, type) from the AI answer cache (see ai_cache.py)."""
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        for query, response in conn.execute("SELECT query, response FROM answers ORDER BY created"):
+            name = _type_from_answer(response)
+            if name:
+                yield query, name
+    finally:
+        conn.close()
+
+
+def iter_jsonl_examples(path: str) -> Iterator[Tuple[str, str]]:
+    """(query, type) from {"query": ..., "type": ...} lines."""
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rt', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            name = str(record.get('type', '')).lower()
+            if record.get('query') and name in _CLASS_BY_NAME:
+                yield record['query'], name
+
+
+def fit_sharpness(model: LocalClassifier, examples: List[Tuple[str, str]]) -> float:
+    """The SHARPNESS_GRID value with the lowest log loss on examples (held out from model's training)."""
+    index = {t: i for i, t in enumerate(model._classes)}
+    rows = [
+        (index[_CLASS_BY_NAME[name]], model._evidence(query))
+        for query, name in examples
+        if _CLASS_BY_NAME[name] in index
+    ]
+    
+    def log_loss(sharpness):
+        total = 0.0
+        for label, evidence in rows:
+            scores = model._scores(evidence, sharpness)
+            top = max(scores)
+            total += top + math.log(sum(math.exp(s - top) for s in scores)) - scores[label]
+        return total
+    
+    return min(SHARPNESS_GRID, key=log_loss) if rows else DEFAULT_SHARPNESS
+
+
+def train(examples: List[Tuple[str, str]], alpha: float = 0.5, min_count: int = 2) -> dict:
+    """
+    Count features per class. Features seen fewer than min_count times are
+    dropped, which keeps the weights file small without hurting accuracy.
+    """
+    classes = sorted({name for _, name in examples})
+    index = {name: i for i, name in enumerate(classes)}
+    docs = [0] * len(classes)
+    counts: Dict[str, List[int]] = {}
+    for query, name in examples:
+        i = index[name]
+        docs[i] += 1
+        for feat in features(analyze_query(query)):
+            row = counts.get(feat)
+            if row is None:
+                row = counts[feat] = [0] * len(classes)
+            row[i] += 1
+    counts = {feat: row for feat, row in counts.items() if sum(row) >= min_count}
+    return {'classes': classes, 'alpha': alpha, 'docs': docs, 'counts': counts}
+
+
+def main(argv: List[str]) -> None:
+    if len(argv) < 2 or argv[0] != 'train':
+        print(__doc__)
+        sys.exit(1)
+
+    out_path = argv[1]
+    examples: Dict[str, str] = {}
+    holdout = 0.0
+    args = iter(argv[2:])
+    for arg in args:
+        if arg == '--cache':
+            examples.update(iter_cache_examples(next(args)))
+        elif arg == '--jsonl':
+            examples.update(iter_jsonl_examples(next(args)))
+        elif arg == '--holdout':
+            holdout = float(next(args))
+        else:
+            print(f"Unknown argument: {arg}")
+            sys.exit(1)
+
+    labelled = sorted(examples.items())
+    if not labelled:
+        print("No labelled examples found")
+        sys.exit(1)
+    print(f"{len(labelled):,} labelled queries")
+
+    # Fit the sharpness on held-out queries; with --holdout, on one half of
+    # them, and report accuracy on the other half
+    random.Random(0).shuffle(labelled)
+    cut = int(len(labelled) * (1 - (holdout or CALIBRATION_SPLIT)))
+    model = LocalClassifier(path='', threshold=LOCAL_CLASSIFIER_THRESHOLD)
+    model._set_counts(train(labelled[:cut]))
+    model._loaded = True
+    held_out = labelled[cut:]
+    calibration, test = (held_out[::2], held_out[1::2]) if holdout else (held_out, [])
+    sharpness = fit_sharpness(model, calibration)
+    model._sharpness = sharpness
+    print(f"Sharpness {sharpness:g} (fitted on {len(calibration):,} held-out queries)")
+
+    if test:
+        correct = answered = answered_correct = 0
+        for query, name in test:
+            predicted, confidence = model.predict(query)
+            hit = predicted.name.lower() == name
+            correct += hit
+            if confidence >= model.threshold:
+                answered += 1
+                answered_correct += hit
+        print(f"Held out {len(test):,}: accuracy {correct / max(len(test), 1):.1%}; "
+              f"at threshold {model.threshold} answers {answered / max(len(test), 1):.1%} "
+              f"with accuracy {answered_correct / max(answered, 1):.1%}")
+
+    data = train(labelled)
+    data['sharpness'] = sharpness
+    with gzip.open(out_path, 'wt', encoding='utf-8') as f:
+        json.dump(data, f, separators=(',', ':'))
+    print(f"Wrote {len(data['counts']):,} features to {out_path} ({os.path.getsize(out_path):,} bytes)")
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,213 @@
+"""
+citeflex/matching.py
+
+Multi-pattern matching structures shared across modules.
+
+- PhraseMatcher: Aho–Corasick automaton over a fixed phrase vocabulary.
+  One pass over the input finds every registered phrase, so lookup cost
+  depends on the input length, not on how many phrases are registered.
+- DomainTrie: reversed-label trie over registered domains with category
+  tags. Answers "most specific registered domain for this host" in
+  O(labels), independent of how many domains are registered.
+
+Version History:
+    2026-10-18: PhraseMatcher: trailing '*' registers a word-prefix phrase
+    2026-10-18: Added DomainTrie and iter_hosts
+    2026-10-18: Initial version (PhraseMatcher for publisher → place lookup)
+"""
+
+import re
+from collections import deque
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+class PhraseMatcher:
+    """
+    Case-insensitive Aho–Corasick automaton mapping phrases to values.
+
+    Matches respect word boundaries: a phrase that starts/ends with a
+    letter or digit only matches where the input has no adjacent letter
+    or digit (so 'Beck' does not match inside 'Becker'). A trailing '*'
+    lifts the right boundary, so the phrase also matches as a word
+    prefix ('trial*' matches 'trials' but not 'industrial').
+
+    Usage:
+        matcher = PhraseMatcher({'MIT Press': 'Cambridge, MA', ...})
+        matcher.longest("The MIT Press, 2019")  # -> 'Cambridge, MA'
+    """
+
+    def __init__(self, phrases: Optional[Dict[str, Any]] = None):
+        # Trie as parallel lists indexed by state id (0 = root)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # Per state: (phrase_length, priority, value, is_prefix) for phrases ending here
+        self._out: List[List[Tuple[int, int, Any, bool]]] = [[]]
+        self._count = 0
+        self._built = False
+        for phrase, value in (phrases or {}).items():
+            self.add(phrase, value)
+        self.build()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def add(self, phrase: str, value: Any) -> None:
+        """Register a phrase. Earlier phrases win ties of equal length."""
+        phrase = phrase.lower()
+        is_prefix = phrase.endswith('*')
+        if is_prefix:
+            phrase = phrase[:-1]
+        if not phrase:
+            return
+        state = 0
+        for ch in phrase:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        if not any(entry[0] == len(phrase) for entry in self._out[state]):
+            self._out[state].append((len(phrase), self._count, value, is_prefix))
+            self._count += 1
+        self._built = False
+
+    def build(self) -> None:
+        """Compute failure links (breadth-first) and merge outputs."""
+        queue = deque()
+        for nxt in self._goto[0].values():
+            self._fail[nxt] = 0
+            queue.append(nxt)
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+        self._built = True
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, int, Any]]:
+        """Yield (start, end, priority, value) for every phrase occurrence."""
+        if not self._built:
+            self.build()
+        lowered = text.lower()
+        n = len(lowered)
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for i, ch in enumerate(lowered):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if not out[state]:
+                continue
+            end = i + 1
+            for length, priority, value, is_prefix in out[state]:
+                start = end - length
+                if lowered[start].isalnum() and start > 0 and lowered[start - 1].isalnum():
+                    continue
+                if not is_prefix and ch.isalnum() and end < n and lowered[end].isalnum():
+                    continue
+                yield start, end, priority, value
+
+    def longest(self, text: str, default: Any = None) -> Any:
+        """Value of the longest matching phrase (earliest registered on ties)."""
+        best = None
+        for start, end, priority, value in self.iter_matches(text):
+            key = (end - start, -priority)
+            if best is None or key > best[0]:
+                best = (key, value)
+        return best[1] if best else default
+
+
+# =============================================================================
+# DOMAIN TRIE
+# =============================================================================
+
+# Host-like tokens inside free text ("see nimh.nih.gov/health", URLs, etc.)
+_HOST_RE = re.compile(
+    r'(?:^|[\s/@(\[<"\'])((?:[a-z0-9](?:[a-z0-9-]*[a-z0-9])?\.)+[a-z]{2,})(?![a-z0-9-])',
+    re.IGNORECASE
+)
+
+
+def iter_hosts(text: str) -> Iterator[str]:
+    """Yield every host-like token in text, lowercased."""
+    for match in _HOST_RE.finditer(text):
+        yield match.group(1).lower()
+
+
+class DomainTrie:
+    """
+    Reversed-label trie mapping registered domains to tagged values.
+
+    'nimh.nih.gov' is stored as gov → nih → nimh, so a lookup walks the
+    host's labels right to left and the deepest node carrying the
+    requested category is the most specific registered domain. Matches
+    are on label boundaries ('vox.com' does not match 'xvox.com').
+
+    Usage:
+        trie = DomainTrie()
+        trie.add('nih.gov', 'gov', 'National Institutes of Health')
+        trie.add('nimh.nih.gov', 'gov', 'National Institute of Mental Health')
+        trie.match('www.nimh.nih.gov', 'gov')
+        # -> ('nimh.nih.gov', 'National Institute of Mental Health')
+    """
+
+    def __init__(self):
+        # Node: (children by label, {category: value})
+        self._root: Tuple[Dict[str, tuple], Dict[str, Any]] = ({}, {})
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    @staticmethod
+    def _labels(host: str) -> List[str]:
+        host = host.lower().strip().rstrip('.')
+        if '://' in host:
+            host = host.split('://', 1)[1]
+        host = host.split('/', 1)[0].split(':', 1)[0].split('@')[-1]
+        return host.split('.')[::-1]
+
+    def add(self, domain: str, category: str, value: Any = True) -> None:
+        node = self._root
+        for label in self._labels(domain):
+            node = node[0].setdefault(label, ({}, {}))
+        if category not in node[1]:
+            self._count += 1
+        node[1][category] = value
+
+    def iter_matches(self, host: str) -> Iterator[Tuple[str, str, Any]]:
+        """Yield (domain, category, value), most specific domain first."""
+        labels = self._labels(host)
+        node = self._root
+        path = []
+        for label in labels:
+            node = node[0].get(label)
+            if node is None:
+                break
+            path.append(node)
+        for depth in range(len(path), 0, -1):
+            domain = '.'.join(reversed(labels[:depth]))
+            for category, value in path[depth - 1][1].items():
+                yield domain, category, value
+
+    def match(self, host: str, category: str) -> Optional[Tuple[str, Any]]:
+        """Most specific registered (domain, value) for host in category."""
+        for domain, cat, value in self.iter_matches(host):
+            if cat == category:
+                return domain, value
+        return None
+
+    def categories(self, host: str) -> Dict[str, Tuple[str, Any]]:
+        """Most specific (domain, value) per category for host."""
+        out: Dict[str, Tuple[str, Any]] = {}
+        for domain, cat, value in self.iter_matches(host):
+            out.setdefault(cat, (domain, value))
+        return out
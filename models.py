@@ -3,10 +3,16 @@ citeflex/models.py
 
 Core data models for the citation system.
 All modules communicate through these standardized structures.
+
+Version History:
+    2026-10-18: CitationMetadata is slotted and interns shared strings;
+                to_dict leaves out empty fields unless full=True
 """
 
-from dataclasses import dataclass, field
-from typing import Optional, List, Dict, Any
+import sys
+from operator import attrgetter
+from dataclasses import MISSING, dataclass, field, fields
+from typing import Optional, List, Dict, Any, NamedTuple
 from enum import Enum, auto
 
 
@@ -93,7 +99,7 @@ def normalize_doi(doi: str) -> str:
     return doi.lower().strip()
 
 
-@dataclass
+@dataclass(slots=True)
 class CitationMetadata:
     """
     Universal citation metadata container.
@@ -105,6 +111,10 @@ class CitationMetadata:
     - Formatters consume this to produce citation strings
     
     All fields are optional because different source types use different subsets.
+    
+    Slotted, and the strings many results share (journal, publisher, court,
+    engine name...) are interned on construction, so a document's worth of
+    results costs one copy of each.
     """
     
     # Core identification
@@ -193,98 +203,67 @@ class CitationMetadata:
         else:  # JOURNAL, BOOK, MEDICAL
             return bool(self.title)
     
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary (for backward compatibility)."""
+    def __post_init__(self):
+        for name in _INTERNED_FIELDS:
+            value = getattr(self, name)
+            if type(value) is str:
+                setattr(self, name, sys.intern(value))
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        # Only fields that differ from their defaults; __init__ fills in the rest
         return {
-            'type': self.citation_type.name.lower(),
-            'raw_source': self.raw_source,
-            'source_engine': self.source_engine,
-            'title': self.title,
-            'authors': self.authors,
-            'year': self.year,
-            'url': self.url,
-            'doi': self.doi,
-            'journal': self.journal,
-            'volume': self.volume,
-            'issue': self.issue,
-            'pages': self.pages,
-            'pmid': self.pmid,
-            'publisher': self.publisher,
-            'place': self.place,
-            'edition': self.edition,
-            'isbn': self.isbn,
-            'case_name': self.case_name,
-            'citation': self.citation,
-            'court': self.court,
-            'jurisdiction': self.jurisdiction,
-            'neutral_citation': self.neutral_citation,
-            'interviewee': self.interviewee,
-            'interviewer': self.interviewer,
-            'location': self.location,
-            'date': self.date,
-            'sender': self.sender,
-            'recipient': self.recipient,
-            'newspaper': self.newspaper,
-            'agency': self.agency,
-            'document_number': self.document_number,
-            'access_date': self.access_date,
-            'confidence': self.confidence,
-            'raw_data': self.raw_data,
+            name: value
+            for name, value, default in zip(_FIELD_NAMES, _get_fields(self), _FIELD_DEFAULTS)
+            if value != default
         }
     
+    def __setstate__(self, state):
+        # Pre-slots pickles (saved sessions) carry the full __dict__
+        if isinstance(state, tuple):
+            state = {**(state[0] or {}), **state[1]}
+        self.__init__(**state)
+    
+    def to_dict(self, full: bool = False) -> Dict[str, Any]:
+        """
+        Convert to dictionary. Empty fields are left out unless full is set
+        ('type' and 'confidence' are always present).
+        """
+        d = {'type': self.citation_type.name.lower()}
+        for name, value in zip(_DICT_FIELDS, _get_dict_fields(self)):
+            if value or full:
+                d[name] = value
+        d['confidence'] = self.confidence  # kept even when 0.0
+        return d
+    
     @classmethod
     def from_dict(cls, d: Dict[str, Any]) -> "CitationMetadata":
         """Create from dictionary (for backward compatibility with old system)."""
-        type_map = {
-            'journal': CitationType.JOURNAL,
-            'book': CitationType.BOOK,
-            'legal': CitationType.LEGAL,
-            'interview': CitationType.INTERVIEW,
-            'letter': CitationType.LETTER,
-            'newspaper': CitationType.NEWSPAPER,
-            'government': CitationType.GOVERNMENT,
-            'medical': CitationType.MEDICAL,
-            'url': CitationType.URL,
-        }
-        
+        kwargs = {name: d[name] for name in _DICT_FIELDS if d.get(name) is not None}
+        if 'agency' not in kwargs and d.get('author'):
+            kwargs['agency'] = d['author']  # Gov docs use 'author' for agency
         return cls(
-            citation_type=type_map.get(d.get('type', '').lower(), CitationType.UNKNOWN),
-            raw_source=d.get('raw_source', ''),
-            source_engine=d.get('source_engine', ''),
-            title=d.get('title', ''),
-            authors=d.get('authors', []),
-            year=d.get('year'),
-            url=d.get('url', ''),
-            doi=d.get('doi', ''),
-            journal=d.get('journal', ''),
-            volume=d.get('volume', ''),
-            issue=d.get('issue', ''),
-            pages=d.get('pages', ''),
-            pmid=d.get('pmid', ''),
-            publisher=d.get('publisher', ''),
-            place=d.get('place', ''),
-            edition=d.get('edition', ''),
-            isbn=d.get('isbn', ''),
-            case_name=d.get('case_name', ''),
-            citation=d.get('citation', ''),
-            court=d.get('court', ''),
-            jurisdiction=d.get('jurisdiction', ''),
-            neutral_citation=d.get('neutral_citation', ''),
-            interviewee=d.get('interviewee', ''),
-            interviewer=d.get('interviewer', ''),
-            location=d.get('location', ''),
-            date=d.get('date', ''),
-            sender=d.get('sender', ''),
-            recipient=d.get('recipient', ''),
-            newspaper=d.get('newspaper', ''),
-            agency=d.get('agency', d.get('author', '')),  # Gov docs use 'author' for agency
-            document_number=d.get('document_number', ''),
-            access_date=d.get('access_date', ''),
-            confidence=d.get('confidence', 1.0),
-            raw_data=d.get('raw_data', {}),
+            citation_type=_TYPE_BY_NAME.get(str(d.get('type', '')).lower(), CitationType.UNKNOWN),
+            **kwargs,
         )
 
 
+_FIELD_NAMES = tuple(f.name for f in fields(CitationMetadata))
+_get_fields = attrgetter(*_FIELD_NAMES)
+_FIELD_DEFAULTS = tuple(
+    f.default if f.default is not MISSING else f.default_factory()
+    for f in fields(CitationMetadata)
+)
+
+# Repeated across results; interned so they share one string object
+_INTERNED_FIELDS = ('source_engine', 'journal', 'publisher', 'place', 'court', 'jurisdiction', 'newspaper')
+
+# to_dict / from_dict keys besides 'type' (citation_type)
+_DICT_FIELDS = _FIELD_NAMES[1:]
+_get_dict_fields = attrgetter(*_DICT_FIELDS)
+
+_TYPE_BY_NAME = {t.name.lower(): t for t in CitationType if t is not CitationType.UNKNOWN}
+
+
 @dataclass
 class DetectionResult:
     """Result from the detection layer."""
@@ -292,3 +271,17 @@ class DetectionResult:
     confidence: float = 1.0
     cleaned_query: str = ""  # Cleaned/normalized version of input for searching
     hints: Dict[str, Any] = field(default_factory=dict)  # Type-specific hints for extractors
+
+
+class Run(NamedTuple):
+    """
+    One formatted span of a citation, as formatters emit it for Word.
+    
+    The structured counterpart of the <i>-tagged string: the document
+    writer turns each Run into a w:r element (a HYPERLINK field for links)
+    without parsing markup.
+    """
+    text: str
+    italic: bool = False
+    underline: bool = False
+    link: str = ""  # target URL; the run is a hyperlink when set
@@ -4,6 +4,59 @@ citeflex/unified_router.py
 Unified routing logic combining the best of CiteFlex Pro and Cite Fix Pro.
 
 Version History:
+    2026-10-18 V5.3: _is_medical_url is back to the router's own, narrower set
+                     (config.PUBMED_URL_DOMAINS plus nih.gov/health pages): other NIH
+                     URLs no longer go to PubMed search.
+    2026-10-18 V5.2: UNKNOWN queries (_route_unknown) speculate only when the AI answer
+                     needs a model call; local-classifier and cached answers route
+                     directly. Searches a LEGAL/NEWSPAPER/GOVERNMENT answer rules out
+                     are cancelled at once, and waits are bounded by the deadline.
+    2026-10-18 V5.1: Speculative book/journal searches run under deadline.submit_child,
+                     so LOOKUP_STATS counts only whole note lookups.
+    2026-10-18 V5.0: Identifier fast path: a note carrying a valid DOI, PMID, PMCID,
+                     arXiv ID or ISBN (identifiers.py, one validated scan) goes straight
+                     to the matching get_by_id and skips fuzzy search; prefetch_identifiers
+                     batches PMIDs (PubMed ESummary) as well as DOIs.
+    2026-10-18 V4.9: prefetch_identifiers resolves every DOI of a document in a few
+                     batched Crossref requests (SearchEngine.get_many); _crossref_by_doi
+                     answers those from the prefetch store.
+    2026-10-18 V4.8: resolve_citation stops between routing stages once its deadline has
+                     passed or been cancelled; the speculative search the AI answer does
+                     not use is cancelled (deadline.submit_cancellable, LOOKUP_STATS).
+    2026-10-18 V4.7: route_citation, resolve_citation, get_citation and get_multiple_citations
+                     take an optional deadline (deadline.py) that bounds every engine
+                     call made for the query; fan-outs submit with the caller's deadline
+                     and wait at most for what is left of it.
+    2026-10-18 V4.6: UNKNOWN queries start the book and journal searches speculatively
+                     (SPECULATIVE_EXECUTOR) while the AI router classifies; its answer
+                     picks among searches already in flight instead of starting them.
+    2026-10-18 V4.5: classify_with_ai asks the local naive Bayes classifier
+                     (local_classifier.py) first; Claude/Gemini only see queries it is
+                     not LOCAL_CLASSIFIER_THRESHOLD sure about.
+    2026-10-18 V4.4: prefetch_ai_classifications batch-classifies the notes of a document
+                     that detection leaves UNKNOWN (a few model calls instead of one per
+                     note); answers reach classify_with_ai through ai_cache.
+    2026-10-18 V4.3: route_citation's lookup is split out as resolve_citation (style-
+                     independent); get_citation accepts a list of styles or "all" and
+                     formats one resolution in each.
+    2026-10-18 V4.2: The _parse_*_citation regex cascade is replaced by citation_grammar:
+                     each note is tokenized once and the citation shapes are matched
+                     over the token stream (linear time). Fixes UK citation numbers,
+                     trailing commas in quoted titles, truncated DOIs and newspaper
+                     name/date splitting.
+    2026-10-18 V4.1: parse_existing_citation dispatches through _CITATION_PARSERS, a
+                     feature-gated table: each parser only runs when the features it
+                     requires are present in the query analysis (PARSER_STATS counts
+                     parser calls made and skipped).
+    2026-10-18 V4.0: Query features are extracted once per query (analysis.analyze_query)
+                     and shared by parse_existing_citation, the _parse_* parsers,
+                     superlegal.is_legal_citation and detect_type.
+    2026-10-18 V3.9: _is_medical_url uses config.DOMAIN_TRIE (config.MEDICAL_DOMAINS)
+    2026-10-18 V3.8: _book_dict_to_metadata fills publisher/place from the ISBN
+                     registrant table when the engines omit them.
+    2026-10-18 V3.7: Added offline Crossref snapshot index (engines/crossref_local.py).
+                     Journal routes and DOI lookups try the local FTS5 index first and
+                     only go to the network on a local miss.
     2025-12-06 16:00 V3.6: Added legal citation parser to recognize already-formatted
                            legal citations. Patterns: "Case v. Case, 388 U.S. 1 (1967)"
                            and UK neutral citations "[2024] UKSC 1". Properly formatted
@@ -49,17 +102,30 @@ ARCHITECTURE:
 """
 
 import re
-from typing import Optional, Tuple, List
+import copy
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple, List, Union
 from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeout
 
-from models import CitationMetadata, CitationType
-from config import NEWSPAPER_DOMAINS, GOV_AGENCY_MAP
-from detectors import detect_type, DetectionResult, is_url
+from models import CitationMetadata, CitationType, normalize_doi
+from config import NEWSPAPER_DOMAINS, GOV_AGENCY_MAP, find_domain
+from detectors import detect_type, DetectionResult
+from analysis import QueryAnalysis, analyze_query
+from citation_grammar import (
+    parse_legal, parse_interview, parse_letter, parse_journal, parse_book, parse_newspaper
+)
 from extractors import extract_by_type
-from formatters.base import get_formatter
+from identifiers import find_identifiers, first_identifier, by_priority
+from ai_cache import ai_cache
+from deadline import Deadline, activate, remaining, submit, submit_child, deadline_expired
+from local_classifier import local_classifier
+from formatters.base import get_formatter, format_styles
 
 # Import CiteFlex Pro engines
 from engines.academic import CrossrefEngine, OpenAlexEngine, SemanticScholarEngine, PubMedEngine
+from engines.crossref_local import CrossrefLocalEngine
+from engines.base import keep_raw
 from engines.doi import extract_doi_from_url, is_academic_publisher_url
 
 # Import Cite Fix Pro modules (now in engines/)
@@ -76,7 +142,7 @@ AI_ROUTER = os.environ.get('AI_ROUTER', 'claude').lower()  # 'claude' or 'gemini
 
 # Try to import Claude router (primary)
 try:
-    from claude_router import classify_with_claude, get_citation_options
+    from claude_router import classify_with_claude, classify_cached_with_claude, classify_batch_with_claude, get_citation_options
     CLAUDE_AVAILABLE = True
 except ImportError:
     CLAUDE_AVAILABLE = False
@@ -84,7 +150,7 @@ except ImportError:
 
 # Try to import Gemini router (fallback)
 try:
-    from gemini_router import classify_with_gemini
+    from gemini_router import classify_with_gemini, classify_cached_with_gemini, classify_batch_with_gemini
     GEMINI_AVAILABLE = True
 except ImportError:
     GEMINI_AVAILABLE = False
@@ -92,9 +158,15 @@ except ImportError:
 
 def classify_with_ai(query: str) -> Tuple[CitationType, Optional[CitationMetadata]]:
     """
-    Use configured AI router (Claude preferred, Gemini fallback).
+    Use the local classifier when it is confident, otherwise the configured
+    AI router (Claude preferred, Gemini fallback).
     Returns (CitationType, optional metadata).
     """
+    local_type = local_classifier.classify(query)
+    if local_type != CitationType.UNKNOWN:
+        print(f"[UnifiedRouter] Local classifier: {local_type.name}")
+        return local_type, None
+    
     if AI_ROUTER == 'claude' and CLAUDE_AVAILABLE:
         return classify_with_claude(query)
     elif AI_ROUTER == 'gemini' and GEMINI_AVAILABLE:
@@ -107,6 +179,42 @@ def classify_with_ai(query: str) -> Tuple[CitationType, Optional[CitationMetadat
         return CitationType.UNKNOWN, None
 
 
+def classify_with_ai_cached(query: str) -> Optional[Tuple[CitationType, Optional[CitationMetadata]]]:
+    """
+    classify_with_ai's answer when it needs no model call (confident local
+    classifier, cached AI answer, no AI router), else None.
+    """
+    local_type = local_classifier.classify(query)
+    if local_type != CitationType.UNKNOWN:
+        print(f"[UnifiedRouter] Local classifier: {local_type.name}")
+        return local_type, None
+    
+    if AI_ROUTER == 'claude' and CLAUDE_AVAILABLE:
+        return classify_cached_with_claude(query)
+    elif AI_ROUTER == 'gemini' and GEMINI_AVAILABLE:
+        return classify_cached_with_gemini(query)
+    elif CLAUDE_AVAILABLE:
+        return classify_cached_with_claude(query)
+    elif GEMINI_AVAILABLE:
+        return classify_cached_with_gemini(query)
+    else:
+        return CitationType.UNKNOWN, None
+
+
+def classify_batch_with_ai(queries: List[str]) -> Dict[str, Tuple[CitationType, Optional[CitationMetadata]]]:
+    """Batch form of classify_with_ai (same router choice)."""
+    if AI_ROUTER == 'claude' and CLAUDE_AVAILABLE:
+        return classify_batch_with_claude(queries)
+    elif AI_ROUTER == 'gemini' and GEMINI_AVAILABLE:
+        return classify_batch_with_gemini(queries)
+    elif CLAUDE_AVAILABLE:
+        return classify_batch_with_claude(queries)
+    elif GEMINI_AVAILABLE:
+        return classify_batch_with_gemini(queries)
+    else:
+        return {}
+
+
 AI_AVAILABLE = CLAUDE_AVAILABLE or GEMINI_AVAILABLE
 if not AI_AVAILABLE:
     print("[UnifiedRouter] No AI router available - UNKNOWN queries will use default routing")
@@ -122,8 +230,11 @@ else:
 PARALLEL_TIMEOUT = 12  # seconds
 MAX_WORKERS = 4
 
-# Medical domains that should NOT route to government engine
-MEDICAL_DOMAINS = ['pubmed', 'ncbi.nlm.nih.gov', 'nih.gov/health', 'medlineplus']
+# Shared pool for the speculative book/journal searches of UNKNOWN queries.
+# Shared (not per call) so resolve_citation can return without waiting for
+# the search the AI classification did not pick.
+SPECULATIVE_WORKERS = 8
+SPECULATIVE_EXECUTOR = ThreadPoolExecutor(max_workers=SPECULATIVE_WORKERS, thread_name_prefix='speculative')
 
 
 # =============================================================================
@@ -131,11 +242,50 @@ MEDICAL_DOMAINS = ['pubmed', 'ncbi.nlm.nih.gov', 'nih.gov/health', 'medlineplus'
 # =============================================================================
 
 _crossref = CrossrefEngine()
+_crossref_local = CrossrefLocalEngine()
 _openalex = OpenAlexEngine()
 _semantic = SemanticScholarEngine()
 _pubmed = PubMedEngine()
 
 
+def _crossref_by_doi(doi: str) -> Optional[CitationMetadata]:
+    """DOI lookup: prefetched batch results, then local snapshot, live Crossref on a miss."""
+    result = _prefetched_id('doi', normalize_doi(doi))
+    if result:
+        return result
+    result = _crossref_local.get_by_id(doi)
+    if result:
+        return result
+    return _crossref.get_by_id(doi)
+
+
+def _pubmed_by_pmid(pmid: str) -> Optional[CitationMetadata]:
+    """PMID lookup: prefetched batch results, then PubMed ESummary."""
+    return _prefetched_id('pmid', pmid) or _pubmed.get_by_id(pmid)
+
+
+# Identifiers resolved ahead of time by prefetch_identifiers ((kind, value)
+# -> CitationMetadata). Bounded; the oldest entries are dropped first.
+PREFETCH_MAX = 2000
+_prefetched: 'OrderedDict[Tuple[str, str], CitationMetadata]' = OrderedDict()
+_prefetched_lock = threading.Lock()
+
+
+def _prefetched_id(kind: str, value: str) -> Optional[CitationMetadata]:
+    with _prefetched_lock:
+        result = _prefetched.get((kind, value))
+    # Callers may modify what they get back
+    return copy.deepcopy(result) if result else None
+
+
+def _crossref_search_multiple(query: str, limit: int) -> List[CitationMetadata]:
+    """Crossref candidates: local snapshot first, live Crossref on a miss."""
+    results = _crossref_local.search_multiple(query, limit)
+    if results:
+        return results
+    return _crossref.search_multiple(query, limit)
+
+
 # =============================================================================
 # WRAPPER: CONVERT SUPERLEGAL.PY DICT → CitationMetadata
 # =============================================================================
@@ -156,7 +306,7 @@ def _legal_dict_to_metadata(data: dict, raw_source: str) -> Optional[CitationMet
         jurisdiction=data.get('jurisdiction', 'US'),
         neutral_citation=data.get('neutral_citation', ''),
         url=data.get('url', ''),
-        raw_data=data
+        raw_data=keep_raw(data)
     )
 
 
@@ -172,6 +322,9 @@ def _book_dict_to_metadata(data: dict, raw_source: str) -> Optional[CitationMeta
     # Get place, with fallback to publisher lookup if missing
     place = data.get('place', '')
     publisher = data.get('publisher', '')
+    if data.get('isbn') and not (place and publisher):
+        filled = books.fill_from_isbn(dict(data))
+        publisher, place = filled['publisher'], filled['place']
     if not place and publisher:
         place = books.resolve_place(publisher, '')
     
@@ -185,7 +338,7 @@ def _book_dict_to_metadata(data: dict, raw_source: str) -> Optional[CitationMeta
         publisher=publisher,
         place=place,
         isbn=data.get('isbn', ''),
-        raw_data=data
+        raw_data=keep_raw(data)
     )
 
 
@@ -193,7 +346,7 @@ def _book_dict_to_metadata(data: dict, raw_source: str) -> Optional[CitationMeta
 # CITATION PARSER: Extract metadata from already-formatted citations
 # =============================================================================
 
-def parse_existing_citation(query: str) -> Optional[CitationMetadata]:
+def parse_existing_citation(query: str, analysis: Optional[QueryAnalysis] = None) -> Optional[CitationMetadata]:
     """
     Parse an already-formatted citation to extract metadata.
     
@@ -214,742 +367,23 @@ def parse_existing_citation(query: str) -> Optional[CitationMetadata]:
     if not query or len(query) < 15:
         return None
     
-    query = query.strip()
-    
-    # Try legal citation first (has distinctive patterns)
-    meta = _parse_legal_citation(query)
-    if meta and (meta.case_name and meta.year):
-        return meta
+    a = analysis or analyze_query(query)
+    query = a.text
     
-    # Try interview pattern (has distinctive triggers)
-    meta = _parse_interview_citation(query)
-    if meta and _is_citation_complete(meta):
-        return meta
-    
-    # Try letter pattern (Person X to Person Y, Date)
-    meta = _parse_letter_citation(query)
-    if meta and _is_citation_complete(meta):
-        return meta
-    
-    # Try journal pattern (most common in academic work)
-    meta = _parse_journal_citation(query)
-    if meta and _is_citation_complete(meta):
-        return meta
-    
-    # Try book pattern
-    meta = _parse_book_citation(query)
-    if meta and _is_citation_complete(meta):
-        return meta
-    
-    # Try newspaper pattern
-    meta = _parse_newspaper_citation(query)
-    if meta and _is_citation_complete(meta):
-        return meta
-    
-    return None
-
-
-def _parse_legal_citation(query: str) -> Optional[CitationMetadata]:
-    """
-    Parse already-formatted legal citation.
-    
-    Patterns recognized:
-    - US: Case Name, Volume Reporter Page (Court Year).
-      e.g., Loving v. Virginia, 388 U.S. 1 (1967).
-    - US Circuit: Case Name, Volume F.2d/F.3d Page (Circuit Year).
-      e.g., Johnson v. Branch, 364 F.2d 177 (4th Cir. 1966).
-    - US District: Case Name, Volume F. Supp. Page (District Year).
-      e.g., Landman v. Royster, 333 F. Supp. 621 (E.D. Va. 1971).
-    - UK: Case Name [Year] Court Number
-      e.g., R v Brown [1994] 1 AC 212
-    
-    Returns CitationMetadata if parsing succeeds, None otherwise.
-    """
-    if not query or len(query) < 10:
-        return None
-    
-    query = query.strip()
-    
-    # Must have "v." or "v " pattern (case name indicator)
-    if not re.search(r'\s+v\.?\s+', query, re.IGNORECASE):
-        # Also check for "In re" or "Ex parte" patterns
-        if not re.search(r'^(In\s+re|Ex\s+parte|Matter\s+of)\s+', query, re.IGNORECASE):
-            return None
-    
-    case_name = ''
-    citation = ''
-    court = ''
-    year = ''
-    
-    # =========================================================================
-    # Pattern 1: US Citations - Case Name, Citation (Court Year).
-    # =========================================================================
-    
-    # Match: Case Name, Volume Reporter Page (Court? Year)
-    # Examples:
-    #   Loving v. Virginia, 388 U.S. 1 (1967)
-    #   Johnson v. Branch, 364 F.2d 177 (4th Cir. 1966)
-    #   Landman v. Royster, 333 F. Supp. 621 (E.D. Va. 1971)
-    
-    us_pattern = re.compile(
-        r'^(.+?)\s*,\s*'                    # Case name (up to comma)
-        r'(\d+\s+'                           # Volume number
-        r'(?:U\.S\.|S\.\s*Ct\.|L\.\s*Ed\.|'  # Supreme Court reporters
-        r'F\.(?:\d[a-z]*d?\s*)?|'            # Federal Reporter (F., F.2d, F.3d, F. 4th)
-        r'F\.\s*Supp\.(?:\s*\d+[a-z]*)?|'   # F. Supp., F. Supp. 2d, F. Supp. 3d
-        r'[A-Z]\.\d*[a-z]*)'                 # State reporters (A.2d, N.E.2d, etc.)
-        r'\s*\d+)'                           # Page number
-        r'\s*\(([^)]+)\)'                    # Parenthetical (Court Year)
-    )
-    
-    match = us_pattern.match(query)
-    if match:
-        case_name = match.group(1).strip()
-        citation = match.group(2).strip()
-        paren_content = match.group(3).strip()
-        
-        # Parse parenthetical: could be just year "(1967)" or court + year "(4th Cir. 1966)"
-        year_match = re.search(r'(\d{4})', paren_content)
-        if year_match:
-            year = year_match.group(1)
-            court_part = paren_content[:year_match.start()].strip().rstrip(',')
-            if court_part:
-                court = court_part
-            else:
-                # Infer court from reporter
-                if 'U.S.' in citation:
-                    court = 'Supreme Court of the United States'
-                elif 'S. Ct.' in citation:
-                    court = 'Supreme Court of the United States'
-        
-        return CitationMetadata(
-            citation_type=CitationType.LEGAL,
-            raw_source=query,
-            source_engine="Parsed from formatted citation",
-            case_name=case_name,
-            citation=citation,
-            court=court,
-            year=year,
-            jurisdiction='US'
-        )
-    
-    # =========================================================================
-    # Pattern 2: UK Neutral Citations - Case Name [Year] Court Number
-    # =========================================================================
-    
-    uk_pattern = re.compile(
-        r'^(.+?)\s*'                         # Case name
-        r'\[(\d{4})\]\s*'                    # [Year]
-        r'(\w+(?:\s+\w+)?)\s*'               # Court code (UKSC, EWCA Civ, etc.)
-        r'(\d+)'                              # Case number
-    )
-    
-    match = uk_pattern.match(query)
-    if match:
-        case_name = match.group(1).strip().rstrip(',')
-        year = match.group(2)
-        court_code = match.group(3).strip()
-        case_number = match.group(4)
-        citation = f'[{year}] {court_code} {case_number}'
-        
-        # Map court codes
-        uk_courts = {
-            'UKSC': 'Supreme Court',
-            'UKHL': 'House of Lords',
-            'EWCA Civ': 'Court of Appeal (Civil)',
-            'EWCA Crim': 'Court of Appeal (Criminal)',
-            'EWHC': 'High Court',
-        }
-        court = uk_courts.get(court_code, court_code)
-        
-        return CitationMetadata(
-            citation_type=CitationType.LEGAL,
-            raw_source=query,
-            source_engine="Parsed from formatted citation",
-            case_name=case_name,
-            citation=citation,
-            court=court,
-            year=year,
-            jurisdiction='UK'
-        )
-    
-    # =========================================================================
-    # Pattern 3: Simpler fallback - just extract what we can
-    # =========================================================================
-    
-    # Try to extract case name before comma
-    parts = query.split(',', 1)
-    if len(parts) >= 1:
-        potential_name = parts[0].strip()
-        if re.search(r'\s+v\.?\s+', potential_name, re.IGNORECASE) or \
-           re.search(r'^(In\s+re|Ex\s+parte)', potential_name, re.IGNORECASE):
-            case_name = potential_name
-            
-            # Try to find year in rest
-            if len(parts) > 1:
-                rest = parts[1]
-                year_match = re.search(r'\((\d{4})\)', rest)
-                if year_match:
-                    year = year_match.group(1)
-                
-                # Try to extract citation (numbers + reporter)
-                cit_match = re.search(r'(\d+\s+[A-Z][A-Za-z\.\s]+\d+)', rest)
-                if cit_match:
-                    citation = cit_match.group(1).strip()
-            
-            if case_name and year:
-                return CitationMetadata(
-                    citation_type=CitationType.LEGAL,
-                    raw_source=query,
-                    source_engine="Parsed from formatted citation",
-                    case_name=case_name,
-                    citation=citation,
-                    court=court,
-                    year=year,
-                    jurisdiction='US'
-                )
+    # Parsers in priority order; each only runs if its required features
+    # are present (see _CITATION_PARSERS)
+    for name, parser, requires, accept in _CITATION_PARSERS:
+        if not requires(a):
+            PARSER_STATS['skipped'] += 1
+            continue
+        PARSER_STATS['calls'] += 1
+        meta = parser(query)
+        if meta and accept(meta):
+            return meta
     
     return None
 
 
-def _parse_interview_citation(query: str) -> Optional[CitationMetadata]:
-    """
-    Parse interview citation.
-    
-    Triggers (high confidence):
-    - "interview by" 
-    - "interview with"
-    - "oral history"
-    - "interviewed by"
-    
-    Patterns:
-    - Name, interview by author, Date, Location.
-    - Name, interview with Author, Date.
-    - Name interview by Author, Date. Digitally recorded in author's possession.
-    """
-    query_lower = query.lower()
-    
-    # Check for interview triggers
-    triggers = ['interview by', 'interview with', 'oral history', 'interviewed by']
-    has_trigger = any(t in query_lower for t in triggers)
-    
-    if not has_trigger:
-        return None
-    
-    interviewee = ''
-    interviewer = ''
-    date = ''
-    location = ''
-    url = ''
-    
-    # Extract URL if present
-    url_match = re.search(r'https?://[^\s,]+', query)
-    if url_match:
-        url = url_match.group(0).rstrip('.,;')
-    
-    # Pattern: Interviewee, interview by Interviewer, Date
-    # Or: Interviewee interview by Interviewer, Date
-    interview_match = re.search(
-        r'^([^,]+?)(?:,\s*)?\binterview(?:ed)?\s+(?:by|with)\s+([^,]+)',
-        query, re.IGNORECASE
-    )
-    
-    if interview_match:
-        interviewee = interview_match.group(1).strip()
-        interviewer = interview_match.group(2).strip()
-        
-        # Get rest of string for date/location
-        rest = query[interview_match.end():].strip().lstrip(',').strip()
-        
-        # Extract date (various formats)
-        date_patterns = [
-            r'([A-Z][a-z]+\.?\s+\d{1,2},?\s+\d{4})',  # Jan. 15, 2022
-            r'(\d{1,2}\s+[A-Z][a-z]+\.?\s+\d{4})',     # 15 Jan 2022
-            r'([A-Z][a-z]+\s+\d{4})',                   # January 2022
-            r'(\d{4})',                                  # Just year
-        ]
-        
-        for pattern in date_patterns:
-            date_match = re.search(pattern, rest)
-            if date_match:
-                date = date_match.group(1)
-                break
-        
-        # Location might be city name before or after date
-        # Often: "Potomac, MD" or just location info
-        loc_match = re.search(r',\s*([A-Z][a-z]+(?:,\s*[A-Z]{2})?)\s*,', rest)
-        if loc_match:
-            location = loc_match.group(1)
-    
-    # Handle oral history pattern
-    elif 'oral history' in query_lower:
-        # Pattern: Name Oral History Interview, Source
-        oral_match = re.search(r'^([^,]+?)\s+oral\s+history', query, re.IGNORECASE)
-        if oral_match:
-            interviewee = oral_match.group(1).strip()
-    
-    if not interviewee:
-        return None
-    
-    # Extract year from date
-    year = ''
-    if date:
-        year_match = re.search(r'(\d{4})', date)
-        if year_match:
-            year = year_match.group(1)
-    
-    return CitationMetadata(
-        citation_type=CitationType.INTERVIEW,
-        raw_source=query,
-        source_engine="Parsed from formatted citation",
-        interviewee=interviewee,
-        interviewer=interviewer,
-        date=date,
-        year=year,
-        location=location,
-        url=url
-    )
-
-
-def _parse_letter_citation(query: str) -> Optional[CitationMetadata]:
-    """
-    Parse letter/correspondence citation.
-    
-    Trigger: "Person X to Person Y, Date" pattern
-    The date requirement prevents false positives like "Introduction to Psychology"
-    
-    Patterns:
-    - John Grad to Philip J. Hirschkop, Apr. 19, 1977.
-    - Aaron Fodiman to Henry Kissinger, Mar. 11, 1976.
-    - Name to Name, "Subject," Date, Collection.
-    """
-    # Pattern: Name to Name, followed by a date
-    # Must have date within reasonable distance to avoid "Introduction to X"
-    
-    # Look for "Name to Name" followed by comma and date-like content
-    # Names typically: First Last or First M. Last or First Middle Last
-    letter_pattern = re.compile(
-        r'^([A-Z][a-z]+(?:\s+[A-Z]\.?)?\s+[A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)'  # Sender
-        r'\s+to\s+'
-        r'([A-Z][a-z]+(?:\s+[A-Z]\.?)?\s+[A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)'  # Recipient
-        r',\s*'
-        r'(.+)$',  # Rest (should contain date)
-        re.MULTILINE
-    )
-    
-    match = letter_pattern.match(query)
-    if not match:
-        return None
-    
-    sender = match.group(1).strip()
-    recipient = match.group(2).strip()
-    rest = match.group(3).strip()
-    
-    # Must have a date within the rest to confirm this is a letter
-    date_patterns = [
-        r'([A-Z][a-z]{2,8}\.?\s+\d{1,2},?\s+\d{4})',  # Apr. 19, 1977 or April 19, 1977
-        r'(\d{1,2}\s+[A-Z][a-z]{2,8}\.?\s+\d{4})',     # 19 Apr 1977
-        r'([A-Z][a-z]{2,8}\.?\s+\d{4})',               # April 1977
-    ]
-    
-    date = ''
-    year = ''
-    for pattern in date_patterns:
-        date_match = re.search(pattern, rest)
-        if date_match:
-            date = date_match.group(1)
-            year_match = re.search(r'(\d{4})', date)
-            if year_match:
-                year = year_match.group(1)
-            break
-    
-    # If no date found, this might not be a letter (could be "Introduction to Psychology")
-    if not date:
-        return None
-    
-    # Extract URL if present
-    url = ''
-    url_match = re.search(r'https?://[^\s,]+', rest)
-    if url_match:
-        url = url_match.group(0).rstrip('.,;')
-    
-    # Extract subject/title if in quotes
-    title = ''
-    title_match = re.search(r'"([^"]+)"', rest)
-    if title_match:
-        title = title_match.group(1)
-    
-    # Extract location/collection info (often after date)
-    location = ''
-    # Look for collection info after date
-    if date:
-        after_date_idx = rest.find(date) + len(date)
-        after_date = rest[after_date_idx:].strip().lstrip(',').strip()
-        # Remove URL from consideration
-        if url:
-            after_date = after_date.replace(url, '').strip()
-        after_date = after_date.rstrip('.')
-        if after_date and not after_date.startswith('http'):
-            location = after_date
-    
-    return CitationMetadata(
-        citation_type=CitationType.LETTER,
-        raw_source=query,
-        source_engine="Parsed from formatted citation",
-        sender=sender,
-        recipient=recipient,
-        title=title,  # Subject line if present
-        date=date,
-        year=year,
-        location=location,  # Collection/archive info
-        url=url
-    )
-
-
-def _parse_journal_citation(query: str) -> Optional[CitationMetadata]:
-    """
-    Parse Chicago/academic journal citation.
-    
-    Patterns recognized:
-    - Author, "Title," Journal Vol, no. Issue (Year): Pages. DOI
-    - Author, "Title," Journal Vol (Year): Pages.
-    - Author "Title," Journal Vol, no. Issue (Year): Pages DOI
-    """
-    # Extract DOI if present (do this first, then remove from parsing)
-    doi = None
-    doi_match = re.search(r'(?:https?://)?(?:dx\.)?doi\.org/([^\s,\.]+[^\s,\.\)])', query)
-    if doi_match:
-        doi = doi_match.group(1).rstrip('.')
-    
-    # Extract URL if present (and no DOI)
-    url = None
-    if not doi:
-        url_match = re.search(r'https?://[^\s,]+', query)
-        if url_match:
-            url = url_match.group(0).rstrip('.,;')
-    
-    # Pattern: Author(s), "Title," Journal Volume, no. Issue (Year): Pages
-    # Also handles: Author(s) "Title," (without comma after author)
-    
-    # Look for quoted title (strong indicator of journal/article)
-    title_match = re.search(r'[,\s]"([^"]+)"[,\.]?\s*', query)
-    if not title_match:
-        # Try single quotes
-        title_match = re.search(r"[,\s]'([^']+)'[,\.]?\s*", query)
-    
-    if not title_match:
-        return None
-    
-    title = title_match.group(1).strip()
-    before_title = query[:title_match.start()].strip().rstrip(',')
-    after_title = query[title_match.end():].strip()
-    
-    # Parse authors (everything before the title)
-    authors = _parse_authors(before_title)
-    
-    # Parse journal info from after title
-    # Pattern: Journal Vol, no. Issue (Year): Pages
-    # Or: Journal Vol (Year): Pages
-    # Or: Journal Volume, no. Issue (Year) : Pages
-    
-    journal = None
-    volume = None
-    issue = None
-    year = None
-    pages = None
-    
-    # Extract year from parentheses
-    year_match = re.search(r'\((\d{4})\)', after_title)
-    if year_match:
-        year = year_match.group(1)
-    
-    # Extract pages (after colon or before DOI)
-    pages_match = re.search(r':\s*(\d+[-–]\d+|\d+)', after_title)
-    if pages_match:
-        pages = pages_match.group(1).replace('–', '-')
-    
-    # Extract volume and issue
-    # Pattern: Vol, no. Issue or Volume no. Issue or Vol(Issue)
-    vol_issue_match = re.search(r'(\d+)\s*,?\s*no\.?\s*(\d+)', after_title, re.IGNORECASE)
-    if vol_issue_match:
-        volume = vol_issue_match.group(1)
-        issue = vol_issue_match.group(2)
-    else:
-        # Just volume
-        vol_match = re.search(r'\b(\d+)\s*\(', after_title)
-        if vol_match:
-            volume = vol_match.group(1)
-    
-    # Extract journal name (text before volume/year, after title)
-    # Remove DOI/URL from consideration
-    journal_text = after_title
-    if doi_match:
-        journal_text = journal_text[:journal_text.find('doi.org') if 'doi.org' in journal_text.lower() else len(journal_text)]
-    if url:
-        journal_text = journal_text.replace(url, '')
-    
-    # Journal is typically italic in source, may have <i> tags
-    # Pattern: <i>Journal Name</i> or just Journal Name before volume
-    italic_match = re.search(r'<i>([^<]+)</i>', journal_text)
-    if italic_match:
-        journal = italic_match.group(1).strip()
-    else:
-        # Extract text before volume number
-        if volume:
-            vol_pos = journal_text.find(volume)
-            if vol_pos > 0:
-                journal = journal_text[:vol_pos].strip().rstrip(',').strip()
-        elif year_match:
-            year_pos = journal_text.find(f'({year})')
-            if year_pos > 0:
-                journal = journal_text[:year_pos].strip().rstrip(',').strip()
-    
-    # Clean up journal name
-    if journal:
-        journal = re.sub(r'^[,\s]+', '', journal)
-        journal = re.sub(r'[,\s]+$', '', journal)
-        # Remove any remaining HTML tags
-        journal = re.sub(r'<[^>]+>', '', journal)
-    
-    if not title or not year:
-        return None
-    
-    return CitationMetadata(
-        citation_type=CitationType.JOURNAL,
-        raw_source=query,
-        source_engine="Parsed from formatted citation",
-        title=title,
-        authors=authors if authors else [],
-        journal=journal or '',
-        volume=volume or '',
-        issue=issue or '',
-        year=year,
-        pages=pages or '',
-        doi=doi or '',
-        url=url or ''
-    )
-
-
-def _parse_book_citation(query: str) -> Optional[CitationMetadata]:
-    """
-    Parse Chicago book citation.
-    
-    Patterns recognized:
-    - Author, Title (Place: Publisher, Year).
-    - Author, Title (Publisher, Year).
-    - Author. Title. Place: Publisher, Year.
-    """
-    # Books have italic titles (not quoted)
-    # Look for (Place: Publisher, Year) or (Publisher, Year) pattern
-    
-    pub_match = re.search(r'\(([^)]+:\s*[^,)]+,\s*\d{4})\)', query)
-    if not pub_match:
-        # Try (Publisher, Year) without place
-        pub_match = re.search(r'\(([^):,]+,\s*\d{4})\)', query)
-    
-    if not pub_match:
-        return None
-    
-    pub_info = pub_match.group(1)
-    before_pub = query[:pub_match.start()].strip()
-    
-    # Parse publication info
-    place = ''
-    publisher = ''
-    year = ''
-    
-    # Extract year
-    year_match = re.search(r'(\d{4})', pub_info)
-    if year_match:
-        year = year_match.group(1)
-    
-    # Check for Place: Publisher pattern
-    if ':' in pub_info:
-        parts = pub_info.split(':')
-        place = parts[0].strip()
-        rest = ':'.join(parts[1:])
-        # Publisher is before the year
-        publisher = re.sub(r',?\s*\d{4}', '', rest).strip().rstrip(',')
-    else:
-        # Just Publisher, Year
-        publisher = re.sub(r',?\s*\d{4}', '', pub_info).strip().rstrip(',')
-    
-    # Parse author and title from before_pub
-    # Pattern: Author, Title or Author. Title.
-    
-    # Look for italic title marker
-    italic_match = re.search(r'<i>([^<]+)</i>', before_pub)
-    if italic_match:
-        title = italic_match.group(1).strip()
-        before_title = before_pub[:italic_match.start()].strip().rstrip(',').rstrip('.')
-        authors = _parse_authors(before_title)
-    else:
-        # No italic markers - try to split on comma after author name pattern
-        # Author names typically end before a capitalized title
-        # Heuristic: first comma after a name-like pattern
-        
-        # Simple split: everything before last comma-space before title
-        # For "John Smith, The Great Book" -> author="John Smith", title="The Great Book"
-        
-        # Try to find where title starts (usually capitalized, might have subtitle with colon)
-        parts = before_pub.split(', ')
-        if len(parts) >= 2:
-            # Assume first part(s) are author, last significant part is title
-            # Look for title-like part (longer, has capitalized words)
-            author_parts = []
-            title = ''
-            for i, part in enumerate(parts):
-                # If part looks like a title (longer, not a name pattern)
-                if len(part) > 30 or (i > 0 and ':' in part):
-                    title = ', '.join(parts[i:])
-                    break
-                author_parts.append(part)
-            
-            if not title and len(parts) >= 2:
-                author_parts = parts[:-1]
-                title = parts[-1]
-            
-            authors = _parse_authors(', '.join(author_parts))
-        else:
-            # Can't reliably split
-            authors = []
-            title = before_pub
-    
-    if not title or not year:
-        return None
-    
-    # Clean title
-    title = re.sub(r'<[^>]+>', '', title).strip()
-    
-    return CitationMetadata(
-        citation_type=CitationType.BOOK,
-        raw_source=query,
-        source_engine="Parsed from formatted citation",
-        title=title,
-        authors=authors if authors else [],
-        publisher=publisher,
-        place=place,
-        year=year
-    )
-
-
-def _parse_newspaper_citation(query: str) -> Optional[CitationMetadata]:
-    """
-    Parse newspaper article citation.
-    
-    Pattern: Author, "Title," Publication, Date, URL.
-    """
-    # Must have quoted title and a URL or date
-    title_match = re.search(r'"([^"]+)"', query)
-    if not title_match:
-        return None
-    
-    title = title_match.group(1)
-    before_title = query[:title_match.start()].strip().rstrip(',')
-    after_title = query[title_match.end():].strip().lstrip(',').strip()
-    
-    # Extract URL
-    url = None
-    url_match = re.search(r'https?://[^\s,]+', after_title)
-    if url_match:
-        url = url_match.group(0).rstrip('.,;')
-        after_title = after_title.replace(url, '').strip()
-    
-    # Parse authors
-    authors = _parse_authors(before_title)
-    
-    # After title: Publication, Date
-    # Look for italic publication name
-    pub_match = re.search(r'<i>([^<]+)</i>', after_title)
-    newspaper = ''
-    date = ''
-    
-    if pub_match:
-        newspaper = pub_match.group(1).strip()
-        rest = after_title[pub_match.end():].strip().lstrip(',').strip()
-        # Rest might be date
-        date_match = re.search(r'([A-Z][a-z]+\.?\s+\d{1,2},?\s+\d{4}|\d{4})', rest)
-        if date_match:
-            date = date_match.group(1)
-    else:
-        # Try to extract date and newspaper from remaining text
-        # Common patterns: New York Times, July 9, 2025
-        parts = [p.strip() for p in after_title.split(',')]
-        for i, part in enumerate(parts):
-            if re.search(r'\d{4}', part):
-                date = ', '.join(parts[i:]).strip().rstrip('.')
-                newspaper = ', '.join(parts[:i]).strip() if i > 0 else ''
-                break
-    
-    if not title:
-        return None
-    
-    # Extract year from date
-    year = ''
-    year_match = re.search(r'(\d{4})', date or '')
-    if year_match:
-        year = year_match.group(1)
-    
-    return CitationMetadata(
-        citation_type=CitationType.NEWSPAPER,
-        raw_source=query,
-        source_engine="Parsed from formatted citation",
-        title=title,
-        authors=authors if authors else [],
-        newspaper=newspaper,
-        date=date,
-        year=year,
-        url=url or ''
-    )
-
-
-def _parse_authors(author_str: str) -> list:
-    """
-    Parse author string into list of names.
-    
-    Handles:
-    - Single author: "John Smith"
-    - Two authors: "John Smith and Jane Doe"
-    - Multiple: "John Smith, Jane Doe, and Bob Wilson"
-    - Et al: "John Smith et al."
-    """
-    if not author_str:
-        return []
-    
-    author_str = author_str.strip()
-    
-    # Remove trailing punctuation
-    author_str = author_str.rstrip('.,;:')
-    
-    # Handle et al.
-    if 'et al' in author_str.lower():
-        # Just get first author
-        first = re.split(r'\s+et\s+al', author_str, flags=re.IGNORECASE)[0]
-        return [first.strip().rstrip(',')]
-    
-    # Split on " and " or ", and "
-    if ' and ' in author_str:
-        parts = re.split(r',?\s+and\s+', author_str)
-        authors = []
-        for part in parts:
-            # Further split on commas (for lists like "A, B, and C")
-            sub_parts = [p.strip() for p in part.split(',') if p.strip()]
-            authors.extend(sub_parts)
-        return authors
-    
-    # Check if comma-separated (multiple authors)
-    # But be careful: "Smith, John" is one author in Last, First format
-    parts = [p.strip() for p in author_str.split(',')]
-    if len(parts) == 2 and len(parts[1].split()) <= 2:
-        # Likely "Last, First" format - single author
-        return [author_str]
-    elif len(parts) > 2:
-        # Multiple authors
-        return parts
-    
-    return [author_str]
-
-
 def _is_citation_complete(meta: CitationMetadata) -> bool:
     """
     Check if parsed citation has enough data to skip database search.
@@ -992,6 +426,47 @@ def _is_citation_complete(meta: CitationMetadata) -> bool:
     return False
 
 
+# =============================================================================
+# PARSER DISPATCH TABLE
+# =============================================================================
+
+# Letter shape: "First [M.] Last to Name" (the grammar then requires a date)
+_LETTER_GATE_RE = re.compile(r'[A-Z][a-z]+(?:\s+\S+){1,3}?\s+to\s+[A-Z]')
+
+# (name, parser, required features, acceptance check), in priority order.
+# A parser whose required features are absent could not match, so it is
+# skipped without running its regexes.
+_CITATION_PARSERS = [
+    # Legal first (distinctive patterns): " v. " or In re / Ex parte / Matter of
+    ('legal', parse_legal,
+     lambda a: a.v_marker or a.case_prefix,
+     lambda meta: bool(meta.case_name and meta.year)),
+    # Interview: "interview by/with", "interviewed by", "oral history"
+    ('interview', parse_interview,
+     lambda a: a.hits('interview') > 0,
+     _is_citation_complete),
+    # Letter: Person X to Person Y, Date
+    ('letter', parse_letter,
+     lambda a: bool(_LETTER_GATE_RE.match(a.text)),
+     _is_citation_complete),
+    # Journal: quoted title plus (Year)
+    ('journal', parse_journal,
+     lambda a: (a.double_quoted or a.single_quoted) and bool(a.paren_years),
+     _is_citation_complete),
+    # Book: (Place: Publisher, Year) or (Publisher, Year)
+    ('book', parse_book,
+     lambda a: a.pub_parenthetical,
+     _is_citation_complete),
+    # Newspaper: "Title"
+    ('newspaper', parse_newspaper,
+     lambda a: a.text.count('"') >= 2,
+     _is_citation_complete),
+]
+
+# Parser invocations made / avoided by the feature gates (process lifetime)
+PARSER_STATS = {'calls': 0, 'skipped': 0}
+
+
 # =============================================================================
 # UNIFIED LEGAL SEARCH (uses superlegal.py)
 # =============================================================================
@@ -1047,6 +522,8 @@ def _route_journal(query: str) -> Optional[CitationMetadata]:
     """
     Route journal/academic queries using parallel API execution.
     
+    The local Crossref snapshot (if configured) is tried first.
+    
     Engines tried (in parallel):
     1. Crossref - best for DOIs, formal citations
     2. OpenAlex - good coverage, fast
@@ -1057,7 +534,7 @@ def _route_journal(query: str) -> Optional[CitationMetadata]:
     famous = find_famous_paper(query)
     if famous:
         try:
-            result = _crossref.get_by_id(famous["doi"])
+            result = _crossref_by_doi(famous["doi"])
             if result:
                 print("[UnifiedRouter] Found via Famous Papers cache")
                 return result
@@ -1065,37 +542,48 @@ def _route_journal(query: str) -> Optional[CitationMetadata]:
             pass
     
     # Check for DOI in query (instant lookup)
-    doi_match = re.search(r'(10\.\d{4,}/[^\s]+)', query)
-    if doi_match:
-        doi = doi_match.group(1).rstrip('.,;')
+    doi = first_identifier(query, 'doi')
+    if doi:
         try:
-            result = _crossref.get_by_id(doi)
+            result = _crossref_by_doi(doi)
             if result:
                 print("[UnifiedRouter] Found via direct DOI lookup")
                 return result
         except Exception:
             pass
     
+    # Local Crossref snapshot (zero network I/O when it hits)
+    try:
+        result = _crossref_local.search(query)
+        if result and result.has_minimum_data():
+            print("[UnifiedRouter] Found via local Crossref index")
+            return result
+    except Exception:
+        pass
+    
     # Parallel search across academic engines
     results = []
     
     with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
         futures = {
-            executor.submit(_crossref.search, query): "Crossref",
-            executor.submit(_openalex.search, query): "OpenAlex",
-            executor.submit(_semantic.search, query): "Semantic Scholar",
-            executor.submit(_pubmed.search, query): "PubMed",
+            submit(executor, _crossref.search, query): "Crossref",
+            submit(executor, _openalex.search, query): "OpenAlex",
+            submit(executor, _semantic.search, query): "Semantic Scholar",
+            submit(executor, _pubmed.search, query): "PubMed",
         }
         
-        for future in as_completed(futures, timeout=PARALLEL_TIMEOUT):
-            engine_name = futures[future]
-            try:
-                result = future.result(timeout=2)
-                if result and result.has_minimum_data():
-                    result.source_engine = engine_name
-                    results.append(result)
-            except Exception:
-                pass
+        try:
+            for future in as_completed(futures, timeout=remaining(PARALLEL_TIMEOUT)):
+                engine_name = futures[future]
+                try:
+                    result = future.result(timeout=2)
+                    if result and result.has_minimum_data():
+                        result.source_engine = engine_name
+                        results.append(result)
+                except Exception:
+                    pass
+        except FuturesTimeout:
+            print(f"[UnifiedRouter] Journal search timed out with {len(results)} results")
     
     # Return best result (prefer one with DOI)
     if results:
@@ -1112,9 +600,8 @@ def _route_journal(query: str) -> Optional[CitationMetadata]:
 # =============================================================================
 
 def _is_medical_url(url: str) -> bool:
-    """Check if URL is a medical resource (PubMed, NIH, etc.)."""
-    url_lower = url.lower()
-    return any(domain in url_lower for domain in MEDICAL_DOMAINS)
+    """Check if URL is a PubMed/NCBI or MedlinePlus page, or NIH health information."""
+    return find_domain(url, 'pubmed') is not None or 'nih.gov/health' in url.lower()
 
 
 def _route_url(url: str) -> Optional[CitationMetadata]:
@@ -1133,7 +620,7 @@ def _route_url(url: str) -> Optional[CitationMetadata]:
     doi = extract_doi_from_url(url)
     if doi:
         try:
-            result = _crossref.get_by_id(doi)
+            result = _crossref_by_doi(doi)
             if result and result.has_minimum_data():
                 result.url = url
                 return result
@@ -1141,11 +628,10 @@ def _route_url(url: str) -> Optional[CitationMetadata]:
             pass
     
     # Fallback: Try generic DOI extraction from URL path
-    doi_match = re.search(r'(10\.\d{4,}/[^\s?#]+)', url)
-    if doi_match:
-        doi = doi_match.group(1).rstrip('.,;')
+    doi = first_identifier(url, 'doi')
+    if doi:
         try:
-            result = _crossref.get_by_id(doi)
+            result = _crossref_by_doi(doi)
             if result and result.has_minimum_data():
                 result.url = url
                 print("[UnifiedRouter] Found via DOI in URL path")
@@ -1181,45 +667,100 @@ def _route_url(url: str) -> Optional[CitationMetadata]:
 # MAIN ROUTING FUNCTION
 # =============================================================================
 
-def route_citation(query: str, style: str = "chicago") -> Tuple[Optional[CitationMetadata], str]:
+def resolve_citation(query: str, deadline: Optional[Deadline] = None) -> Optional[CitationMetadata]:
     """
-    Main entry point: route query to appropriate engine and format result.
+    Resolve a query to citation metadata: parsing, detection and engine lookups.
     
-    Returns: (CitationMetadata, formatted_citation_string)
+    Style-independent, so one resolution can be rendered in any number of
+    styles (route_citation formats one, get_citation several).
+    
+    deadline (optional) bounds all engine and AI calls made for the query;
+    without one, the caller's current deadline (if any) applies.
     
     NEW (V3.4): Tries to parse already-formatted citations first.
     If the citation is complete (has author, title, journal/publisher, year),
-    it reformats without searching databases. This preserves authoritative
+    it is returned without searching databases. This preserves authoritative
     content while applying consistent style formatting.
     """
+    with activate(deadline):
+        return _resolve_citation(query)
+
+
+def _route_identifier(query: str, analysis: QueryAnalysis) -> Optional[CitationMetadata]:
+    """
+    Fast path for notes carrying a validated identifier (identifiers.py):
+    the matching get_by_id, in identifiers.PRIORITY order, with no fuzzy
+    search. Westlaw cites are left to the legal route, which runs first.
+    """
+    for ident in by_priority(analysis.identifiers):
+        if deadline_expired():
+            return None
+        try:
+            if ident.kind == 'doi':
+                result = _crossref_by_doi(ident.value)
+            elif ident.kind == 'pmid':
+                result = _pubmed_by_pmid(ident.value)
+            elif ident.kind == 'pmcid':
+                result = _semantic.get_by_id(f"PMCID:{ident.value[3:]}")
+            elif ident.kind == 'arxiv':
+                result = _semantic.get_by_id(f"ARXIV:{ident.value}")
+            elif ident.kind == 'isbn':
+                results = books.get_by_isbn(ident.value)
+                result = _book_dict_to_metadata(results[0], query) if results else None
+            else:
+                continue
+        except Exception as e:
+            print(f"[UnifiedRouter] {ident.kind.upper()} lookup error: {e}")
+            continue
+        if result and result.has_minimum_data():
+            print(f"[UnifiedRouter] Found via {ident.kind.upper()} {ident.value}")
+            return result
+    return None
+
+
+def _resolve_citation(query: str) -> Optional[CitationMetadata]:
     query = query.strip()
     if not query:
-        return None, ""
+        return None
     
-    formatter = get_formatter(style)
     metadata = None
     
+    # Extract shared query features once for the parser, legal check and detectors
+    analysis = analyze_query(query)
+    
     # 0. TRY PARSING FIRST: If citation is already complete, just reformat
     # This preserves user's authoritative content while applying style
-    parsed = parse_existing_citation(query)
+    parsed = parse_existing_citation(query, analysis)
     if parsed and _is_citation_complete(parsed):
         print(f"[UnifiedRouter] Parsed complete citation: {parsed.citation_type.name}")
-        return parsed, formatter.format(parsed)
+        return parsed
+    
+    # Network stages below stop once the lookup is cancelled or out of time
+    if deadline_expired():
+        return None
     
     # 1. Check for legal citation FIRST (superlegal.py handles famous cases)
-    if superlegal.is_legal_citation(query):
+    if superlegal.is_legal_citation(query, analysis):
         metadata = _route_legal(query)
         if metadata:
-            return metadata, formatter.format(metadata)
+            return metadata
     
     # 2. Check for URL
-    if is_url(query):
+    if analysis.is_url and not deadline_expired():
         metadata = _route_url(query)
         if metadata:
-            return metadata, formatter.format(metadata)
+            return metadata
+    
+    # 2b. DOI / PMID / PMCID / arXiv / ISBN: straight to the identifier lookup
+    if analysis.identifiers:
+        metadata = _route_identifier(query, analysis)
+        if metadata:
+            return metadata
     
     # 3. Detect type using standard detectors
-    detection = detect_type(query)
+    detection = detect_type(query, analysis)
+    if deadline_expired():
+        return None
     
     # 4. Route based on detection
     if detection.citation_type == CitationType.LEGAL:
@@ -1251,32 +792,177 @@ def route_citation(query: str, style: str = "chicago") -> Tuple[Optional[Citatio
         metadata = extract_by_type(query, CitationType.INTERVIEW)
     
     else:
-        # UNKNOWN: Try AI classification first
-        if AI_AVAILABLE:
-            ai_type, ai_meta = classify_with_ai(query)
-            if ai_type != CitationType.UNKNOWN:
-                print(f"[UnifiedRouter] AI classified as: {ai_type.name}")
-                
-                if ai_type == CitationType.BOOK:
-                    metadata = _route_book(query)
-                elif ai_type == CitationType.LEGAL:
-                    metadata = _route_legal(query)
-                elif ai_type in [CitationType.JOURNAL, CitationType.MEDICAL]:
-                    metadata = _route_journal(query)
-                elif ai_type == CitationType.NEWSPAPER:
-                    metadata = extract_by_type(query, CitationType.NEWSPAPER)
-                elif ai_type == CitationType.GOVERNMENT:
-                    metadata = extract_by_type(query, CitationType.GOVERNMENT)
+        metadata = _route_unknown(query)
+    
+    return metadata
+
+
+def _route_unknown(query: str) -> Optional[CitationMetadata]:
+    """
+    Route a query the detectors left UNKNOWN by its AI classification,
+    falling back to books, then journals.
+    
+    When the answer needs a model call, book and journal searches start
+    alongside it; the answer then only chooses among results in flight. A
+    search the answer rules out is cancelled as soon as the type is known
+    (calls already sent still finish; nothing further starts). Answers that
+    cost no model call (local classifier, AI cache) route directly.
+    """
+    answer = classify_with_ai_cached(query)
+    speculative = {}
+    if answer is None:
+        speculative = {
+            'book': submit_child(SPECULATIVE_EXECUTOR, _route_book, query),
+            'journal': submit_child(SPECULATIVE_EXECUTOR, _route_journal, query),
+        }
+    searches = {'book': _route_book, 'journal': _route_journal}
+    
+    def search(kind):
+        """The book/journal result: the speculative search's, or run now."""
+        del searches[kind]
+        if kind not in speculative:
+            return _route_book(query) if kind == 'book' else _route_journal(query)
+        future, token = speculative.pop(kind)
+        try:
+            return future.result(timeout=remaining(PARALLEL_TIMEOUT))
+        except FuturesTimeout:
+            token.cancel()
+            return None
+    
+    def rule_out(*kinds):
+        for kind in kinds:
+            if kind in speculative:
+                speculative.pop(kind)[1].cancel()
+    
+    metadata = None
+    try:
+        ai_type, _ = answer if answer is not None else classify_with_ai(query)
+        if ai_type != CitationType.UNKNOWN:
+            print(f"[UnifiedRouter] AI classified as: {ai_type.name}")
         
-        # Fallback: try books first, then journals
-        if not metadata:
-            metadata = _route_book(query)
-        if not metadata:
-            metadata = _route_journal(query)
+        if ai_type == CitationType.BOOK:
+            metadata = search('book')
+        elif ai_type in [CitationType.JOURNAL, CitationType.MEDICAL]:
+            metadata = search('journal')
+        elif ai_type == CitationType.LEGAL:
+            rule_out('book', 'journal')
+            metadata = _route_legal(query)
+        elif ai_type == CitationType.NEWSPAPER:
+            rule_out('book', 'journal')
+            metadata = extract_by_type(query, CitationType.NEWSPAPER)
+        elif ai_type == CitationType.GOVERNMENT:
+            rule_out('book', 'journal')
+            metadata = extract_by_type(query, CitationType.GOVERNMENT)
+        
+        # Fallback: books first, then journals (a search already taken is not repeated)
+        for kind in ('book', 'journal'):
+            if metadata or deadline_expired():
+                break
+            if kind in searches:
+                metadata = search(kind)
+    finally:
+        rule_out(*speculative)
     
-    # Format and return
+    return metadata
+
+
+def _reaches_ai(query: str) -> bool:
+    """
+    Whether resolve_citation would ask the AI router about this query:
+    not a complete parsed citation, not legal, not a URL, and UNKNOWN to
+    the detectors. Local checks only (no engine lookups).
+    """
+    query = query.strip()
+    if not query:
+        return False
+    analysis = analyze_query(query)
+    parsed = parse_existing_citation(query, analysis)
+    if parsed and _is_citation_complete(parsed):
+        return False
+    if superlegal.is_legal_citation(query, analysis) or analysis.is_url:
+        return False
+    return detect_type(query, analysis).citation_type == CitationType.UNKNOWN
+
+
+def prefetch_ai_classifications(queries: List[str]) -> int:
+    """
+    Classify, in batches, every query that resolve_citation would send to
+    the AI router, ahead of resolving them one by one.
+
+    Answers are stored in ai_cache, where classify_with_ai finds them, so a
+    document pays one model call per AI_BATCH_SIZE ambiguous notes instead
+    of one per note. Returns the number of queries classified.
+    """
+    if not AI_AVAILABLE or not ai_cache.available:
+        return 0
+    pending = [
+        q.strip() for q in queries
+        if _reaches_ai(q) and local_classifier.classify(q.strip()) == CitationType.UNKNOWN
+    ]
+    if not pending:
+        return 0
+    return len(classify_batch_with_ai(pending))
+
+
+def prefetch_identifiers(queries: List[str]) -> int:
+    """
+    Resolve every DOI and PMID in queries with batched lookups, ahead of
+    resolving the queries one by one: DOIs through the local snapshot, then
+    Crossref filter=doi: requests; PMIDs through multi-id PubMed ESummary.
+
+    Results are kept where _crossref_by_doi / _pubmed_by_pmid find them, so a
+    document with dozens of identifiers costs a few requests instead of one
+    per note. Identifiers the batch misses are looked up individually as
+    before. Returns the number of identifiers resolved.
+    """
+    wanted = {'doi': [], 'pmid': []}
+    for query in queries:
+        query = query.strip()
+        url_doi = query.startswith(('http://', 'https://')) and extract_doi_from_url(query)
+        if url_doi:
+            wanted['doi'].append(normalize_doi(url_doi))
+        for ident in find_identifiers(query):
+            if ident.kind in wanted:
+                wanted[ident.kind].append(ident.value)
+    
+    with _prefetched_lock:
+        pending = {
+            kind: [v for v in dict.fromkeys(values) if (kind, v) not in _prefetched]
+            for kind, values in wanted.items()
+        }
+    if not pending['doi'] and not pending['pmid']:
+        return 0
+    
+    found = {}
+    if pending['doi']:
+        dois = _crossref_local.get_many(pending['doi'])
+        dois.update(_crossref.get_many([d for d in pending['doi'] if d not in dois]))
+        found.update((('doi', doi), meta) for doi, meta in dois.items())
+    if pending['pmid']:
+        found.update((('pmid', pmid), meta) for pmid, meta in _pubmed.get_many(pending['pmid']).items())
+    
+    with _prefetched_lock:
+        _prefetched.update(found)
+        while len(_prefetched) > PREFETCH_MAX:
+            _prefetched.popitem(last=False)
+    total = len(pending['doi']) + len(pending['pmid'])
+    print(f"[UnifiedRouter] Prefetched {len(found)}/{total} identifiers")
+    return len(found)
+
+
+def route_citation(
+    query: str,
+    style: str = "chicago",
+    deadline: Optional[Deadline] = None
+) -> Tuple[Optional[CitationMetadata], str]:
+    """
+    Main entry point: route query to appropriate engine and format result.
+    
+    Returns: (CitationMetadata, formatted_citation_string)
+    """
+    metadata = resolve_citation(query, deadline)
     if metadata:
-        return metadata, formatter.format(metadata)
+        return metadata, get_formatter(style).format(metadata)
     
     return None, ""
 
@@ -1285,38 +971,50 @@ def route_citation(query: str, style: str = "chicago") -> Tuple[Optional[Citatio
 # MULTIPLE RESULTS FUNCTION
 # =============================================================================
 
-def get_multiple_citations(query: str, style: str = "chicago", limit: int = 5) -> List[Tuple[CitationMetadata, str, str]]:
+def get_multiple_citations(
+    query: str,
+    style: str = "chicago",
+    limit: int = 5,
+    deadline: Optional[Deadline] = None
+) -> List[Tuple[CitationMetadata, str, str]]:
     """
     Get multiple citation candidates for user selection.
     
     Returns list of (metadata, formatted_citation, source_name) tuples.
+    deadline (optional) bounds all engine and AI calls made for the query.
     
     NEW (V3.4): If citation is already complete, returns parsed version first
     as "Original (Reformatted)" before database results.
     """
+    with activate(deadline):
+        return _get_multiple_citations(query, style, limit)
+
+
+def _get_multiple_citations(query: str, style: str, limit: int) -> List[Tuple[CitationMetadata, str, str]]:
     query = query.strip()
     if not query:
         return []
     
     formatter = get_formatter(style)
     results = []
+    analysis = analyze_query(query)
     
     # TRY PARSING FIRST: If citation is complete, show reformatted version first
-    parsed = parse_existing_citation(query)
+    parsed = parse_existing_citation(query, analysis)
     if parsed and _is_citation_complete(parsed):
         formatted = formatter.format(parsed)
         results.append((parsed, formatted, "Original (Reformatted)"))
         print(f"[UnifiedRouter] Parsed complete citation, added as first option")
     
     # Detect type
-    detection = detect_type(query)
+    detection = detect_type(query, analysis)
     
     # Check for URL with DOI first
-    if is_url(query):
+    if analysis.is_url:
         doi = extract_doi_from_url(query)
         if doi:
             try:
-                result = _crossref.get_by_id(doi)
+                result = _crossref_by_doi(doi)
                 if result and result.has_minimum_data():
                     result.url = query
                     formatted = formatter.format(result)
@@ -1325,7 +1023,7 @@ def get_multiple_citations(query: str, style: str = "chicago", limit: int = 5) -
                 pass
     
     # Check for legal citation
-    if superlegal.is_legal_citation(query) or detection.citation_type == CitationType.LEGAL:
+    if superlegal.is_legal_citation(query, analysis) or detection.citation_type == CitationType.LEGAL:
         metadata = _route_legal(query)
         if metadata:
             formatted = formatter.format(metadata)
@@ -1348,7 +1046,7 @@ def get_multiple_citations(query: str, style: str = "chicago", limit: int = 5) -
         
         # Query multiple engines
         try:
-            metadatas = _crossref.search_multiple(query, limit)
+            metadatas = _crossref_search_multiple(query, limit)
             for meta in metadatas:
                 if meta and meta.has_minimum_data():
                     formatted = formatter.format(meta)
@@ -1422,7 +1120,7 @@ def get_multiple_citations(query: str, style: str = "chicago", limit: int = 5) -
         # Also try Crossref (has book chapters)
         if len(results) < limit:
             try:
-                metadatas = _crossref.search_multiple(query, limit - len(results))
+                metadatas = _crossref_search_multiple(query, limit - len(results))
                 for meta in metadatas:
                     if meta and meta.has_minimum_data():
                         formatted = formatter.format(meta)
@@ -1448,7 +1146,7 @@ def get_multiple_citations(query: str, style: str = "chicago", limit: int = 5) -
     
     elif detection.citation_type == CitationType.UNKNOWN:
         # Try AI router to classify ambiguous queries
-        if AI_AVAILABLE:
+        if AI_AVAILABLE or local_classifier.available:
             ai_type, ai_meta = classify_with_ai(query)
             if ai_type != CitationType.UNKNOWN:
                 print(f"[UnifiedRouter] AI classified as: {ai_type.name}")
@@ -1498,7 +1196,7 @@ def get_multiple_citations(query: str, style: str = "chicago", limit: int = 5) -
                     return results
                 
                 elif ai_type in [CitationType.JOURNAL, CitationType.MEDICAL]:
-                    metadatas = _crossref.search_multiple(query, limit)
+                    metadatas = _crossref_search_multiple(query, limit)
                     for meta in metadatas:
                         if meta and meta.has_minimum_data():
                             formatted = formatter.format(meta)
@@ -1563,7 +1261,7 @@ def get_multiple_citations(query: str, style: str = "chicago", limit: int = 5) -
         # Then fill remaining with Crossref (journals, chapters)
         if len(results) < limit:
             try:
-                metadatas = _crossref.search_multiple(query, limit - len(results))
+                metadatas = _crossref_search_multiple(query, limit - len(results))
                 for meta in metadatas:
                     if meta and meta.has_minimum_data():
                         formatted = formatter.format(meta)
@@ -1632,9 +1330,23 @@ def get_citation_options_formatted(query: str, style: str = "chicago", limit: in
 # =============================================================================
 
 # Alias for app.py compatibility
-def get_citation(query: str, style: str = "chicago") -> Tuple[Optional[CitationMetadata], str]:
-    """Alias for route_citation() - backward compatibility."""
-    return route_citation(query, style)
+def get_citation(
+    query: str,
+    style: Union[str, List[str]] = "chicago",
+    deadline: Optional[Deadline] = None
+) -> Tuple[Optional[CitationMetadata], Union[str, Dict[str, str]]]:
+    """
+    Alias for route_citation() - backward compatibility.
+    
+    style may also be a list of styles or "all": the query is resolved once
+    and the second item is {style name: formatted citation} ({} if nothing
+    was found). deadline is passed to resolve_citation.
+    """
+    if isinstance(style, str) and style.strip().lower() != 'all':
+        return route_citation(query, style, deadline)
+    
+    metadata = resolve_citation(query, deadline)
+    return metadata, (format_styles(metadata, style) if metadata else {})
 
 
 def search_citation(query: str) -> List[dict]:
@@ -1662,7 +1374,7 @@ def search_citation(query: str) -> List[dict]:
     try:
         meta = _route_journal(query)
         if meta:
-            results.append(meta.to_dict())
+            results.append(meta.to_dict(full=True))
     except Exception:
         pass
     